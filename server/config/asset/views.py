@@ -8,6 +8,7 @@ from rest_framework.exceptions import PermissionDenied
 
 from .models import Asset
 from .serializers import AssetSerializer
+from common.fastpath import FastListMixin, format_uuid, format_datetime, file_url, users_by_id
 
 
 def _asset_queryset_for_user(user):
@@ -34,9 +35,10 @@ class AssetCreateAPIView(generics.CreateAPIView):
         serializer.save(uploaded_by=self.request.user)
 
 
-class AssetListAPIView(generics.ListAPIView):
+class AssetListAPIView(FastListMixin, generics.ListAPIView):
     serializer_class = AssetSerializer
     permission_classes = [IsAuthenticated]
+    fast_columns = ('id', 'file', 'task_id', 'project_id', 'uploaded_by_id', 'uploaded_at')
 
     def get_queryset(self):
         user = self.request.user
@@ -50,7 +52,23 @@ class AssetListAPIView(generics.ListAPIView):
         if project_id:
             queryset = queryset.filter(project_id=project_id)
 
-        return queryset
+        # A stable order so pages neither overlap nor skip rows
+        return queryset.order_by('-uploaded_at', '-id')
+
+    def fast_rows(self, rows):
+        users = users_by_id({row['uploaded_by_id'] for row in rows}, self.request)
+        storage = Asset._meta.get_field('file').storage
+        return [
+            {
+                'id': format_uuid(row['id']),
+                'file': file_url(self.request, row['file'], storage),
+                'task': format_uuid(row['task_id']),
+                'project': format_uuid(row['project_id']),
+                'uploaded_by': users[row['uploaded_by_id']],
+                'uploaded_at': format_datetime(row['uploaded_at']),
+            }
+            for row in rows
+        ]
 
 
 class AssetDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
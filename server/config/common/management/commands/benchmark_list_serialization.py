@@ -0,0 +1,97 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from user.models import User
+from project.models import Project
+from task.models import Task, Subtask, TaskActivity, TimeLog
+from task.cache import invalidate_task_lists
+from task.views import TaskAPIView, TaskActivityAPIView
+from notification.models import Notification
+from notification.views import NotificationListAPIView
+from asset.models import Asset
+from asset.views import AssetListAPIView
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request CPU time of the serializer and values() list paths "
+        "(FAST_LIST_SERIALIZATION) on the task, notification, activity and asset "
+        "lists, and check both render the same bytes. Creates throwaway fixtures "
+        "and removes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=25)
+        parser.add_argument('--requests', type=int, default=50)
+
+    def _fixtures(self, count):
+        stamp = time.time_ns()
+        users = [
+            User.objects.create_user(
+                email=f'bench-{i}-{stamp}@example.invalid', password=None,
+                first_name=f'Bench{i}', avatar=f'avatars/bench-{i}.png',
+            )
+            for i in range(5)
+        ]
+        owner = users[0]
+        project = Project.objects.create(name='Benchmark', creator=owner)
+        project.members.add(*users)
+        previous = None
+        for i in range(count):
+            task = Task.objects.create(title=f'Benchmark {i}', description='x' * 200, creator=owner, project=project)
+            task.assignees.add(*users[1:4])
+            for j in range(3):
+                Subtask.objects.create(task=task, text=f'Step {j}', assignee=users[1 + j])
+            if previous:
+                task.dependencies.add(previous)
+            TimeLog.objects.create(task=task, user=users[4])
+            previous = task
+        for i in range(count):
+            TaskActivity.objects.create(task=previous, user=users[i % 5], type='comment', action='commented', details={'i': i})
+            Asset.objects.create(file=f'assets/bench-{i}.txt', task=previous, uploaded_by=users[i % 5])
+            Notification.objects.create(recipient=owner, type='info', message=f'Benchmark {i}', data={'i': i})
+        return users, project, previous
+
+    def _measure(self, view, kwargs, user, fast, runs):
+        factory = APIRequestFactory()
+        timings, content = [], None
+        with override_settings(FAST_LIST_SERIALIZATION=fast):
+            for _ in range(runs):
+                # Measure a real render, not a task-list cache hit
+                invalidate_task_lists(user_ids=[user.pk])
+                request = factory.get('/', HTTP_HOST='localhost')
+                force_authenticate(request, user=user)
+                started = time.process_time()
+                response = view(request, **kwargs)
+                response.render()
+                timings.append(time.process_time() - started)
+                content = response.content
+        if response.status_code != 200:
+            raise CommandError(f"{view.__name__} answered {response.status_code}")
+        return statistics.median(timings) * 1000, content
+
+    def handle(self, *args, **options):
+        users, project, task = self._fixtures(options['tasks'])
+        owner, runs = users[0], options['requests']
+        endpoints = [
+            ("tasks", TaskAPIView, {}),
+            ("notifications", NotificationListAPIView, {}),
+            ("task activity", TaskActivityAPIView, {'task_id': task.id}),
+            ("assets", AssetListAPIView, {}),
+        ]
+        try:
+            self.stdout.write(f"{'endpoint':<16}{'serializer ms':>15}{'values() ms':>13}{'speedup':>9}  output")
+            for name, view_class, kwargs in endpoints:
+                view = view_class.as_view(throttle_classes=[])
+                slow, slow_content = self._measure(view, kwargs, owner, False, runs)
+                fast, fast_content = self._measure(view, kwargs, owner, True, runs)
+                same = 'identical' if slow_content == fast_content else 'DIFFERS'
+                self.stdout.write(f"{name:<16}{slow:>15.2f}{fast:>13.2f}{slow / fast:>8.1f}x  {same}")
+        finally:
+            project.delete()
+            User.objects.filter(id__in=[u.id for u in users]).delete()
+        self.stdout.write(f"median CPU time per request over {runs} requests, {options['tasks']} rows per list")
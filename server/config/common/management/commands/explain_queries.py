@@ -0,0 +1,76 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from user.models import User, OneTimePassword
+from task.models import Task, TimeLog, TaskActivity
+from task.visibility import visible_task_ids
+from notification.models import Notification
+
+
+# Full-table scans: PostgreSQL "Seq Scan on x", SQLite "SCAN x" without an index
+_SEQ_SCAN_PATTERNS = [
+    re.compile(r'Seq Scan on (\w+)'),
+    re.compile(r'\bSCAN (\w+)(?! USING)(?!.*\bINDEX\b)'),
+]
+
+
+def _hot_queries(user):
+    """The filters behind the busiest endpoints, built the way the views build them."""
+    today = timezone.now().date()
+    visible = Task.objects.filter(id__in=visible_task_ids(user))
+    task = visible.first()
+    project_id = task.project_id if task else None
+
+    return [
+        ("task list", visible.order_by('-created_at')),
+        ("overdue tasks", visible.filter(due_date__lt=today).exclude(status=Task.Status.DONE)),
+        ("tasks due today", visible.filter(due_date=today)),
+        ("project tasks by status", Task.objects.filter(project_id=project_id, status=Task.Status.IN_PROGRESS)),
+        ("open timer lookup", TimeLog.objects.filter(task=task, user=user, end_time__isnull=True)),
+        ("unread notifications", Notification.objects.filter(recipient=user, is_read=False)),
+        ("notification feed", Notification.objects.filter(recipient=user).order_by('-created_at')),
+        ("activity feed", TaskActivity.objects.filter(task=task).order_by('-timestamp')),
+        ("otp lookup", OneTimePassword.objects.filter(user=user, type='RESET')),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on the main endpoint queries and flag sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Email of the user to build the queries for (defaults to the first user).")
+        parser.add_argument('--verbose-plans', action='store_true', help="Print the full plan for every query.")
+        parser.add_argument('--strict', action='store_true', help="Exit non-zero if any sequential scan is found.")
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(email=options['user']).first()
+        else:
+            user = User.objects.order_by('date_joined').first()
+        if user is None:
+            raise CommandError("No user found to build queries for.")
+
+        self.stdout.write(f"Explaining hot queries on {connection.vendor} as {user.email}\n")
+        flagged = 0
+        for name, queryset in _hot_queries(user):
+            plan = queryset.explain()
+            scans = sorted({m.group(1) for p in _SEQ_SCAN_PATTERNS for m in p.finditer(plan)})
+            if scans:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f"SEQ SCAN  {name}: {', '.join(scans)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"ok        {name}"))
+            if options['verbose_plans'] or scans:
+                for line in plan.splitlines():
+                    self.stdout.write(f"          {line}")
+
+        if flagged and connection.vendor == 'postgresql':
+            self.stdout.write(
+                "\nNote: PostgreSQL prefers sequential scans on small tables; "
+                "re-run against production-sized data (after ANALYZE) before acting."
+            )
+        if flagged and options['strict']:
+            raise CommandError(f"{flagged} queries use sequential scans.")
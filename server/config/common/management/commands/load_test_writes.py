@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, OperationalError
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from user.models import User
+from task.models import Task
+from task.views import TaskTimerStartAPIView, TaskTimerStopAPIView, TaskCommentAPIView
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the timer start/stop and comment endpoints from concurrent "
+        "threads and report throughput and lock errors. Creates throwaway "
+        "fixtures and removes them afterwards; run it once per database "
+        "configuration to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        # The real views, without throttling so the database is the bottleneck
+        endpoints = [
+            (TaskTimerStartAPIView.as_view(throttle_classes=[]), {}),
+            (TaskTimerStopAPIView.as_view(throttle_classes=[]), {}),
+            (TaskCommentAPIView.as_view(throttle_classes=[]), {'content': 'load test'}),
+        ]
+        factory = APIRequestFactory()
+        results = Counter()
+        lock = threading.Lock()
+        users, task = [], None
+
+        def worker(user, deadline):
+            local = Counter()
+            try:
+                while time.monotonic() < deadline:
+                    for view, data in endpoints:
+                        request = factory.post('/', data, format='json', HTTP_HOST='localhost')
+                        force_authenticate(request, user=user)
+                        try:
+                            response = view(request, task_id=task.id)
+                        except OperationalError as e:
+                            local['locked' if 'locked' in str(e) else 'error'] += 1
+                        else:
+                            local['ok' if response.status_code < 300 else 'rejected'] += 1
+            finally:
+                connection.close()
+                with lock:
+                    results.update(local)
+
+        try:
+            stamp = time.time_ns()
+            users = [
+                User.objects.create_user(email=f'loadtest-{i}-{stamp}@example.invalid', password=None)
+                for i in range(threads)
+            ]
+            task = Task.objects.create(title='Load test', creator=users[0])
+            task.assignees.add(*users)
+
+            started = time.monotonic()
+            deadline = started + options['seconds']
+            workers = [threading.Thread(target=worker, args=(u, deadline)) for u in users]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+            elapsed = time.monotonic() - started
+        finally:
+            if task is not None:
+                task.delete()
+            User.objects.filter(id__in=[u.id for u in users]).delete()
+
+        db = connection.settings_dict
+        self.stdout.write(f"engine:        {db['ENGINE']}")
+        self.stdout.write(f"options:       {db.get('OPTIONS', {})}")
+        self.stdout.write(f"threads:       {threads}")
+        self.stdout.write(f"writes:        {results['ok']}")
+        self.stdout.write(f"writes/sec:    {results['ok'] / elapsed:.1f}")
+        self.stdout.write(f"rejected:      {results['rejected']}")
+        self.stdout.write(f"lock errors:   {results['locked']}")
+        self.stdout.write(f"other errors:  {results['error']}")
@@ -0,0 +1,80 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetOrPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination unless the client opts in with `?cursor=`.
+
+    In cursor mode the feed is ordered newest first on (`cursor_field`, id)
+    and each page is a single `WHERE (field, id) < (last_field, last_id)`
+    range scan — no COUNT(*) and no OFFSET, so deep pages cost the same as
+    the first one. Views pick the timestamp column with a `cursor_field`
+    attribute (defaults to `created_at`).
+    """
+    cursor_query_param = 'cursor'
+    cursor_field = 'created_at'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.field = getattr(view, 'cursor_field', self.cursor_field)
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(f'-{self.field}', '-id')
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            value, pk = self.decode_cursor(token)
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__lt': value}) |
+                Q(**{self.field: value, 'id__lt': pk})
+            )
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page_rows = rows[:page_size]
+        return self.page_rows
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_cursor_link(),
+            'results': data,
+        })
+
+    def get_next_cursor_link(self):
+        if not self.has_next:
+            return None
+        last = self.page_rows[-1]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(last))
+
+    def encode_cursor(self, obj):
+        # Rows are model instances, or values() dicts on the fast list path
+        if isinstance(obj, dict):
+            value, pk = obj[self.field], obj['id']
+        else:
+            value, pk = getattr(obj, self.field), obj.pk
+        position = {'v': value.isoformat(), 'id': str(pk)}
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, token):
+        try:
+            position = json.loads(base64.urlsafe_b64decode(token.encode()))
+            # Validate both halves here; a bad id would otherwise fail in the query
+            return datetime.fromisoformat(position['v']), uuid.UUID(position['id'])
+        except (TypeError, ValueError, KeyError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
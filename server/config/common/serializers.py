@@ -0,0 +1,59 @@
+from rest_framework.exceptions import ValidationError
+
+
+def _names(request, param):
+    raw = request.query_params.get(param) if request is not None else None
+    if raw is None:
+        return None
+    return {name.strip() for name in raw.split(',') if name.strip()}
+
+
+def wants_sparse(request):
+    """True when the client asked for a sparse fieldset with `?fields=` or `?expand=`."""
+    return request is not None and ('fields' in request.query_params or 'expand' in request.query_params)
+
+
+class SparseFieldsetMixin:
+    """
+    Per-request field selection for read-only serializers.
+
+    Fields in `Meta.expandable_fields` (name -> field factory) are left out
+    unless named in `?expand=`; expanding a name that is already in
+    `Meta.fields` swaps the compact default for the full form. `?fields=`
+    then keeps only the listed fields, and naming an expandable field there
+    expands it too.
+    """
+
+    @classmethod
+    def field_plan(cls, request):
+        """`(names to render, names to expand)` for `request`; unknown names are a 400."""
+        base = list(cls.Meta.fields)
+        expandable = getattr(cls.Meta, 'expandable_fields', {})
+        expand = _names(request, 'expand') or set()
+        only = _names(request, 'fields')
+
+        unknown = expand - set(expandable)
+        if only is not None:
+            unknown |= only - set(base) - set(expandable)
+            expand |= (only & set(expandable)) - set(base)
+        if unknown:
+            raise ValidationError({
+                "fields": f"Unknown fields: {', '.join(sorted(unknown))}. "
+                          f"Available: {', '.join(base + [n for n in expandable if n not in base])}."
+            })
+
+        names = base + [name for name in expandable if name in expand and name not in base]
+        if only is not None:
+            names = [name for name in names if name in only]
+        return names, expand
+
+    @classmethod
+    def output_fields(cls, request):
+        return cls.field_plan(request)[0]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        names, expand = self.field_plan(self.context.get('request'))
+        for name in expand:
+            fields[name] = self.Meta.expandable_fields[name]()
+        return {name: fields[name] for name in names}
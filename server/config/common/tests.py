@@ -0,0 +1,49 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from rest_framework import generics
+
+from user.models import User
+from project.models import Project
+from task.models import Task
+from .fastpath import FastListMixin
+
+
+class ExplainQueriesCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        project = Project.objects.create(name='Audited', creator=self.user)
+        Task.objects.create(title='Planned', creator=self.user, project=project)
+
+    # PostgreSQL picks sequential scans on tables this small
+    @skipUnless(connection.vendor == 'sqlite', "index choice on tiny tables is planner-specific")
+    def test_reports_index_plans_for_hot_queries(self):
+        out = StringIO()
+
+        call_command('explain_queries', user='owner@example.com', verbose_plans=True, strict=True, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('ok        project tasks by status', output)
+        self.assertIn('USING INDEX task_project_status_idx', output)
+        self.assertNotIn('SEQ SCAN', output)
+
+    def test_unknown_user_is_an_error(self):
+        with self.assertRaises(CommandError):
+            call_command('explain_queries', user='nobody@example.com', stdout=StringIO())
+
+
+class FastListMixinTests(SimpleTestCase):
+    def test_views_without_the_hooks_are_rejected_when_defined(self):
+        with self.assertRaises(ImproperlyConfigured):
+            class NoRows(FastListMixin, generics.ListAPIView):
+                fast_columns = ('id',)
+
+        with self.assertRaises(ImproperlyConfigured):
+            class NoColumns(FastListMixin, generics.ListAPIView):
+                def fast_rows(self, rows):
+                    return rows
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import TeamAPIView, SearchAPIView
+from .views import TeamAPIView, SearchAPIView, SearchSuggestAPIView
 
 urlpatterns = [
     path('team/', TeamAPIView.as_view(), name='team-list'),
     path('search/', SearchAPIView.as_view(), name='search-tasks-projects'),
+    path('search/suggest/', SearchSuggestAPIView.as_view(), name='search-suggest'),
 ]
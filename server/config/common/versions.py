@@ -0,0 +1,82 @@
+import hashlib
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+
+def _key(scope, obj_id):
+    return f"{scope}_version:{obj_id}"
+
+
+def get_version(scope, obj_id):
+    """
+    Monotonic change counter for one object (or one user's view of a
+    collection). Anything derived from it — cache keys, ETags — goes stale
+    as soon as the counter is bumped.
+    """
+    version = cache.get(_key(scope, obj_id))
+    if version is None:
+        # Seed from the clock so a lost counter can never repeat an old value
+        cache.add(_key(scope, obj_id), time.time_ns(), None)
+        version = cache.get(_key(scope, obj_id))
+    return version
+
+
+def get_versions(scope, obj_ids):
+    """get_version() of several objects, in `obj_ids` order, with one cache read when all are set."""
+    keys = [_key(scope, obj_id) for obj_id in obj_ids]
+    found = cache.get_many(keys)
+    return [found[key] if key in found else get_version(scope, obj_id) for key, obj_id in zip(keys, obj_ids)]
+
+
+def bump_version(scope, obj_id):
+    """Bump one counter right away and return its new value."""
+    try:
+        return cache.incr(_key(scope, obj_id))
+    except ValueError:
+        version = time.time_ns()
+        cache.set(_key(scope, obj_id), version, None)
+        return version
+
+
+def _bump(scope, obj_ids):
+    for obj_id in obj_ids:
+        bump_version(scope, obj_id)
+
+
+def bump_versions(scope, obj_ids):
+    """
+    Bump now and again after commit, so a read racing the transaction cannot
+    pin data it saw before the commit to the new version.
+    """
+    obj_ids = {obj_id for obj_id in obj_ids if obj_id is not None}
+    if not obj_ids:
+        return
+    _bump(scope, obj_ids)
+    transaction.on_commit(lambda: _bump(scope, obj_ids))
+
+
+def make_etag(*parts):
+    return hashlib.sha1(':'.join(str(p) for p in parts).encode()).hexdigest()
+
+
+def changed_at(scope, obj_id, *parts):
+    """
+    When `parts` (counts, versions) last changed for this object, as seen by
+    the reads that asked. A Last-Modified that takes the max of this and
+    MAX(updated_at) also moves on deletes, which MAX() alone never sees.
+    """
+    key = f"{scope}_changed:{obj_id}"
+    fingerprint = make_etag(*parts)
+    seen = cache.get(key)
+    if seen is not None and seen[0] == fingerprint:
+        return seen[1]
+    now = timezone.now()
+    if seen is not None:
+        # HTTP dates have whole-second resolution; a change must move it
+        now = max(now, seen[1] + timedelta(seconds=1))
+    cache.set(key, (fingerprint, now), None)
+    return now
@@ -7,8 +7,12 @@ from user.models import User
 from user.serializers import UserSerializer
 from project.models import Project, ProjectMember
 from project.serializers import ProjectSerializer
-from task.models import Task
-from task.serializers import TaskSerializer
+from task.models import Task, TaskComment
+from task.serializers import TaskSerializer, TaskListSerializer
+from task.views import _with_task_list_data
+from .serializers import wants_sparse
+from search.index import Kind, search
+from search.suggest import suggest
 
 from rest_framework import serializers
 
@@ -54,28 +58,74 @@ class TeamAPIView(generics.ListAPIView):
             ))
         ).exclude(id=user.id).distinct()
 
+def _with_highlights(data, hits):
+    """Attach each hit's highlighted title/body to its serialized object."""
+    by_id = {str(hit['object_id']): hit['highlight'] for hit in hits}
+    for item in data:
+        item['highlight'] = by_id.get(str(item['id']))
+    return data
+
+
+def _ranked(hits, queryset):
+    """Objects for `hits` in rank order, skipping any deleted since they were indexed."""
+    objects = queryset.in_bulk([hit['object_id'] for hit in hits])
+    return [objects[hit['object_id']] for hit in hits if hit['object_id'] in objects]
+
+
 class SearchAPIView(generics.GenericAPIView):
+    """
+    Ranked search over the projects, tasks and comments the user can see,
+    served from the search index. Words match by prefix ("deploy" finds
+    "deployment"), not anywhere inside a word as the old icontains did.
+    Each result carries a `highlight` with the matching words wrapped in <mark>.
+    """
     permission_classes = [IsAuthenticated]
+    limits = {Kind.PROJECT: 10, Kind.TASK: 20, Kind.COMMENT: 10}
 
     def get(self, request, *args, **kwargs):
         query = request.query_params.get('q', '').strip()
 
         if len(query) < 2:
-            return Response({"projects": [], "tasks": []})
+            return Response({"projects": [], "tasks": [], "comments": []})
 
-        projects = Project.objects.filter(
-            Q(name__icontains=query),
-            Q(creator=request.user) | Q(members=request.user)
-        ).distinct()[:10]
+        hits = search(request.user, query, self.limits)
 
-        tasks = Task.objects.filter(
-            Q(title__icontains=query),
-            Q(creator=request.user) | 
-            Q(assignees=request.user) | 
-            Q(project__members=request.user)
-        ).select_related('project').distinct()[:20]
+        projects = _ranked(hits[Kind.PROJECT], Project.objects.all())
+        if wants_sparse(request):
+            # Compact rows, loading only what the requested fields read
+            task_rows = _with_task_list_data(Task.objects.all(), TaskListSerializer.output_fields(request))
+            tasks = TaskListSerializer(
+                _ranked(hits[Kind.TASK], task_rows), many=True, context={'request': request},
+            ).data
+        else:
+            tasks = TaskSerializer(_ranked(hits[Kind.TASK], Task.objects.select_related('project')), many=True).data
+        comments = _ranked(hits[Kind.COMMENT], TaskComment.objects.select_related('task', 'author'))
 
         return Response({
-            "projects": ProjectSerializer(projects, many=True).data,
-            "tasks": TaskSerializer(tasks, many=True).data
+            "projects": _with_highlights(ProjectSerializer(projects, many=True).data, hits[Kind.PROJECT]),
+            "tasks": _with_highlights(tasks, hits[Kind.TASK]),
+            "comments": _with_highlights([
+                {
+                    "id": comment.id,
+                    "task_id": comment.task_id,
+                    "task_title": comment.task.title,
+                    "author": comment.author.email,
+                    "created_at": comment.created_at,
+                }
+                for comment in comments
+            ], hits[Kind.COMMENT]),
         }, status=status.HTTP_200_OK)
+
+
+class SearchSuggestAPIView(generics.GenericAPIView):
+    """Typeahead for the search bar: id, title and type of the best task and project title matches."""
+    permission_classes = [IsAuthenticated]
+    max_limit = 20
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = min(max(int(request.query_params.get('limit') or 10), 1), self.max_limit)
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        results = suggest(request.user, request.query_params.get('q', ''), limit)
+        return Response({"results": results}, status=status.HTTP_200_OK)
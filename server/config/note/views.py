@@ -1,8 +1,10 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from .models import Note
 from .serializers import NoteSerializer
-from django.db.models import Q
+from search.index import Kind, rank, hits
+from search.text import tokenize
 
 
 class NoteListCreateAPIView(generics.ListCreateAPIView):
@@ -30,13 +32,31 @@ class PinnedNoteListAPIView(generics.ListAPIView):
         return Note.objects.filter(owner=self.request.user, is_pinned=True)
 
 class NoteSearchAPIView(generics.ListAPIView):
+    """
+    Ranked prefix search over the user's notes, served from the search
+    index. Pages run over the backend's ranked ids, so every match is
+    reachable; only the current page is loaded and highlighted. An empty
+    query lists every note, as before.
+    """
     serializer_class = NoteSerializer
     permission_classes = [IsAuthenticated]
-    
+
     def get_queryset(self):
-        query = self.request.query_params.get('q', '')
-        return Note.objects.filter(
-            owner=self.request.user
-        ).filter(
-            Q(title__icontains=query) | Q(content__icontains=query)
-        )
\ No newline at end of file
+        return Note.objects.filter(owner=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '')
+        if not tokenize(query):
+            return super().list(request, *args, **kwargs)
+
+        ranked = rank(request.user, query, Kind.NOTE)
+        page = self.paginate_queryset(ranked)
+        note_hits = hits(page if page is not None else ranked, query)
+        notes = self.get_queryset().select_related('owner').in_bulk([hit['object_id'] for hit in note_hits])
+        data = [
+            {**self.get_serializer(notes[hit['object_id']]).data, 'highlight': hit['highlight']}
+            for hit in note_hits if hit['object_id'] in notes
+        ]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, OutboxMessage
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
@@ -7,3 +7,10 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter = ('recipient', 'type', 'is_read', 'created_at')
     search_fields = ('recipient__username', 'type', 'message')
     ordering = ('-created_at',)
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'kind', 'attempts', 'created_at', 'next_attempt_at', 'sent_at')
+    list_filter = ('kind', 'sent_at')
+    search_fields = ('recipient__email', 'last_error')
+    ordering = ('-created_at',)
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from user.models import User
+from notification.views import send_notification_to_user, send_notifications_bulk
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-recipient send_notification_to_user calls with "
+        "send_notifications_bulk. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        sizes = options['sizes']
+        repeat = options['repeat']
+
+        try:
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(email=f'bench-notify-{i}@example.invalid', username=f'bench_notify_{i}')
+                    for i in range(max(sizes))
+                ])
+                self.stdout.write(f"{'recipients':>10}  {'loop (ms)':>10}  {'bulk (ms)':>10}  {'speedup':>8}")
+                for size in sizes:
+                    recipients = users[:size]
+                    payload = {"type": "benchmark", "message": "Benchmark notification"}
+
+                    loop_ms = self._best_of(repeat, lambda: [
+                        send_notification_to_user(u.id, payload, recipient=u) for u in recipients
+                    ])
+                    bulk_ms = self._best_of(repeat, lambda: send_notifications_bulk(recipients, payload))
+
+                    self.stdout.write(
+                        f"{size:>10}  {loop_ms:>10.2f}  {bulk_ms:>10.2f}  {loop_ms / bulk_ms:>7.1f}x"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    @staticmethod
+    def _best_of(repeat, fn):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings)
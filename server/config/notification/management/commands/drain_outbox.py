@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notification.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails and notifications from the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help="Keep polling for new messages instead of exiting once the outbox is empty.",
+        )
+        parser.add_argument('--interval', type=float, default=1.0, help="Seconds to sleep when idle (with --loop).")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            claimed = drain_outbox(batch_size=options['batch_size'])
+            total += claimed
+            # Failed messages are pushed back by their retry delay, so another
+            # pass only picks up what is due now
+            if claimed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} outbox messages."))
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from user.models import User
 import uuid
 
@@ -13,3 +14,51 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', 'created_at'], name='notification_feed_idx'),
+            models.Index(fields=['recipient', 'is_read'], name='notification_unread_idx'),
+        ]
+
+
+class OutboxMessage(models.Model):
+    """
+    Side effects (emails, notifications) queued in the same transaction as the
+    change that caused them and delivered later by `manage.py drain_outbox`.
+    """
+    class Kind(models.TextChoices):
+        EMAIL = 'email'
+        NOTIFICATION = 'notification'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='outbox_messages')
+    payload = models.JSONField(default=dict)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # When a worker may (re)try the message: claims and failures move it forward
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'],
+                name='outbox_due_idx',
+                condition=models.Q(sent_at__isnull=True),
+            ),
+        ]
+
+    @classmethod
+    def notification(cls, recipient, data):
+        """`recipient` may be a User instance or a user id."""
+        return cls(kind=cls.Kind.NOTIFICATION, recipient_id=getattr(recipient, 'pk', recipient), payload=data)
+
+    @classmethod
+    def email(cls, recipient, subject, message):
+        return cls(
+            kind=cls.Kind.EMAIL,
+            recipient=recipient,
+            payload={"subject": subject, "message": message, "to": recipient.email},
+        )
@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from asgiref.sync import async_to_sync
+
+from .models import Notification, OutboxMessage
+from .views import _group_send_all
+
+
+MAX_ATTEMPTS = 5
+# A claimed message is retried once its claim expires (the worker died mid-send)
+CLAIM_TIMEOUT = timedelta(minutes=5)
+# Failed messages wait BACKOFF_BASE, then twice as long after each attempt
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(hours=1)
+
+
+def retry_delay(attempts):
+    """How long to wait before the next try after `attempts` failed ones."""
+    # The exponent is bounded so a large count cannot overflow timedelta
+    return min(BACKOFF_BASE * 2 ** min(max(attempts - 1, 0), 20), BACKOFF_MAX)
+
+
+def _sent(messages):
+    OutboxMessage.objects.filter(id__in=[m.id for m in messages]).update(sent_at=timezone.now(), last_error='')
+
+
+def _failed(messages, error):
+    now = timezone.now()
+    by_attempts = {}
+    for m in messages:
+        by_attempts.setdefault(m.attempts, []).append(m.id)
+    for attempts, ids in by_attempts.items():
+        OutboxMessage.objects.filter(id__in=ids).update(
+            last_error=str(error), next_attempt_at=now + retry_delay(attempts),
+        )
+
+
+def _deliver_notifications(messages):
+    # The Notification rows and the sent marks commit together, so a failure
+    # after this point can never create them twice
+    with transaction.atomic():
+        Notification.objects.bulk_create([
+            Notification(
+                recipient_id=m.recipient_id,
+                type=m.payload.get('type', 'generic'),
+                message=m.payload.get('message', ''),
+                data=m.payload,
+            )
+            for m in messages
+        ])
+        _sent(messages)
+    try:
+        async_to_sync(_group_send_all)([
+            (f"user_{m.recipient_id}", {"type": "notify", "data": m.payload})
+            for m in messages
+        ])
+    except Exception as e:
+        # The live push is best effort; the stored notification is what counts
+        OutboxMessage.objects.filter(id__in=[m.id for m in messages]).update(last_error=str(e))
+
+
+def _deliver_emails(messages):
+    # One SMTP connection for the whole batch, each message recorded as it goes
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        _failed(messages, e)
+        return
+    try:
+        for m in messages:
+            email = EmailMessage(
+                m.payload['subject'],
+                m.payload['message'],
+                settings.DEFAULT_FROM_EMAIL,
+                [m.payload['to']],
+                connection=connection,
+            )
+            try:
+                connection.send_messages([email])
+            except Exception as e:
+                _failed([m], e)
+            else:
+                _sent([m])
+    finally:
+        connection.close()
+
+
+_DELIVERERS = {
+    OutboxMessage.Kind.EMAIL: _deliver_emails,
+    OutboxMessage.Kind.NOTIFICATION: _deliver_notifications,
+}
+
+
+def _claim(batch_size):
+    """
+    Lock a batch of due messages with SKIP LOCKED (where the database
+    supports it), count the attempt and push `next_attempt_at` past the
+    claim timeout so no other worker picks them up. The transaction ends
+    before anything is delivered.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxMessage.objects
+            .filter(sent_at__isnull=True, attempts__lt=MAX_ATTEMPTS, next_attempt_at__lte=now)
+            .select_for_update(skip_locked=True)
+            .order_by('next_attempt_at', 'created_at')[:batch_size]
+        )
+        OutboxMessage.objects.filter(id__in=[m.id for m in batch]).update(
+            attempts=F('attempts') + 1, next_attempt_at=now + CLAIM_TIMEOUT,
+        )
+    for m in batch:
+        m.attempts += 1
+    return batch
+
+
+def drain_outbox(batch_size=100):
+    """
+    Deliver one batch of due outbox messages. Returns the number claimed.
+
+    Delivery runs outside the claiming transaction and every message is
+    marked sent as soon as it is delivered, so a failure part way through
+    only retries what was not sent. Failures back off exponentially.
+    """
+    batch = _claim(batch_size)
+    for kind, deliver in _DELIVERERS.items():
+        messages = [m for m in batch if m.kind == kind]
+        if not messages:
+            continue
+        try:
+            deliver(messages)
+        except Exception as e:
+            # Whatever the deliverer had not marked sent yet is retried later
+            sent = set(
+                OutboxMessage.objects.filter(id__in=[m.id for m in messages], sent_at__isnull=False)
+                .values_list('id', flat=True)
+            )
+            _failed([m for m in messages if m.id not in sent], e)
+    return len(batch)
@@ -1,3 +1,129 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from user.models import User
+from .models import Notification, OutboxMessage
+from .outbox import drain_outbox, retry_delay
+from .views import send_notifications_bulk
+
+
+class FlakyEmailBackend(EmailBackend):
+    """Refuses mail to `failing`, and records how deep in transactions each send ran."""
+    failing = set()
+    depths = []
+
+    def send_messages(self, messages):
+        self.depths.append(len(connection.atomic_blocks))
+        if any(to in self.failing for message in messages for to in message.to):
+            raise OSError("mailbox unavailable")
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxDrainTests(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(email=f'user{i}@example.com', password='password123')
+            for i in range(3)
+        ]
+
+    def test_drain_delivers_and_marks_sent(self):
+        OutboxMessage.objects.bulk_create(
+            [OutboxMessage.notification(u, {"type": "task_assigned", "message": "hi"}) for u in self.users]
+            + [OutboxMessage.email(u, "Subject", "Body") for u in self.users]
+        )
+
+        self.assertEqual(drain_outbox(batch_size=100), 6)
+
+        self.assertEqual(Notification.objects.filter(type="task_assigned").count(), 3)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(u.email for u in self.users))
+        self.assertFalse(OutboxMessage.objects.filter(sent_at__isnull=True).exists())
+        self.assertEqual(drain_outbox(), 0)
+
+    @override_settings(EMAIL_BACKEND='notification.tests.FlakyEmailBackend')
+    def test_partial_failure_only_retries_undelivered_messages_with_backoff(self):
+        FlakyEmailBackend.failing = {'user1@example.com'}
+        FlakyEmailBackend.depths = []
+        OutboxMessage.objects.bulk_create([OutboxMessage.email(u, "Subject", "Body") for u in self.users])
+        depth = len(connection.atomic_blocks)
+
+        self.assertEqual(drain_outbox(), 3)
+
+        # Sent outside the claiming transaction, one message at a time
+        self.assertEqual(FlakyEmailBackend.depths, [depth] * 3)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ['user0@example.com', 'user2@example.com'])
+        failed = OutboxMessage.objects.get(sent_at__isnull=True)
+        self.assertEqual((failed.payload['to'], failed.attempts), ('user1@example.com', 1))
+        self.assertIn('mailbox unavailable', failed.last_error)
+        self.assertGreater(failed.next_attempt_at, timezone.now() + retry_delay(1) - timedelta(seconds=5))
+
+        # Not due yet, so an immediate second pass does nothing
+        self.assertEqual(drain_outbox(), 0)
+
+        FlakyEmailBackend.failing = set()
+        OutboxMessage.objects.filter(pk=failed.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(drain_outbox(), 1)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), [u.email for u in self.users])
+        self.assertEqual(OutboxMessage.objects.get(pk=failed.pk).attempts, 2)
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        self.assertEqual(retry_delay(2), retry_delay(1) * 2)
+        self.assertEqual(retry_delay(50), retry_delay(40))
+
+
+class SendNotificationsBulkTests(TestCase):
+    def test_writes_one_row_per_recipient_with_the_payload(self):
+        users = [User.objects.create_user(email=f'user{i}@example.com', password='password123') for i in range(3)]
+        payload = {"type": "task_assigned", "message": "You have been assigned", "task_id": "abc"}
+
+        # Instances and bare ids are both accepted
+        with self.assertNumQueries(1):
+            send_notifications_bulk([users[0], users[1].id, users[2]], payload)
+
+        rows = Notification.objects.order_by('recipient__email')
+        self.assertEqual([n.recipient_id for n in rows], [u.id for u in users])
+        for notification in rows:
+            self.assertEqual(
+                (notification.type, notification.message, notification.data, notification.is_read),
+                ("task_assigned", "You have been assigned", payload, False),
+            )
+
+    def test_no_recipients_writes_nothing(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(send_notifications_bulk([], {"type": "generic"}), [])
+
+
+class NotificationListConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.notifications = [
+            Notification.objects.create(recipient=self.user, type='generic', message=f'n{i}') for i in range(2)
+        ]
+        self.url = reverse('notification-list')
+
+    def test_last_modified_moves_on_read_and_delete(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        self.client.patch(reverse('mark-notification-read', args=[self.notifications[0].id]))
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        last_modified = response['Last-Modified']
+
+        self.client.delete(reverse('delete-notification', args=[self.notifications[0].id]))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 200)
+
+    def test_etag_tracks_deletes(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.notifications[1].delete()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -1,3 +1,9 @@
+import asyncio
+
+from django.db.models import Count, Max, Q
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
 from .serializers import NotificationSerializer
 from .models import Notification
 from rest_framework import generics
@@ -8,6 +14,9 @@ from user.models import User
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from common.pagination import KeysetOrPageNumberPagination
+from common.fastpath import FastListMixin, format_uuid, format_datetime
+from common.versions import make_etag, changed_at
 
 
 def send_notification_to_user(user_id, notification_data, recipient=None):
@@ -39,9 +48,73 @@ def send_notification_to_user(user_id, notification_data, recipient=None):
     )
 
 
-class NotificationListAPIView(generics.ListAPIView):
+async def _group_send_all(events):
+    """Push every (group, event) pair from a single event loop."""
+    channel_layer = get_channel_layer()
+    await asyncio.gather(*(channel_layer.group_send(group, event) for group, event in events))
+
+
+def send_notifications_bulk(recipients, notification_data):
+    """
+    Fan the same notification out to many users: one `bulk_create` for the
+    Notification rows and one event loop for every WebSocket push.
+
+    `recipients` may be User instances or user ids.
+    """
+    return send_notification_batch([(recipient, notification_data) for recipient in recipients])
+
+
+def send_notification_batch(items):
+    """Like `send_notifications_bulk`, but each (recipient, data) pair carries its own payload."""
+    items = [(getattr(recipient, 'pk', recipient), data) for recipient, data in items]
+    if not items:
+        return []
+
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            recipient_id=recipient_id,
+            type=data.get('type', 'generic'),
+            message=data.get('message', ''),
+            data=data
+        )
+        for recipient_id, data in items
+    ])
+
+    async_to_sync(_group_send_all)([
+        (f"user_{recipient_id}", {"type": "notify", "data": data})
+        for recipient_id, data in items
+    ])
+    return notifications
+
+
+def _notification_stats(user):
+    return Notification.objects.filter(recipient=user).aggregate(
+        last=Max('created_at'), total=Count('id'), unread=Count('id', filter=Q(is_read=False)),
+    )
+
+
+def _notifications_etag(request):
+    stats = _notification_stats(request.user)
+    # The counts catch deletes and mark-as-read, which MAX(created_at) does not
+    return make_etag(
+        request.user.pk, stats['last'], stats['total'], stats['unread'], request.META.get('QUERY_STRING', ''),
+    )
+
+
+def _notifications_last_modified(request):
+    stats = _notification_stats(request.user)
+    if stats['last'] is None:
+        return None
+    changed = changed_at('notifications', request.user.pk, stats['last'], stats['total'], stats['unread'])
+    return max(stats['last'], changed)
+
+
+@method_decorator(condition(etag_func=_notifications_etag, last_modified_func=_notifications_last_modified), name='get')
+class NotificationListAPIView(FastListMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetOrPageNumberPagination
+    fast_columns = ('id', 'type', 'message', 'data', 'is_read', 'created_at')
 
     def get_queryset(self):
         return (
@@ -50,6 +123,13 @@ class NotificationListAPIView(generics.ListAPIView):
             .select_related('recipient')
         )
 
+    def fast_rows(self, rows):
+        # New dicts: the cursor paginator still reads the raw created_at of the last row
+        return [
+            {**row, 'id': format_uuid(row['id']), 'created_at': format_datetime(row['created_at'])}
+            for row in rows
+        ]
+
 
 class MarkNotificationReadAPIView(generics.UpdateAPIView):
     serializer_class = NotificationSerializer
@@ -36,3 +36,10 @@ class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = ['id', 'name', 'description', 'creator', 'members', 'created_at', 'updated_at']
+
+
+class ProjectSummarySerializer(serializers.ModelSerializer):
+    """Project reference for list rows, without members."""
+    class Meta:
+        model = Project
+        fields = ['id', 'name']
@@ -1,16 +1,25 @@
 from django.shortcuts import get_object_or_404
+from django.utils.text import slugify
 from django.db.models import Q
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from django.db import transaction
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
 from .models import Project, ProjectMember
 from .serializers import ProjectSerializer, ProjectMemberSerializer, ProjectMemberBulkSerializer
 from user.serializers import UserSerializer
 from task.models import Task, Subtask
+from task.graph import DependencyCycleError
+from task.schedule import project_schedule
+from task.counters import recompute_counters
+from task.filters import TaskFilter
+from task import exports
 from asset.models import Asset
+from common.versions import get_version, make_etag
 
 
 def _user_projects(user):
@@ -19,6 +28,13 @@ def _user_projects(user):
     ).distinct()
 
 
+def _project_detail_etag(request, pk):
+    updated_at = _user_projects(request.user).filter(id=pk).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None
+    return make_etag(pk, updated_at.isoformat(), get_version('project', pk))
+
+
 def _require_project_admin(project, user):
     """Raise PermissionDenied if the user is not the creator or an Admin member."""
     if project.creator == user:
@@ -51,6 +67,7 @@ class ProjectsAPIView(generics.ListCreateAPIView):
         )
 
 
+@method_decorator(condition(etag_func=_project_detail_etag), name='get')
 class ProjectDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
@@ -73,6 +90,49 @@ class ProjectDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         return super().destroy(request, *args, **kwargs)
 
 
+class ProjectCriticalPathAPIView(generics.GenericAPIView):
+    """Critical path, per-task slack and projected completion date of a project."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        project = get_object_or_404(_user_projects(request.user), id=kwargs['pk'])
+        try:
+            return Response(project_schedule(project))
+        except DependencyCycleError as exc:
+            return Response(
+                {"detail": f"Task dependencies contain a cycle: {exc}"},
+                status=status.HTTP_409_CONFLICT
+            )
+
+
+class ProjectExportAPIView(generics.GenericAPIView):
+    """
+    Stream a project's tasks, time logs or activity as CSV, JSON Lines or JSON.
+
+    Accepts the same query parameters as the task list (TaskFilter); time
+    logs and activity are limited to the filtered tasks.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        project = get_object_or_404(_user_projects(request.user), id=kwargs['pk'])
+        kind, fmt = kwargs['kind'], kwargs['fmt']
+        if kind not in exports.EXPORTS or fmt not in exports.FORMATS:
+            return Response(
+                {"detail": f"Use /export/<{'|'.join(exports.EXPORTS)}>.<{'|'.join(exports.FORMATS)}>."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        filterset = TaskFilter(request.query_params, queryset=Task.objects.filter(project=project), request=request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        tasks = filterset.qs
+        columns, rows = exports.EXPORTS[kind]
+        response = exports.streaming_response(request, exports.render(rows(tasks), fmt, columns), exports.FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{slugify(project.name) or "project"}-{kind}.{fmt}"'
+        return response
+
+
 class ProjectMembersAPIView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = ProjectMemberBulkSerializer
@@ -154,10 +214,10 @@ class ProjectMemberActionAPIView(generics.RetrieveUpdateDestroyAPIView):
         for task in Task.objects.filter(project=project, assignees=user):
             task.assignees.remove(user)
 
-        Subtask.objects.filter(
-            task__project=project,
-            assignee=user
-        ).update(assignee=None, is_completed=False)
+        unassigned = Subtask.objects.filter(task__project=project, assignee=user)
+        affected_tasks = set(unassigned.values_list('task_id', flat=True))
+        unassigned.update(assignee=None, is_completed=False)
+        recompute_counters(affected_tasks)
 
         # Iterate so each Asset.delete() fires and removes the physical file
         for asset in Asset.objects.filter(uploaded_by=user).filter(
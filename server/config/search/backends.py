@@ -0,0 +1,139 @@
+from abc import ABC, abstractmethod
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, Sum, Subquery, OuterRef, IntegerField
+
+from .models import SearchTerm
+from .text import tokenize
+
+
+TITLE_WEIGHT = 10
+
+
+def _chunks(values, size=500):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class SearchBackend(ABC):
+    """
+    Keeps an index over SearchDocument rows and answers ranked prefix
+    queries. `search` gets the already permission-filtered document
+    queryset and returns `(document_id, score)` pairs, best first; a
+    `limit` of None returns every match.
+    """
+
+    @abstractmethod
+    def index(self, documents):
+        """Add or replace the index entries of saved SearchDocuments."""
+
+    @abstractmethod
+    def remove(self, document_ids):
+        """Drop the index entries of these document ids."""
+
+    @abstractmethod
+    def clear(self):
+        """Drop every index entry."""
+
+    @abstractmethod
+    def search(self, documents, terms, limit):
+        """`(document_id, score)` pairs of `documents` matching every term, best first."""
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """FTS5 virtual table (created by the search migrations on SQLite), ranked with bm25."""
+    table = 'api_search_fts'
+
+    def index(self, documents):
+        self.remove([document.id for document in documents])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, title, body) VALUES (%s, %s, %s)',
+                [(document.id, document.title, document.body) for document in documents],
+            )
+
+    def remove(self, document_ids):
+        with connection.cursor() as cursor:
+            for chunk in _chunks(document_ids):
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f'DELETE FROM {self.table} WHERE rowid IN ({placeholders})', chunk)
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+
+    def search(self, documents, terms, limit):
+        # Every term must match (implicit AND); quoting keeps FTS syntax out of user input
+        match = ' '.join(f'"{term}"*' for term in terms)
+        candidates, params = documents.values('id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, bm25({self.table}, {TITLE_WEIGHT}.0, 1.0) AS score '
+                f'FROM {self.table} WHERE {self.table} MATCH %s AND rowid IN ({candidates}) '
+                f'ORDER BY score LIMIT %s',
+                # A negative LIMIT is no limit in SQLite
+                [match, *params, -1 if limit is None else limit],
+            )
+            # bm25 is lower-is-better; flip it so every backend sorts descending
+            return [(document_id, -score) for document_id, score in cursor.fetchall()]
+
+
+class TermBackend(SearchBackend):
+    """
+    Portable inverted index in SearchTerm. Prefix matches use the
+    (term, document) index; the score sums the weights of matching terms,
+    with title words counting TITLE_WEIGHT times as much as body words.
+    """
+
+    def index(self, documents):
+        self.remove([document.id for document in documents])
+        rows = []
+        for document in documents:
+            weights = Counter()
+            for term in tokenize(document.title):
+                weights[term] += TITLE_WEIGHT
+            for term in tokenize(document.body):
+                weights[term] += 1
+            rows.extend(SearchTerm(document_id=document.id, term=term, weight=weight) for term, weight in weights.items())
+        SearchTerm.objects.bulk_create(rows, batch_size=1000)
+
+    def remove(self, document_ids):
+        for chunk in _chunks(document_ids):
+            SearchTerm.objects.filter(document_id__in=chunk).delete()
+
+    def clear(self):
+        SearchTerm.objects.all().delete()
+
+    def search(self, documents, terms, limit):
+        matching = Q()
+        for term in terms:
+            documents = documents.filter(
+                id__in=SearchTerm.objects.filter(term__startswith=term).values('document_id')
+            )
+            matching |= Q(term__startswith=term)
+        score = Subquery(
+            SearchTerm.objects.filter(matching, document=OuterRef('pk'))
+            .order_by()
+            .values('document')
+            .annotate(total=Sum('weight'))
+            .values('total'),
+            output_field=IntegerField(),
+        )
+        return list(documents.annotate(score=score).order_by('-score', 'id').values_list('id', 'score')[:limit])
+
+
+BACKENDS = {
+    'sqlite_fts5': SQLiteFTSBackend,
+    'terms': TermBackend,
+}
+
+
+def get_backend():
+    """SEARCH_BACKEND if set, otherwise FTS5 on SQLite and the term index elsewhere."""
+    name = getattr(settings, 'SEARCH_BACKEND', None)
+    if not name:
+        name = 'sqlite_fts5' if connection.vendor == 'sqlite' else 'terms'
+    return BACKENDS[name]()
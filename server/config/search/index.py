@@ -0,0 +1,151 @@
+from itertools import islice
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Q
+
+from .models import SearchDocument
+from .backends import get_backend
+from .text import tokenize, highlight
+from task.visibility import visible_task_ids
+from project.models import Project
+
+
+Kind = SearchDocument.Kind
+
+# kind -> (model, fields read from it, row -> (scope_id, title, body))
+SOURCES = {
+    Kind.TASK: ('task.Task', ('id', 'title', 'description'),
+                lambda row: (row['id'], row['title'], row['description'])),
+    Kind.PROJECT: ('project.Project', ('id', 'name', 'description'),
+                   lambda row: (row['id'], row['name'], row['description'])),
+    Kind.COMMENT: ('task.TaskComment', ('id', 'task_id', 'content'),
+                   lambda row: (row['task_id'], '', row['content'])),
+    Kind.NOTE: ('note.Note', ('id', 'owner_id', 'title', 'content'),
+                lambda row: (row['owner_id'], row['title'], row['content'])),
+}
+
+SNIPPET_WORDS = 24
+
+
+def _documents(kind, rows):
+    extract = SOURCES[kind][2]
+    documents = []
+    for row in rows:
+        scope_id, title, body = extract(row)
+        documents.append(SearchDocument(
+            kind=kind, object_id=row['id'], scope_id=scope_id, title=(title or '')[:200], body=body or '',
+        ))
+    return documents
+
+
+def index_rows(kind, rows, backend=None):
+    """Upsert the documents for `rows` (value dicts of the source model). Returns how many were written."""
+    documents = _documents(kind, rows)
+    if not documents:
+        return 0
+    backend = backend or get_backend()
+    with transaction.atomic():
+        SearchDocument.objects.bulk_create(
+            documents, update_conflicts=True, unique_fields=['kind', 'object_id'],
+            update_fields=['scope_id', 'title', 'body'],
+        )
+        # Not every backend returns ids from an upsert, so read them back
+        ids = dict(
+            SearchDocument.objects.filter(kind=kind, object_id__in=[d.object_id for d in documents])
+            .values_list('object_id', 'id')
+        )
+        for document in documents:
+            document.id = ids[document.object_id]
+        backend.index(documents)
+    return len(documents)
+
+
+def index_instance(kind, instance):
+    index_rows(kind, [{field: getattr(instance, field) for field in SOURCES[kind][1]}])
+
+
+def reindex(kind, object_ids):
+    """Refresh the documents of rows written without signals (bulk_create, update())."""
+    label, fields, _ = SOURCES[kind]
+    rows = apps.get_model(label).objects.filter(pk__in=list(object_ids)).values(*fields)
+    return index_rows(kind, rows)
+
+
+def remove(kind, object_ids):
+    documents = SearchDocument.objects.filter(kind=kind, object_id__in=list(object_ids))
+    ids = list(documents.values_list('id', flat=True))
+    if not ids:
+        return
+    with transaction.atomic():
+        get_backend().remove(ids)
+        SearchDocument.objects.filter(id__in=ids).delete()
+
+
+def rebuild(batch_size=500):
+    """Drop the index and rebuild it from the source tables. Returns documents written per kind."""
+    backend = get_backend()
+    written = {}
+    with transaction.atomic():
+        backend.clear()
+        SearchDocument.objects.all().delete()
+        for kind, (label, fields, _) in SOURCES.items():
+            rows = apps.get_model(label).objects.order_by().values(*fields).iterator(chunk_size=batch_size)
+            written[kind] = 0
+            while chunk := list(islice(rows, batch_size)):
+                written[kind] += index_rows(kind, chunk, backend)
+    return written
+
+
+def visible_documents(user, kinds):
+    """Documents of `kinds` that `user` may see, following the same rules as the source views."""
+    scopes = Q(pk__in=[])
+    task_kinds = [kind for kind in kinds if kind in (Kind.TASK, Kind.COMMENT)]
+    if task_kinds:
+        scopes |= Q(kind__in=task_kinds, scope_id__in=visible_task_ids(user))
+    if Kind.PROJECT in kinds:
+        projects = Project.objects.filter(Q(creator=user) | Q(members=user)).values('id')
+        scopes |= Q(kind=Kind.PROJECT, scope_id__in=projects)
+    if Kind.NOTE in kinds:
+        scopes |= Q(kind=Kind.NOTE, scope_id=user.pk)
+    return SearchDocument.objects.filter(scopes)
+
+
+def rank(user, query, kind, limit=None):
+    """
+    `(document_id, score)` pairs of `kind` whose words start with every word
+    of `query`, best first, straight from the backend index. Matches inside
+    a word are not found. Without `limit`, every match is returned.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    return get_backend().search(visible_documents(user, [kind]), terms, limit)
+
+
+def hits(ranked, query):
+    """Hits for `(document_id, score)` pairs, in their order: {object_id, score, highlight: {title, body}}."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    documents = SearchDocument.objects.only('object_id', 'title', 'body').in_bulk([document_id for document_id, _ in ranked])
+    return [
+        {
+            "object_id": documents[document_id].object_id,
+            "score": score,
+            "highlight": {
+                "title": highlight(documents[document_id].title, terms),
+                "body": highlight(documents[document_id].body, terms, words=SNIPPET_WORDS),
+            },
+        }
+        for document_id, score in ranked
+        if document_id in documents
+    ]
+
+
+def search(user, query, limits):
+    """
+    Permission-filtered search: `rank()` for each kind in `limits`, which
+    maps it to the number of hits wanted.
+
+    Returns {kind: [{object_id, score, highlight: {title, body}}]}, best first.
+    """
+    return {kind: hits(rank(user, query, kind, limit), query) for kind, limit in limits.items()}
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for tasks, projects, comments and notes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        written = rebuild(batch_size=options['batch_size'])
+        summary = ', '.join(f"{count} {kind}s" for kind, count in written.items())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {summary}."))
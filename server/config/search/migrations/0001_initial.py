@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+FTS_TABLE = 'api_search_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    # The FTS5 index only exists on SQLite; other databases use SearchTerm
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+        "title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('project', 'Project'), ('comment', 'Comment'), ('note', 'Note')], max_length=16)),
+                ('object_id', models.UUIDField()),
+                ('scope_id', models.UUIDField()),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('body', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': 'api_searchdocument',
+                'indexes': [models.Index(fields=['kind', 'scope_id'], name='searchdoc_scope_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='uniq_search_document')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='search.searchdocument')),
+            ],
+            options={
+                'db_table': 'api_searchterm',
+                'constraints': [models.UniqueConstraint(fields=('term', 'document'), name='uniq_search_term')],
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
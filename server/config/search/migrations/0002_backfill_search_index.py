@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def backfill_search_index(apps, schema_editor):
+    # The backends write through the live models (and raw SQL for FTS5), so
+    # this reuses rebuild() instead of repeating it on historical models
+    from search.index import rebuild
+
+    rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('task', '0017_timelog_uniq_open_timelog'),
+        ('project', '0001_initial'),
+        ('note', '0002_alter_note_options_note_is_pinned_alter_note_content_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
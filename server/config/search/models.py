@@ -0,0 +1,53 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable row per task, project, comment or note. The text lives
+    here; the backend keeps its own index over it, keyed by `id`.
+    """
+    class Kind(models.TextChoices):
+        TASK = 'task'
+        PROJECT = 'project'
+        COMMENT = 'comment'
+        NOTE = 'note'
+
+    # Integer key so full-text backends can use it as their rowid
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    object_id = models.UUIDField()
+    # What the visibility rules hang off: the task for tasks and comments,
+    # the project for projects and the owner for notes
+    scope_id = models.UUIDField()
+    title = models.CharField(max_length=200, blank=True)
+    body = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
+
+    class Meta:
+        db_table = 'api_searchdocument'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='uniq_search_document'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'scope_id'], name='searchdoc_scope_idx'),
+        ]
+
+
+class SearchTerm(models.Model):
+    """Postings for the portable backend: one row per (term, document)."""
+    id = models.BigAutoField(primary_key=True)
+    term = models.CharField(max_length=64)
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name='terms')
+    weight = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return self.term
+
+    class Meta:
+        db_table = 'api_searchterm'
+        constraints = [
+            # Leading `term` column serves the prefix lookups
+            models.UniqueConstraint(fields=['term', 'document'], name='uniq_search_term'),
+        ]
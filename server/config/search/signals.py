@@ -0,0 +1,31 @@
+from django.db.models.signals import post_save, post_delete
+
+from .index import Kind, index_instance, remove
+from task.models import Task, TaskComment
+from project.models import Project
+from note.models import Note
+
+
+# model -> (document kind, fields whose change needs a reindex)
+INDEXED = {
+    Task: (Kind.TASK, {'title', 'description'}),
+    Project: (Kind.PROJECT, {'name', 'description'}),
+    TaskComment: (Kind.COMMENT, {'content', 'task'}),
+    Note: (Kind.NOTE, {'title', 'content', 'owner'}),
+}
+
+
+def _index_saved(sender, instance, update_fields=None, raw=False, **kwargs):
+    kind, fields = INDEXED[sender]
+    if raw or (update_fields is not None and not fields & set(update_fields)):
+        return
+    index_instance(kind, instance)
+
+
+def _remove_deleted(sender, instance, **kwargs):
+    remove(INDEXED[sender][0], [instance.pk])
+
+
+for _model in INDEXED:
+    post_save.connect(_index_saved, sender=_model, dispatch_uid=f'search_save_{_model.__name__}')
+    post_delete.connect(_remove_deleted, sender=_model, dispatch_uid=f'search_delete_{_model.__name__}')
@@ -0,0 +1,76 @@
+import hashlib
+
+from django.core.cache import cache
+
+from .models import SearchDocument
+from .backends import get_backend
+from .index import Kind, visible_documents
+from .text import normalize, tokenize
+from task.cache import get_task_list_version
+
+
+KINDS = (Kind.TASK, Kind.PROJECT)
+MIN_PREFIX = 2
+# Candidates fetched per prefix; a shorter list is known to be complete
+CANDIDATE_LIMIT = 200
+SUGGEST_TIMEOUT = 60
+
+
+def _key(user, version, prefix):
+    digest = hashlib.md5(prefix.encode()).hexdigest()
+    return f"search_suggest:{user.pk}:{version}:{digest}"
+
+
+def _title_matches(title, terms):
+    words = tokenize(title)
+    return all(any(word.startswith(term) for word in words) for term in terms)
+
+
+def _fetch(user, terms):
+    """Ranked [kind, id, title] rows whose title matches `terms`, plus whether the list is complete."""
+    scored = get_backend().search(visible_documents(user, KINDS), terms, CANDIDATE_LIMIT)
+    titles = {
+        document_id: (kind, str(object_id), title)
+        for document_id, kind, object_id, title in
+        SearchDocument.objects.filter(id__in=[d for d, _ in scored]).values_list('id', 'kind', 'object_id', 'title')
+    }
+    rows = [list(titles[d]) for d, _ in scored if d in titles and _title_matches(titles[d][2], terms)]
+    return {"complete": len(scored) < CANDIDATE_LIMIT, "rows": rows}
+
+
+def suggest(user, query, limit=10):
+    """
+    Title suggestions for the search bar as [{id, title, type}], best first.
+
+    Candidates are cached per user and prefix. Every match for a longer
+    query is also a match for its prefixes, so once a prefix's complete
+    list is cached, later keystrokes filter it in memory instead of
+    querying. The key includes the user's task-list version, so edits to
+    visible tasks start a fresh cache; project renames wait for the timeout.
+    """
+    prefix = normalize(query).strip()
+    terms = tokenize(prefix)
+    if len(prefix) < MIN_PREFIX or not terms:
+        return []
+
+    version = get_task_list_version(user.pk)
+    keys = {_key(user, version, prefix[:n]): n for n in range(MIN_PREFIX, len(prefix) + 1)}
+    cached = cache.get_many(keys)
+
+    entry = None
+    for key in sorted(cached, key=keys.get, reverse=True):
+        if keys[key] == len(prefix):
+            entry = cached[key]
+            break
+        if cached[key]['complete']:
+            entry = {
+                "complete": True,
+                "rows": [row for row in cached[key]['rows'] if _title_matches(row[2], terms)],
+            }
+            cache.set(_key(user, version, prefix), entry, SUGGEST_TIMEOUT)
+            break
+    if entry is None:
+        entry = _fetch(user, terms)
+        cache.set(_key(user, version, prefix), entry, SUGGEST_TIMEOUT)
+
+    return [{"id": object_id, "title": title, "type": kind} for kind, object_id, title in entry['rows'][:limit]]
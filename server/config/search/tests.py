@@ -0,0 +1,181 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from user.models import User
+from project.models import Project
+from note.models import Note
+from task.models import Task, Subtask, TaskComment
+from .models import SearchDocument
+
+
+class SearchIndexTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+
+    def _search(self, query):
+        response = self.client.get(reverse('search-tasks-projects'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_ranked_prefix_search_with_highlights(self):
+        body_match = Task.objects.create(title='Release notes', description='Update the deployment checklist', creator=self.user)
+        title_match = Task.objects.create(title='Deployment pipeline', creator=self.user)
+        Task.objects.create(title='Deploy nothing here', creator=self.other)
+
+        data = self._search('deploym')
+
+        self.assertEqual([t['id'] for t in data['tasks']], [str(title_match.id), str(body_match.id)])
+        self.assertEqual(data['tasks'][0]['highlight']['title'], '<mark>Deployment</mark> pipeline')
+        self.assertIn('<mark>deployment</mark>', data['tasks'][1]['highlight']['body'])
+
+    def test_index_follows_saves_and_deletes(self):
+        project = Project.objects.create(name='Apollo', creator=self.user)
+        task = Task.objects.create(title='Draft spec', creator=self.user, project=project)
+        comment = TaskComment.objects.create(task=task, author=self.user, content='Needs a <b>zebra</b> review')
+
+        self.assertEqual([p['id'] for p in self._search('apol')['projects']], [str(project.id)])
+        comments = self._search('zebra')['comments']
+        self.assertEqual([c['task_id'] for c in comments], [task.id])
+        self.assertIn('&lt;b&gt;<mark>zebra</mark>&lt;/b&gt;', comments[0]['highlight']['body'])
+
+        task.title = 'Final spec'
+        task.save(update_fields=['title'])
+        self.assertEqual(self._search('draft')['tasks'], [])
+        self.assertEqual(len(self._search('final spec')['tasks']), 1)
+
+        task.delete()
+        self.assertEqual(self._search('zebra')['comments'], [])
+        self.assertFalse(SearchDocument.objects.filter(object_id__in=[task.id, comment.id]).exists())
+
+    def test_results_follow_visibility_rules(self):
+        project = Project.objects.create(name='Shared roadmap', creator=self.other)
+        Task.objects.create(title='Roadmap review', creator=self.other, project=project)
+        Note.objects.create(title='Roadmap thoughts', owner=self.other)
+
+        data = self._search('roadmap')
+        self.assertEqual((data['projects'], data['tasks']), ([], []))
+
+        project.members.add(self.user)
+        data = self._search('roadmap')
+        self.assertEqual(len(data['projects']), 1)
+        self.assertEqual(len(data['tasks']), 1)
+
+        response = self.client.get(reverse('note-search'), {'q': 'roadmap'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_note_search(self):
+        Note.objects.create(title='Groceries', content='Buy café beans', owner=self.user)
+        Note.objects.create(title='Ideas', content='Nothing relevant', owner=self.user)
+
+        response = self.client.get(reverse('note-search'), {'q': 'cafe'})
+
+        results = response.data['results']
+        self.assertEqual([note['title'] for note in results], ['Groceries'])
+        self.assertEqual(results[0]['highlight']['body'], 'Buy <mark>café</mark> beans')
+        self.assertEqual(self.client.get(reverse('note-search'), {'q': ''}).data['count'], 2)
+
+    def test_note_search_pages_through_every_match(self):
+        Note.objects.bulk_create([Note(title=f'Standup {i}', owner=self.user) for i in range(30)])
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        with CaptureQueriesContext(connection) as ctx:
+            first = self.client.get(reverse('note-search'), {'q': 'standup'}).data
+        # Served from the index alone, never a LIKE scan over the notes
+        self.assertFalse(any(' LIKE ' in q['sql'] for q in ctx.captured_queries))
+        second = self.client.get(reverse('note-search'), {'q': 'standup', 'page': 2}).data
+
+        self.assertEqual(first['count'], 30)
+        titles = [note['title'] for note in first['results'] + second['results']]
+        self.assertEqual(len(set(titles)), 30)
+
+    def test_words_match_by_prefix_only(self):
+        prefix = Task.objects.create(title='Logbook review', creator=self.user)
+        Task.objects.create(title='Backlog grooming', creator=self.user)
+        Note.objects.create(title='Weblog drafts', owner=self.user)
+
+        self.assertEqual([t['id'] for t in self._search('log')['tasks']], [str(prefix.id)])
+        self.assertEqual(self.client.get(reverse('note-search'), {'q': 'blog'}).data['results'], [])
+
+    def test_sparse_search_loads_expanded_fields_in_fixed_queries(self):
+        def search_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(
+                    reverse('search-tasks-projects'), {'q': 'sprint', 'expand': 'subtasks,dependencies,blocking'},
+                )
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries), response.data['tasks']
+
+        previous = None
+        for i in range(2):
+            task = Task.objects.create(title=f'Sprint {i}', creator=self.user)
+            Subtask.objects.create(task=task, text='step', assignee=self.other)
+            if previous:
+                task.dependencies.add(previous)
+            previous = task
+        few, tasks = search_queries()
+        self.assertEqual(len(tasks), 2)
+        self.assertIn('subtasks', tasks[0])
+
+        for i in range(2, 6):
+            task = Task.objects.create(title=f'Sprint {i}', creator=self.user)
+            Subtask.objects.create(task=task, text='step', assignee=self.other)
+            task.dependencies.add(previous)
+            previous = task
+        many, tasks = search_queries()
+        self.assertEqual(len(tasks), 6)
+        self.assertEqual(many, few)
+
+    @override_settings(SEARCH_BACKEND='terms')
+    def test_term_backend_after_rebuild(self):
+        Task.objects.create(title='Invoice export', creator=self.user)
+        Task.objects.create(title='Export', description='invoice totals in the body', creator=self.user)
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        data = self._search('invoice exp')
+
+        self.assertEqual([t['title'] for t in data['tasks']], ['Invoice export', 'Export'])
+
+
+class SearchSuggestTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name='Deployment tooling', creator=self.user)
+        self.task = Task.objects.create(title='Deploy the API', description='no match in title: zebra', creator=self.user)
+        Task.objects.create(title='Design review', creator=self.user)
+
+    def _suggest(self, query):
+        response = self.client.get(reverse('search-suggest'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_compact_title_matches(self):
+        results = self._suggest('depl')
+
+        self.assertEqual({r['type'] for r in results}, {'task', 'project'})
+        self.assertEqual(set(results[0]), {'id', 'title', 'type'})
+        self.assertEqual(self._suggest('zebra'), [])
+        self.assertEqual(self._suggest('d'), [])
+
+    def test_longer_query_is_filtered_from_cached_prefix(self):
+        self.assertEqual(len(self._suggest('de')), 3)
+
+        with self.assertNumQueries(0):
+            results = self._suggest('deploy a')
+        self.assertEqual(results, [{'id': str(self.task.id), 'title': 'Deploy the API', 'type': 'task'}])
+
+    def test_task_edits_start_a_fresh_cache(self):
+        self._suggest('de')
+        self.task.title = 'Release the API'
+        self.task.save()
+
+        self.assertEqual([r['title'] for r in self._suggest('rel')], ['Release the API'])
+        self.assertNotIn('Deploy the API', [r['title'] for r in self._suggest('dep')])
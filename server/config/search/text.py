@@ -0,0 +1,57 @@
+import re
+import unicodedata
+
+from django.utils.html import escape
+
+
+# Letters and digits; matches how FTS5's unicode61 tokenizer splits text
+_WORD = re.compile(r'[^\W_]+')
+MAX_TERM_LENGTH = 64
+
+
+def normalize(text):
+    """Case-fold and strip accents so `Café` and `cafe` index the same."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text):
+    return [word[:MAX_TERM_LENGTH] for word in _WORD.findall(normalize(text))]
+
+
+def highlight(text, terms, words=None):
+    """
+    HTML-escape `text` and wrap every word starting with one of `terms` in
+    <mark>. With `words`, keep only a window of that many words around the
+    first match, marking cut ends with an ellipsis.
+    """
+    text = text or ''
+    prefixes = tuple(terms)
+    tokens = list(_WORD.finditer(text))
+    marked = [m for m in tokens if prefixes and normalize(m.group()).startswith(prefixes)]
+
+    start, end = 0, len(text)
+    if words is not None and len(tokens) > words:
+        first = tokens.index(marked[0]) if marked else 0
+        low = max(0, first - words // 3)
+        high = min(len(tokens), low + words)
+        low = max(0, high - words)
+        start = tokens[low].start() if low else 0
+        end = tokens[high - 1].end() if high < len(tokens) else len(text)
+
+    pieces = []
+    position = start
+    for match in marked:
+        if match.start() < start or match.end() > end:
+            continue
+        pieces.append(escape(text[position:match.start()]))
+        pieces.append(f'<mark>{escape(match.group())}</mark>')
+        position = match.end()
+    pieces.append(escape(text[position:end]))
+
+    result = ''.join(pieces)
+    if start > 0:
+        result = '…' + result
+    if end < len(text):
+        result += '…'
+    return result
@@ -0,0 +1,68 @@
+from collections import defaultdict
+
+from django.db.models import Count
+
+from .models import Task
+
+
+def _dependency_links():
+    return Task.dependencies.through.objects.all()
+
+
+def dependents_of(task_ids):
+    """Tasks that list any of `task_ids` as a dependency (one hop only)."""
+    return set(
+        _dependency_links().filter(to_task_id__in=task_ids).values_list('from_task_id', flat=True)
+    )
+
+
+def refresh_blocked_state(task_ids):
+    """
+    Recompute `open_blocker_count` / `is_blocked` for `task_ids` from their
+    direct dependencies, writing only the rows whose value changed.
+
+    Returns the ids that went from blocked to unblocked.
+    """
+    task_ids = set(task_ids)
+    if not task_ids:
+        return set()
+
+    counts = dict(
+        _dependency_links()
+        .filter(from_task_id__in=task_ids)
+        .exclude(to_task__status=Task.Status.DONE)
+        .order_by()
+        .values('from_task_id')
+        .annotate(open=Count('to_task_id'))
+        .values_list('from_task_id', 'open')
+    )
+
+    changed = defaultdict(list)
+    unblocked = set()
+    current = Task.objects.filter(id__in=task_ids).values_list('id', 'open_blocker_count')
+    for task_id, old_count in current:
+        new_count = counts.get(task_id, 0)
+        if new_count != old_count:
+            changed[new_count].append(task_id)
+            if old_count and not new_count:
+                unblocked.add(task_id)
+
+    # One UPDATE per distinct count; in practice that is one or two statements
+    for new_count, ids in changed.items():
+        Task.objects.filter(id__in=ids).update(open_blocker_count=new_count, is_blocked=new_count > 0)
+    return unblocked
+
+
+def propagate_status_change(task_ids):
+    """
+    Refresh the direct dependents of tasks whose status moved into or out of
+    Done. Returns the dependents that are now ready to start.
+    """
+    return refresh_blocked_state(dependents_of(task_ids))
+
+
+def rebuild_blocked_state(batch_size=1000):
+    """Recompute the cached blocker columns for every task."""
+    ids = list(Task.objects.order_by().values_list('id', flat=True))
+    for start in range(0, len(ids), batch_size):
+        refresh_blocked_state(ids[start:start + batch_size])
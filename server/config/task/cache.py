@@ -0,0 +1,68 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from .models import Task, TaskVisibility
+from common.versions import get_version, bump_versions
+
+
+def _cache():
+    return caches[getattr(settings, 'TASK_LIST_CACHE_ALIAS', 'default')]
+
+
+def get_task_list_version(user_id):
+    """Current cache generation for a user's task lists; bumping it orphans every cached page."""
+    return get_version('task_list', user_id)
+
+
+def users_for_tasks(task_ids):
+    return set(
+        TaskVisibility.objects.filter(task_id__in=task_ids).values_list('user_id', flat=True)
+    )
+
+
+def invalidate_task_lists(task_ids=(), user_ids=()):
+    """
+    Drop cached task lists for everyone who can see `task_ids`, plus `user_ids`,
+    and bump the per-task versions that feed the detail ETags.
+    """
+    task_ids = [t for t in task_ids if t is not None]
+    affected = set(user_ids)
+    if task_ids:
+        affected |= users_for_tasks(task_ids)
+        bump_versions('task', task_ids)
+    bump_versions('task_list', affected)
+
+
+def invalidate_project_task_lists(project_id, user_ids=()):
+    task_ids = list(Task.objects.filter(project_id=project_id).values_list('id', flat=True))
+    invalidate_task_lists(task_ids, user_ids)
+
+
+class CachedTaskListMixin:
+    """
+    Serve list responses from a per-user, versioned cache.
+
+    The key covers the view, the full query string and the user's current
+    version, so any filter/page combination is cached independently and all
+    of them are invalidated together by `invalidate_task_lists`.
+    """
+    cache_namespace = None
+
+    def _list_cache_key(self, request):
+        query = hashlib.md5(request.META.get('QUERY_STRING', '').encode()).hexdigest()
+        version = get_task_list_version(request.user.pk)
+        namespace = self.cache_namespace or type(self).__name__
+        return f"task_list:{request.user.pk}:{version}:{namespace}:{query}"
+
+    def list(self, request, *args, **kwargs):
+        key = self._list_cache_key(request)
+        data = _cache().get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        _cache().set(key, response.data, getattr(settings, 'TASK_LIST_CACHE_TIMEOUT', 300))
+        return response
@@ -0,0 +1,134 @@
+from django.db.models import F, Q, Count, Sum, Subquery, OuterRef, IntegerField
+from django.db.models.functions import Coalesce
+
+from .models import Task, Subtask, TaskComment, TimeLog
+from asset.models import Asset
+
+
+def _seconds(duration):
+    return duration.total_seconds() if duration else 0.0
+
+
+# What one child row contributes to its task's counters, from a dict of its
+# column values: the instance's `__dict__` (so a deferred field never costs a
+# query) or the stored row read back in pre_save.
+CONTRIBUTIONS = {
+    Asset: lambda values: {'asset_count': 1},
+    Subtask: lambda values: {'subtask_total': 1, 'subtask_done': int(bool(values.get('is_completed')))},
+    TaskComment: lambda values: {'comment_count': 1},
+    TimeLog: lambda values: {'total_seconds_logged': _seconds(values.get('duration'))},
+}
+
+# Fields a save has to touch to move a row's contribution
+TRACKED_FIELDS = {
+    Asset: {'task'},
+    Subtask: {'task', 'is_completed'},
+    TaskComment: {'task'},
+    TimeLog: {'task', 'duration'},
+}
+
+COUNTER_FIELDS = ['asset_count', 'subtask_total', 'subtask_done', 'comment_count', 'total_seconds_logged']
+
+
+def adjust_counters(task_id, deltas):
+    """Apply `deltas` to one task in a single UPDATE ... SET x = x + delta."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if task_id is None or not deltas:
+        return
+    Task.objects.filter(pk=task_id).update(**{field: F(field) + delta for field, delta in deltas.items()})
+
+
+def _snapshot(model, values):
+    return values.get('task_id'), CONTRIBUTIONS[model](values)
+
+
+def snapshot(instance):
+    """The (task_id, contribution) pair this row currently counts towards."""
+    return _snapshot(type(instance), instance.__dict__)
+
+
+def stored_snapshot(instance, update_fields=None):
+    """
+    The pair the saved row counts towards, read back by primary key, or
+    None when `update_fields` leaves every tracked field alone.
+    """
+    model = type(instance)
+    tracked = TRACKED_FIELDS[model]
+    if update_fields is not None and not tracked & {model._meta.get_field(f).name for f in update_fields}:
+        return None
+    columns = [model._meta.get_field(f).attname for f in tracked]
+    stored = model._base_manager.filter(pk=instance.pk).values(*columns).first()
+    return _snapshot(model, stored) if stored is not None else (None, {})
+
+
+def apply_change(before, after):
+    """Move a row's contribution from `before` to `after` (either may be (None, {}))."""
+    old_task, old = before
+    new_task, new = after
+    if old_task == new_task:
+        adjust_counters(new_task, {f: new.get(f, 0) - old.get(f, 0) for f in new.keys() | old.keys()})
+        return
+    adjust_counters(old_task, {f: -v for f, v in old.items()})
+    adjust_counters(new_task, new)
+
+
+def _count(model, condition=Q()):
+    return Coalesce(Subquery(
+        model.objects.filter(condition, task=OuterRef('pk'))
+        .order_by()
+        .values('task')
+        .annotate(n=Count('pk'))
+        .values('n'),
+        output_field=IntegerField()
+    ), 0)
+
+
+def _logged_seconds(task_ids=None):
+    """{task_id: seconds} from one grouped SUM over TimeLog."""
+    rows = TimeLog.objects.filter(duration__isnull=False)
+    if task_ids is not None:
+        rows = rows.filter(task_id__in=task_ids)
+    rows = rows.order_by().values('task_id').annotate(total=Sum('duration')).values_list('task_id', 'total')
+    return {task_id: _seconds(total) for task_id, total in rows}
+
+
+def recompute_counters(task_ids=None, batch_size=1000):
+    """
+    Recompute every counter from the child tables: one UPDATE with correlated
+    counts, plus a batched bulk_update for the logged time (durations are
+    stored differently per backend, so they are summed by the ORM first).
+    """
+    tasks = Task.objects.all() if task_ids is None else Task.objects.filter(id__in=task_ids)
+    tasks.update(
+        asset_count=_count(Asset),
+        subtask_total=_count(Subtask),
+        subtask_done=_count(Subtask, Q(is_completed=True)),
+        comment_count=_count(TaskComment),
+        total_seconds_logged=0.0,
+    )
+    logged = [Task(pk=task_id, total_seconds_logged=total) for task_id, total in _logged_seconds(task_ids).items()]
+    Task.objects.bulk_update(logged, ['total_seconds_logged'], batch_size=batch_size)
+
+
+def counter_drift(task_ids=None):
+    """Tasks whose stored counters differ from the child tables, as {task_id: {field: (stored, actual)}}."""
+    tasks = Task.objects.all() if task_ids is None else Task.objects.filter(id__in=task_ids)
+    rows = tasks.annotate(
+        actual_asset_count=_count(Asset),
+        actual_subtask_total=_count(Subtask),
+        actual_subtask_done=_count(Subtask, Q(is_completed=True)),
+        actual_comment_count=_count(TaskComment),
+    ).values('id', *COUNTER_FIELDS, *(f'actual_{f}' for f in COUNTER_FIELDS[:-1]))
+    logged = _logged_seconds(task_ids)
+
+    drift = {}
+    for row in rows:
+        row['actual_total_seconds_logged'] = logged.get(row['id'], 0.0)
+        diffs = {
+            field: (row[field], row[f'actual_{field}'])
+            for field in COUNTER_FIELDS
+            if abs(row[field] - row[f'actual_{field}']) > 1e-3
+        }
+        if diffs:
+            drift[row['id']] = diffs
+    return drift
@@ -0,0 +1,150 @@
+import csv
+import json
+from datetime import timedelta
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .models import Task, TimeLog, TaskActivity
+
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'json': 'application/json',
+}
+CHUNK_SIZE = 2000
+# Lines pulled from the sync generator per hop to the event loop (ASGI)
+STREAM_BATCH = 500
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the csv writer's caller."""
+    def write(self, value):
+        return value
+
+
+def _assignee_emails(task_ids):
+    emails = {}
+    rows = Task.assignees.through.objects.filter(task_id__in=task_ids).values_list('task_id', 'user__email')
+    for task_id, email in rows:
+        emails.setdefault(task_id, []).append(email)
+    return emails
+
+
+def task_rows(tasks):
+    """Task rows plus their assignees, fetched one extra query per chunk."""
+    fields = [
+        'id', 'title', 'description', 'status', 'priority', 'project_id', 'creator__email',
+        'due_date', 'due_time', 'completed_at', 'created_at', 'updated_at', 'is_blocked',
+        'subtask_total', 'subtask_done', 'comment_count', 'asset_count', 'total_seconds_logged',
+    ]
+    rows = tasks.order_by('created_at', 'id').values(*fields).iterator(chunk_size=CHUNK_SIZE)
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            return
+        emails = _assignee_emails([row['id'] for row in chunk])
+        for row in chunk:
+            row['creator'] = row.pop('creator__email')
+            row['assignees'] = ';'.join(emails.get(row['id'], ()))
+            yield row
+
+
+def time_log_rows(tasks):
+    rows = (
+        TimeLog.objects.filter(task__in=tasks)
+        .order_by('start_time', 'id')
+        .values('id', 'task_id', 'task__title', 'user__email', 'start_time', 'end_time', 'duration', 'description')
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for row in rows:
+        duration = row.pop('duration')
+        row['task_title'] = row.pop('task__title')
+        row['user'] = row.pop('user__email')
+        row['duration_seconds'] = duration.total_seconds() if isinstance(duration, timedelta) else None
+        yield row
+
+
+def activity_rows(tasks):
+    rows = (
+        TaskActivity.objects.filter(task__in=tasks)
+        .order_by('timestamp', 'id')
+        .values('id', 'task_id', 'task__title', 'user__email', 'type', 'action', 'details', 'timestamp')
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for row in rows:
+        row['task_title'] = row.pop('task__title')
+        row['user'] = row.pop('user__email')
+        yield row
+
+
+# name -> (CSV columns, row generator)
+EXPORTS = {
+    'tasks': (
+        ['id', 'title', 'description', 'status', 'priority', 'project_id', 'creator', 'assignees',
+         'due_date', 'due_time', 'completed_at', 'created_at', 'updated_at', 'is_blocked',
+         'subtask_total', 'subtask_done', 'comment_count', 'asset_count', 'total_seconds_logged'],
+        task_rows,
+    ),
+    'time-logs': (
+        ['id', 'task_id', 'task_title', 'user', 'start_time', 'end_time', 'duration_seconds', 'description'],
+        time_log_rows,
+    ),
+    'activity': (
+        ['id', 'task_id', 'task_title', 'user', 'type', 'action', 'details', 'timestamp'],
+        activity_rows,
+    ),
+}
+
+
+def _jsonable(row):
+    return json.dumps(row, cls=DjangoJSONEncoder)
+
+
+def render(rows, fmt, columns):
+    """Yield the export one line at a time so memory stays flat."""
+    if fmt == 'jsonl':
+        for row in rows:
+            yield _jsonable(row) + '\n'
+        return
+
+    if fmt == 'json':
+        yield '['
+        for index, row in enumerate(rows):
+            yield ('\n' if index == 0 else ',\n') + _jsonable(row)
+        yield '\n]\n'
+        return
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([
+            json.dumps(row[key], cls=DjangoJSONEncoder) if isinstance(row[key], (dict, list)) else row[key]
+            for key in columns
+        ])
+
+
+async def _batches(lines, size=STREAM_BATCH):
+    """
+    Async iterator over a sync line generator. Each step pulls `size` lines
+    on Django's sync thread, where the queryset cursors live, so only one
+    batch is in memory at a time.
+    """
+    take = sync_to_async(lambda: ''.join(islice(lines, size)), thread_sensitive=True)
+    while chunk := await take():
+        yield chunk
+
+
+def streaming_response(request, lines, content_type):
+    """
+    Stream `lines` with memory kept flat under both servers: WSGI iterates
+    the sync generator directly, while under ASGI Django would read a sync
+    iterator into a list first, so it gets an async iterator of batches.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        lines = _batches(lines)
+    return StreamingHttpResponse(lines, content_type=content_type)
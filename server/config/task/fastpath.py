@@ -0,0 +1,152 @@
+from django.db.models import F
+
+from common.fastpath import (
+    format_uuid, format_datetime, format_date, format_time, users_by_id, group_by,
+)
+from project.models import Project, ProjectMember
+from user.models import User
+from .models import Task, Subtask, TimeLog
+
+
+TASK_COLUMNS = (
+    'id', 'title', 'description', 'creator_id', 'project_id', 'status', 'priority',
+    'due_date', 'due_time', 'completed_at', 'created_at', 'updated_at',
+    'is_blocked', 'open_blocker_count', 'subtask_total', 'subtask_done', 'comment_count',
+    'asset_count', 'total_seconds_logged',
+)
+DEPENDENCY_COLUMNS = ('id', 'title', 'status', 'priority')
+ACTIVITY_COLUMNS = ('id', 'task_id', 'user_id', 'type', 'action', 'details', 'timestamp')
+
+
+def _dependency_row(row):
+    return {'id': format_uuid(row['id']), 'title': row['title'], 'status': row['status'], 'priority': row['priority']}
+
+
+def _projects_by_id(project_ids, users, request):
+    """ProjectSerializer output keyed by id; `users` gains the creators and members it needs."""
+    projects = list(Project.objects.filter(id__in=project_ids).values(
+        'id', 'name', 'description', 'creator_id', 'created_at', 'updated_at'
+    ))
+    members = group_by(ProjectMember.objects.filter(project_id__in=project_ids).values(
+        'id', 'project_id', 'user_id', 'role', 'created_at', 'updated_at'
+    ), 'project_id')
+    needed = {p['creator_id'] for p in projects} | {m['user_id'] for group in members.values() for m in group}
+    users.update(users_by_id(needed - users.keys(), request))
+    return {
+        project['id']: {
+            'id': format_uuid(project['id']),
+            'name': project['name'],
+            'description': project['description'],
+            'creator': users.get(project['creator_id']),
+            'members': [
+                {
+                    'id': format_uuid(member['id']),
+                    'project': format_uuid(member['project_id']),
+                    'user': users[member['user_id']],
+                    'role': member['role'],
+                    'created_at': format_datetime(member['created_at']),
+                    'updated_at': format_datetime(member['updated_at']),
+                }
+                for member in members.get(project['id'], [])
+            ],
+            'created_at': format_datetime(project['created_at']),
+            'updated_at': format_datetime(project['updated_at']),
+        }
+        for project in projects
+    }
+
+
+def task_rows(rows, request):
+    """
+    TaskSerializer output for values(*TASK_COLUMNS) rows. Children are read
+    with the same filters the list prefetches use, so they come back in the
+    same order, and every user is serialized once per page.
+    """
+    task_ids = [row['id'] for row in rows]
+    if not task_ids:
+        return []
+
+    # Same join as the `assignees` prefetch: users filtered through the m2m table
+    assignee_ids = group_by(
+        User.objects.filter(assigned_tasks__in=task_ids).values('id', task_id=F('assigned_tasks')),
+        'task_id',
+    )
+    subtasks = group_by(Subtask.objects.filter(task_id__in=task_ids).values(
+        'id', 'task_id', 'text', 'assignee_id', 'is_completed', 'created_at', 'updated_at'
+    ), 'task_id')
+    dependencies = group_by(Task.objects.filter(blocking__in=task_ids).values('blocking', *DEPENDENCY_COLUMNS), 'blocking')
+    blocking = group_by(Task.objects.filter(dependencies__in=task_ids).values('dependencies', *DEPENDENCY_COLUMNS), 'dependencies')
+    open_logs = group_by(
+        TimeLog.objects.filter(end_time__isnull=True).filter(task_id__in=task_ids).values('task_id', 'user_id', 'start_time'),
+        'task_id',
+    )
+
+    users = users_by_id(
+        {row['creator_id'] for row in rows} |
+        {link['id'] for links in assignee_ids.values() for link in links} |
+        {s['assignee_id'] for group in subtasks.values() for s in group} |
+        {log['user_id'] for logs in open_logs.values() for log in logs},
+        request,
+    )
+    projects = _projects_by_id({row['project_id'] for row in rows} - {None}, users, request)
+
+    results = []
+    for row in rows:
+        logs = open_logs.get(row['id'], [])
+        own_log = next((log for log in logs if log['user_id'] == request.user.id), None)
+        results.append({
+            'id': format_uuid(row['id']),
+            'title': row['title'],
+            'description': row['description'],
+            'creator': users.get(row['creator_id']),
+            'project': projects.get(row['project_id']),
+            'assignees': [users[link['id']] for link in assignee_ids.get(row['id'], [])],
+            'status': row['status'],
+            'priority': row['priority'],
+            'subtasks': [
+                {
+                    'id': format_uuid(subtask['id']),
+                    'text': subtask['text'],
+                    'assignee': users.get(subtask['assignee_id']),
+                    'is_completed': subtask['is_completed'],
+                    'created_at': format_datetime(subtask['created_at']),
+                    'updated_at': format_datetime(subtask['updated_at']),
+                }
+                for subtask in subtasks.get(row['id'], [])
+            ],
+            'total_assets': row['asset_count'],
+            'dependencies': [_dependency_row(dep) for dep in dependencies.get(row['id'], [])],
+            'blocking': [_dependency_row(dep) for dep in blocking.get(row['id'], [])],
+            'due_date': format_date(row['due_date']),
+            'due_time': format_time(row['due_time']),
+            'completed_at': format_datetime(row['completed_at']),
+            'created_at': format_datetime(row['created_at']),
+            'updated_at': format_datetime(row['updated_at']),
+            'total_time_taken': row['total_seconds_logged'] or 0,
+            # A SerializerMethodField hands the datetime to the renderer as it is
+            'active_timer_start': own_log['start_time'] if own_log else None,
+            'active_timers': [users[log['user_id']] for log in logs],
+            'is_blocked': row['is_blocked'],
+            'open_blocker_count': row['open_blocker_count'],
+            'subtask_total': row['subtask_total'],
+            'subtask_done': row['subtask_done'],
+            'comment_count': row['comment_count'],
+        })
+    return results
+
+
+def activity_rows(rows, request):
+    """TaskActivitySerializer output for values(*ACTIVITY_COLUMNS) rows."""
+    users = users_by_id({row['user_id'] for row in rows}, request)
+    return [
+        {
+            'id': format_uuid(row['id']),
+            'task': format_uuid(row['task_id']),
+            'user': users.get(row['user_id']),
+            'type': row['type'],
+            'action': row['action'],
+            'details': row['details'],
+            'timestamp': format_datetime(row['timestamp']),
+        }
+        for row in rows
+    ]
@@ -4,8 +4,8 @@ from project.models import Project
 from django.utils.timezone import now
 
 class TaskFilter(django_filters.FilterSet):
-    priority = django_filters.CharFilter(field_name='priority', lookup_expr='iexact')
-    status = django_filters.CharFilter(field_name='status', lookup_expr='iexact')
+    priority = django_filters.CharFilter(field_name='priority', method='filter_choice')
+    status = django_filters.CharFilter(field_name='status', method='filter_choice')
     creator = django_filters.UUIDFilter(field_name='creator')
     
 
@@ -14,11 +14,13 @@ class TaskFilter(django_filters.FilterSet):
     due_today = django_filters.BooleanFilter(method='filter_due_today')
     overdue = django_filters.BooleanFilter(method='filter_overdue')
     project_id = django_filters.UUIDFilter(field_name="project__id",method="filter_by_project")
+    is_blocked = django_filters.BooleanFilter(field_name='is_blocked')
+    ready = django_filters.BooleanFilter(method='filter_ready')
 
 
     class Meta:
         model = Task
-        fields = ['priority', 'status', 'creator', 'assigned_to_me', 'created_by_me', 'due_today', 'overdue', 'project_id']
+        fields = ['priority', 'status', 'creator', 'assigned_to_me', 'created_by_me', 'due_today', 'overdue', 'project_id', 'is_blocked', 'ready']
         
     def __init__(self, *args, **kwargs):
         request = kwargs.get('request', None)
@@ -26,6 +28,15 @@ class TaskFilter(django_filters.FilterSet):
         if request is not None:
             self.request = request
 
+    def filter_choice(self, queryset, name, value):
+        # Match case-insensitively against the choices in Python, then filter with an
+        # exact lookup so the status/priority indexes can be used (iexact defeats them).
+        choices = {choice.lower(): choice for choice, _ in Task._meta.get_field(name).choices}
+        canonical = choices.get(value.lower())
+        if canonical is None:
+            return queryset.none()
+        return queryset.filter(**{name: canonical})
+
     def filter_assigned_to_me(self, queryset, name, value):
         user = getattr(self.request, "user", None) if self.request else None
         if not user or not user.is_authenticated:
@@ -58,11 +69,20 @@ class TaskFilter(django_filters.FilterSet):
     def filter_overdue(self, queryset, name, value):
         if value:
             today = now().date()
-            return queryset.filter(due_date__lt=today).exclude(status__iexact="Done")
+            return queryset.filter(due_date__lt=today).exclude(status=Task.Status.DONE)
         if value is False:
             today = now().date()
             return queryset.exclude(due_date__lt=today)
         return queryset
     
+    def filter_ready(self, queryset, name, value):
+        # "Ready to start": still To Do and no open blockers, served by task_ready_idx
+        ready = {'is_blocked': False, 'status': Task.Status.TODO}
+        if value is True:
+            return queryset.filter(**ready)
+        if value is False:
+            return queryset.exclude(**ready)
+        return queryset
+
     def filter_by_project(self, queryset, name, value):
         return queryset.filter(project__id=value)
@@ -0,0 +1,177 @@
+from collections import defaultdict, deque
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import Task
+from common.versions import get_version, bump_versions
+
+
+GLOBAL_SCOPE = 'all'
+GRAPH_CACHE_TIMEOUT = 60 * 60
+
+# Built graphs for the current process, keyed by versioned cache key
+_local_graphs = {}
+
+
+class DependencyCycleError(Exception):
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__(" -> ".join(str(t) for t in cycle))
+
+
+class DependencyGraph:
+    """
+    Task.dependencies as adjacency sets. An edge (task, dependency) means
+    `task` cannot start until `dependency` is done.
+
+    A project graph holds every edge touching one of the project's tasks;
+    `external` lists endpoints that belong to other projects. When it is
+    non-empty, whole-graph questions (cycles) must be answered by the global
+    graph instead.
+    """
+
+    def __init__(self, edges, external=()):
+        self.blockers = defaultdict(set)
+        self.dependents = defaultdict(set)
+        for task_id, dependency_id in edges:
+            self.blockers[task_id].add(dependency_id)
+            self.dependents[dependency_id].add(task_id)
+        self.external = set(external)
+
+    @property
+    def nodes(self):
+        return set(self.blockers) | set(self.dependents)
+
+    @staticmethod
+    def _walk(start, adjacency):
+        seen = set()
+        queue = deque(adjacency.get(start, ()))
+        while queue:
+            node = queue.popleft()
+            if node in seen:
+                continue
+            seen.add(node)
+            queue.extend(adjacency.get(node, ()))
+        return seen
+
+    def transitive_blockers(self, task_id):
+        """Every task that must be done, directly or indirectly, before `task_id`."""
+        return self._walk(task_id, self.blockers)
+
+    def transitive_blocked(self, task_id):
+        """Every task waiting, directly or indirectly, on `task_id`."""
+        return self._walk(task_id, self.dependents)
+
+    def path(self, start, goal):
+        """Shortest blocker chain from `start` to `goal`, or None."""
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == goal:
+                chain = []
+                while node is not None:
+                    chain.append(node)
+                    node = parents[node]
+                return chain[::-1]
+            for nxt in self.blockers.get(node, ()):
+                if nxt not in parents:
+                    parents[nxt] = node
+                    queue.append(nxt)
+        return None
+
+    def cycle_for(self, task_id, dependency_ids):
+        """The cycle that making `task_id` depend on `dependency_ids` would close, or None."""
+        for dependency_id in dependency_ids:
+            if dependency_id == task_id:
+                return [task_id, task_id]
+            chain = self.path(dependency_id, task_id)
+            if chain:
+                return [task_id, *chain]
+        return None
+
+    def topological_order(self):
+        """Tasks ordered so every dependency precedes its dependents (Kahn's algorithm)."""
+        remaining = {node: len(self.blockers.get(node, ())) for node in self.nodes}
+        ready = deque(sorted((n for n, count in remaining.items() if count == 0), key=str))
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for dependent in self.dependents.get(node, ()):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(remaining):
+            stuck = next(n for n, count in remaining.items() if count > 0)
+            raise DependencyCycleError(self.cycle_for(stuck, self.blockers[stuck]) or [stuck])
+        return order
+
+
+def _scope(project_id):
+    return str(project_id) if project_id else GLOBAL_SCOPE
+
+
+def _fetch_edges(project_id):
+    """One query over the dependencies through table."""
+    links = Task.dependencies.through.objects.all()
+    if project_id:
+        links = links.filter(Q(from_task__project_id=project_id) | Q(to_task__project_id=project_id))
+        rows = links.values_list('from_task_id', 'to_task_id', 'from_task__project_id', 'to_task__project_id')
+        edges, external = [], set()
+        for from_id, to_id, from_project, to_project in rows:
+            edges.append((from_id, to_id))
+            if from_project != project_id:
+                external.add(from_id)
+            if to_project != project_id:
+                external.add(to_id)
+        return edges, external
+    return list(links.values_list('from_task_id', 'to_task_id')), set()
+
+
+def load_graph(project_id=None):
+    """The (cached) dependency graph of a project, or of every task when `project_id` is None."""
+    scope = _scope(project_id)
+    key = f"dependency_graph:{scope}:{get_version('dependency_graph', scope)}"
+
+    graph = _local_graphs.get(key)
+    if graph is not None:
+        return graph
+
+    data = cache.get(key)
+    if data is None:
+        data = _fetch_edges(project_id)
+        cache.set(key, data, GRAPH_CACHE_TIMEOUT)
+
+    graph = DependencyGraph(*data)
+    if len(_local_graphs) > 64:
+        _local_graphs.clear()
+    _local_graphs[key] = graph
+    return graph
+
+
+def graph_for(task, dependencies=()):
+    """
+    The smallest graph that can answer questions about `task`: its project's
+    graph when the project is self-contained, otherwise the global one.
+    """
+    project_id = task.project_id
+    if project_id and all(d.project_id == project_id for d in dependencies):
+        graph = load_graph(project_id)
+        if not graph.external:
+            return graph
+    return load_graph(None)
+
+
+def find_dependency_cycle(task, dependencies):
+    """Return the cycle (list of task ids) that `task.dependencies = dependencies` would create."""
+    dependencies = list(dependencies)
+    if task.pk is None or not dependencies:
+        return None
+    return graph_for(task, dependencies).cycle_for(task.pk, [d.pk for d in dependencies])
+
+
+def invalidate_graphs(project_ids):
+    """Called from signals whenever dependency edges (or the tasks holding them) change."""
+    bump_versions('dependency_graph', {_scope(p) for p in project_ids} | {GLOBAL_SCOPE})
@@ -0,0 +1,355 @@
+import csv
+import io
+import json
+import uuid
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.dateparse import parse_date, parse_time
+
+from .models import Task, Subtask, TaskActivity
+from .graph import load_graph, DependencyGraph, invalidate_graphs
+from .visibility import visible_task_ids, sync_task_visibility
+from .cache import invalidate_task_lists
+from .blocking import refresh_blocked_state
+from search import index as search_index
+from user.models import User
+from project.models import Project
+
+
+FORMATS = ('csv', 'jsonl')
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _split(value):
+    """CSV cells hold lists as `a; b; c`; JSON rows may already carry a list."""
+    if value in (None, ''):
+        return []
+    if isinstance(value, list):
+        return value
+    return [part.strip() for part in str(value).replace('|', ';').split(';') if part.strip()]
+
+
+def _emails(value):
+    """Assignee emails of a row; JSON rows may hold numbers or other non-strings."""
+    return [str(email).strip() for email in _split(value) if str(email).strip()]
+
+
+class ImportFileError(ValueError):
+    """The file cannot be read past `row`; the rows before it were imported."""
+
+    def __init__(self, row, message):
+        super().__init__(message)
+        self.row = row
+
+
+def _csv_rows(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _jsonl_rows(stream):
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            row = {'__error__': f"Invalid JSON: {exc}"}
+        if not isinstance(row, dict):
+            row = {'__error__': "Each line must be a JSON object."}
+        yield number, row
+
+
+def parse_rows(stream, fmt):
+    """
+    Yield (row_number, dict) pairs from a binary or text stream without
+    reading the whole file. Unparseable JSON lines yield an `__error__` key;
+    a file that cannot be decoded or parsed any further raises ImportFileError.
+    """
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    number = 1
+    try:
+        for number, row in (_csv_rows(stream) if fmt == 'csv' else _jsonl_rows(stream)):
+            yield number, row
+    except UnicodeDecodeError:
+        raise ImportFileError(number + 1, "The file is not valid UTF-8.")
+    except csv.Error as exc:
+        raise ImportFileError(number + 1, f"Invalid CSV: {exc}")
+
+
+class TaskImporter:
+    """
+    Import tasks streamed from `parse_rows` on behalf of `user`.
+
+    Rows are validated and written a chunk at a time: users and projects are
+    resolved with one `IN` query per chunk, and tasks, assignee rows, subtasks
+    and activities are written with `bulk_create`. Dependencies may point at
+    existing task ids or at another row's `external_id`; they are linked once
+    every chunk is in, so forward references work.
+
+    A bad row is reported and skipped; it never aborts the rest of the file.
+    A file that stops being readable (bad encoding, broken CSV) ends the run
+    with `error` set; `chunks` lists the row ranges already committed.
+    `bulk_create` skips model signals, so the visibility and search indexes,
+    counters, caches, graphs and blocker state are refreshed explicitly. Imports do
+    not send assignment notifications.
+    """
+
+    def __init__(self, user, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.user = user
+        self.chunk_size = max(1, chunk_size)
+        self.users = {}
+        self.projects = {}
+        self.external_ids = {}
+        self.pending_dependencies = []
+        self.created = 0
+        self.rows = 0
+        self.errors = []
+        self.chunks = []
+        self.error = None
+
+    def run(self, rows):
+        chunk = []
+        try:
+            for item in rows:
+                chunk.append(item)
+                if len(chunk) == self.chunk_size:
+                    self._import_chunk(chunk)
+                    chunk = []
+        except ImportFileError as exc:
+            self.error = {"row": exc.row, "detail": f"{exc} Nothing from row {exc.row} on was imported."}
+        if chunk:
+            self._import_chunk(chunk)
+        self._link_dependencies()
+        return self.report()
+
+    def report(self):
+        report = {"rows": self.rows, "created": self.created, "errors": self.errors, "chunks": self.chunks}
+        if self.error:
+            report["error"] = self.error
+        return report
+
+    def _error(self, number, errors):
+        self.errors.append({"row": number, "errors": errors})
+
+    # --- lookups ---
+
+    def _resolve_users(self, chunk):
+        emails = set()
+        for _, row in chunk:
+            emails.update(e.lower() for e in _emails(row.get('assignees')))
+            for subtask in _split(row.get('subtasks')):
+                if isinstance(subtask, dict) and subtask.get('assignee'):
+                    emails.add(str(subtask['assignee']).lower())
+        wanted = emails - set(self.users)
+        if wanted:
+            matches = User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=wanted)
+            for user_id, email in matches.values_list('id', 'email_lower'):
+                self.users[email] = user_id
+
+    def _resolve_projects(self, chunk):
+        refs = {str(row.get('project')).strip() for _, row in chunk if row.get('project')}
+        wanted = refs - set(self.projects)
+        if not wanted:
+            return
+        ids = set()
+        for ref in wanted:
+            try:
+                ids.add(uuid.UUID(ref))
+            except ValueError:
+                pass
+        accessible = Project.objects.filter(Q(creator=self.user) | Q(members=self.user)).distinct()
+        for project_id, name in accessible.filter(Q(id__in=ids) | Q(name__in=wanted)).values_list('id', 'name'):
+            self.projects.setdefault(str(project_id), project_id)
+            self.projects.setdefault(name, project_id)
+
+    # --- validation ---
+
+    @staticmethod
+    def _choice(field, value, errors):
+        if value in (None, ''):
+            return Task._meta.get_field(field).default
+        choices = {choice.lower(): choice for choice, _ in Task._meta.get_field(field).choices}
+        canonical = choices.get(str(value).strip().lower())
+        if canonical is None:
+            errors[field] = f'"{value}" is not a valid choice.'
+        return canonical
+
+    def _build(self, number, row):
+        """Return (task, assignee_ids, subtasks, dependency_refs) or record the row's errors."""
+        if '__error__' in row:
+            self._error(number, {"row": row['__error__']})
+            return None
+
+        errors = {}
+        title = str(row.get('title') or '').strip()
+        if not title:
+            errors['title'] = "This field is required."
+        elif len(title) > Task._meta.get_field('title').max_length:
+            errors['title'] = "Ensure this field has no more than 200 characters."
+
+        status = self._choice('status', row.get('status'), errors)
+        priority = self._choice('priority', row.get('priority'), errors)
+
+        due_date = due_time = None
+        if row.get('due_date'):
+            due_date = parse_date(str(row['due_date']))
+            if due_date is None:
+                errors['due_date'] = "Use the YYYY-MM-DD format."
+        if row.get('due_time'):
+            due_time = parse_time(str(row['due_time']))
+            if due_time is None:
+                errors['due_time'] = "Use the HH:MM[:SS] format."
+
+        project_id = None
+        if row.get('project'):
+            project_id = self.projects.get(str(row['project']).strip())
+            if project_id is None:
+                errors['project'] = "Unknown project, or you are not a member of it."
+
+        assignee_ids = []
+        unknown = []
+        for email in _emails(row.get('assignees')):
+            user_id = self.users.get(email.lower())
+            if user_id:
+                assignee_ids.append(user_id)
+            else:
+                unknown.append(email)
+        if unknown:
+            errors['assignees'] = f"Unknown users: {', '.join(unknown)}."
+
+        allowed = set(assignee_ids) | {self.user.id}
+        subtasks = []
+        for subtask in _split(row.get('subtasks')):
+            text, assignee_id = (subtask.get('text'), subtask.get('assignee')) if isinstance(subtask, dict) else (subtask, None)
+            if assignee_id:
+                assignee_id = self.users.get(str(assignee_id).lower())
+                if assignee_id not in allowed:
+                    errors['subtasks'] = "Each subtask assignee must be a task assignee or the creator."
+            if not text:
+                errors['subtasks'] = "Subtasks need a text."
+            subtasks.append((str(text or '')[:200], assignee_id, bool(isinstance(subtask, dict) and subtask.get('is_completed'))))
+
+        external_id = str(row.get('external_id') or '').strip()
+        if external_id and external_id in self.external_ids:
+            errors['external_id'] = f'Duplicate external_id "{external_id}".'
+
+        if errors:
+            self._error(number, errors)
+            return None
+
+        task = Task(
+            id=uuid.uuid4(),
+            title=title,
+            description=row.get('description') or None,
+            creator=self.user,
+            project_id=project_id,
+            status=status,
+            priority=priority,
+            due_date=due_date,
+            due_time=due_time,
+            subtask_total=len(subtasks),
+            subtask_done=sum(done for _, _, done in subtasks),
+        )
+        if external_id:
+            self.external_ids[external_id] = task.id
+        return task, assignee_ids, subtasks, _split(row.get('dependencies'))
+
+    # --- writes ---
+
+    def _import_chunk(self, chunk):
+        self.rows += len(chunk)
+        self._resolve_users(chunk)
+        self._resolve_projects(chunk)
+
+        built = []
+        for number, row in chunk:
+            item = self._build(number, row)
+            if item is not None:
+                built.append((number, *item))
+        if not built:
+            self.chunks.append({"rows": [chunk[0][0], chunk[-1][0]], "created": 0})
+            return
+
+        Assignees = Task.assignees.through
+        with transaction.atomic():
+            Task.objects.bulk_create([task for _, task, *_ in built])
+            Assignees.objects.bulk_create([
+                Assignees(task_id=task.id, user_id=user_id)
+                for _, task, assignee_ids, *_ in built for user_id in dict.fromkeys(assignee_ids)
+            ])
+            Subtask.objects.bulk_create([
+                Subtask(task_id=task.id, text=text, assignee_id=assignee_id, is_completed=done)
+                for _, task, _, subtasks, _ in built for text, assignee_id, done in subtasks
+            ])
+            TaskActivity.objects.bulk_create([
+                TaskActivity(task_id=task.id, user=self.user, type="created", action="imported this task")
+                for _, task, *_ in built
+            ])
+            task_ids = [task.id for _, task, *_ in built]
+            sync_task_visibility(task_ids)
+            search_index.reindex(search_index.Kind.TASK, task_ids)
+            invalidate_task_lists(task_ids)
+
+        self.created += len(built)
+        self.chunks.append({"rows": [chunk[0][0], chunk[-1][0]], "created": len(built)})
+        self.pending_dependencies.extend(
+            (number, task.id, refs) for number, task, _, _, refs in built if refs
+        )
+
+    def _link_dependencies(self):
+        if not self.pending_dependencies:
+            return
+
+        refs = {ref for _, _, task_refs in self.pending_dependencies for ref in task_refs}
+        existing_ids = set()
+        for ref in refs - set(self.external_ids):
+            try:
+                existing_ids.add(uuid.UUID(str(ref)))
+            except ValueError:
+                pass
+        visible = set(
+            Task.objects.filter(id__in=existing_ids)
+            .filter(id__in=visible_task_ids(self.user))
+            .values_list('id', flat=True)
+        ) if existing_ids else set()
+
+        global_graph = load_graph(None)
+        graph = DependencyGraph(
+            (task_id, dependency_id)
+            for task_id, dependencies in global_graph.blockers.items()
+            for dependency_id in dependencies
+        )
+
+        Dependencies = Task.dependencies.through
+        links = []
+        for number, task_id, task_refs in self.pending_dependencies:
+            for ref in task_refs:
+                dependency_id = self.external_ids.get(str(ref))
+                if dependency_id is None:
+                    try:
+                        dependency_id = uuid.UUID(str(ref))
+                    except ValueError:
+                        dependency_id = None
+                    if dependency_id not in visible:
+                        self._error(number, {"dependencies": f'Unknown dependency "{ref}"; the task was imported without it.'})
+                        continue
+                if graph.cycle_for(task_id, [dependency_id]):
+                    self._error(number, {"dependencies": f'Dependency "{ref}" would create a cycle; the task was imported without it.'})
+                    continue
+                graph.blockers[task_id].add(dependency_id)
+                graph.dependents[dependency_id].add(task_id)
+                links.append(Dependencies(from_task_id=task_id, to_task_id=dependency_id))
+
+        with transaction.atomic():
+            for start in range(0, len(links), self.chunk_size):
+                Dependencies.objects.bulk_create(links[start:start + self.chunk_size], ignore_conflicts=True)
+            linked = {link.from_task_id for link in links} | {link.to_task_id for link in links}
+            refresh_blocked_state({link.from_task_id for link in links})
+            invalidate_graphs(set(Task.objects.filter(id__in=linked).values_list('project_id', flat=True)))
+            invalidate_task_lists(linked)
@@ -0,0 +1,34 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task.importer import TaskImporter, parse_rows, FORMATS, DEFAULT_CHUNK_SIZE
+from user.models import User
+
+
+class Command(BaseCommand):
+    help = "Import tasks from a CSV or JSON Lines file on behalf of a user."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help="Email of the user the tasks are created as.")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email__iexact=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}.")
+
+        fmt = options['format'] or ('jsonl' if options['path'].endswith(('.jsonl', '.json', '.ndjson')) else 'csv')
+        with open(options['path'], 'rb') as stream:
+            report = TaskImporter(user, chunk_size=options['chunk_size']).run(parse_rows(stream, fmt))
+
+        for error in report['errors']:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        if 'error' in report:
+            self.stderr.write(f"row {report['error']['row']}: {report['error']['detail']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} of {report['rows']} rows ({len(report['errors'])} errors)."
+        ))
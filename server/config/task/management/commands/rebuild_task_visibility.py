@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task.visibility import rebuild_task_visibility, verify_task_visibility
+
+
+class Command(BaseCommand):
+    help = "Rebuild the task visibility index from creators, assignees and project members."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help="Only compare the index with the source tables; exit non-zero on drift.",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['verify']:
+            missing, extra = verify_task_visibility()
+            if missing or extra:
+                raise CommandError(
+                    f"Task visibility index is out of date: {len(missing)} missing, {len(extra)} stale rows."
+                )
+            self.stdout.write(self.style.SUCCESS("Task visibility index is consistent."))
+            return
+
+        count = rebuild_task_visibility(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt task visibility index with {count} rows."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task.counters import recompute_counters, counter_drift
+from task.blocking import rebuild_blocked_state
+
+
+class Command(BaseCommand):
+    help = "Recompute the cached counters and blocker state on Task from the child tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help="Only compare the counters with the child tables; exit non-zero on drift.",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['verify']:
+            drift = counter_drift()
+            if drift:
+                for task_id, fields in list(drift.items())[:20]:
+                    details = ', '.join(f"{field} {stored} != {actual}" for field, (stored, actual) in fields.items())
+                    self.stderr.write(f"{task_id}: {details}")
+                raise CommandError(f"Task counters are out of date on {len(drift)} tasks.")
+            self.stdout.write(self.style.SUCCESS("Task counters are consistent."))
+            return
+
+        recompute_counters(batch_size=options['batch_size'])
+        rebuild_blocked_state(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS("Recomputed task counters and blocker state."))
@@ -0,0 +1,28 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from task.reports import summarize_day
+
+
+class Command(BaseCommand):
+    help = "Pre-aggregate finished TimeLogs into the daily summary table (run nightly; defaults to yesterday)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Day to summarize (YYYY-MM-DD). Defaults to yesterday.")
+        parser.add_argument('--days', type=int, default=1, help="Number of days ending at --date to (re)build.")
+
+    def handle(self, *args, **options):
+        try:
+            last = date.fromisoformat(options['date']) if options['date'] else timezone.localdate() - timedelta(days=1)
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        if last >= timezone.localdate():
+            raise CommandError("Only past days are summarized; today is always computed live.")
+
+        for offset in range(max(1, options['days'])):
+            day = last - timedelta(days=offset)
+            rows = summarize_day(day)
+            self.stdout.write(f"{day}: {rows} summary rows")
+        self.stdout.write(self.style.SUCCESS("Time log summaries are up to date."))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_visibility(apps, schema_editor):
+    Task = apps.get_model('task', 'Task')
+    TaskVisibility = apps.get_model('task', 'TaskVisibility')
+
+    rows = set()
+    for task_id, creator_id in Task.objects.filter(creator__isnull=False).values_list('id', 'creator_id'):
+        rows.add((creator_id, task_id, 'creator'))
+    for task_id, user_id in Task.assignees.through.objects.values_list('task_id', 'user_id'):
+        rows.add((user_id, task_id, 'assignee'))
+    for task_id, user_id in Task.objects.filter(project__members__isnull=False).values_list('id', 'project__members'):
+        rows.add((user_id, task_id, 'project_member'))
+
+    TaskVisibility.objects.bulk_create(
+        [TaskVisibility(user_id=u, task_id=t, reason=r) for u, t, r in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0010_remove_task_time_taken_remove_task_timer_start_time_and_more'),
+        ('project', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskVisibility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.CharField(choices=[('creator', 'Creator'), ('assignee', 'Assignee'), ('project_member', 'Project Member')], max_length=20)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visibility', to='task.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_visibility', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'api_taskvisibility',
+                'constraints': [models.UniqueConstraint(fields=('user', 'task', 'reason'), name='uniq_task_visibility')],
+            },
+        ),
+        migrations.RunPython(backfill_visibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:50
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_blocked_state(apps, schema_editor):
+    Task = apps.get_model('task', 'Task')
+    counts = (
+        Task.dependencies.through.objects
+        .exclude(to_task__status='Done')
+        .order_by()
+        .values('from_task_id')
+        .annotate(open=Count('to_task_id'))
+        .values_list('from_task_id', 'open')
+    )
+    for task_id, open_count in counts:
+        Task.objects.filter(id=task_id).update(open_blocker_count=open_count, is_blocked=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0001_initial'),
+        ('task', '0013_task_task_status_idx_task_task_due_date_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='is_blocked',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='open_blocker_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['is_blocked', 'status'], name='task_ready_idx'),
+        ),
+        migrations.RunPython(backfill_blocked_state, migrations.RunPython.noop),
+    ]
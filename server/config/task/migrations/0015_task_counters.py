@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:52
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Task = apps.get_model('task', 'Task')
+    TimeLog = apps.get_model('task', 'TimeLog')
+
+    def count(model, condition=Q()):
+        rows = model.objects.filter(condition, task=OuterRef('pk')).order_by().values('task').annotate(n=Count('pk'))
+        return Coalesce(Subquery(rows.values('n'), output_field=models.IntegerField()), 0)
+
+    Task.objects.update(
+        asset_count=count(apps.get_model('asset', 'Asset')),
+        subtask_total=count(apps.get_model('task', 'Subtask')),
+        subtask_done=count(apps.get_model('task', 'Subtask'), Q(is_completed=True)),
+        comment_count=count(apps.get_model('task', 'TaskComment')),
+    )
+    logged = (
+        TimeLog.objects.filter(duration__isnull=False)
+        .order_by().values('task_id').annotate(total=Sum('duration'))
+        .values_list('task_id', 'total')
+    )
+    Task.objects.bulk_update(
+        [Task(pk=task_id, total_seconds_logged=total.total_seconds()) for task_id, total in logged],
+        ['total_seconds_logged'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0003_alter_asset_file'),
+        ('task', '0014_task_blocked_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='asset_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='subtask_done',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='subtask_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='total_seconds_logged',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:58
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0001_initial'),
+        ('task', '0015_task_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeLogDailySummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('total_seconds', models.FloatField(default=0)),
+                ('log_count', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='time_summaries', to='project.project')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_summaries', to='task.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'api_timelogdailysummary',
+                'indexes': [models.Index(fields=['user', 'day'], name='timesummary_user_day_idx'), models.Index(fields=['project', 'day'], name='timesummary_project_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'user', 'task'), name='uniq_timelog_daily_summary')],
+            },
+        ),
+    ]
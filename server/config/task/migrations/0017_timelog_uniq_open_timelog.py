@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:01
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def close_duplicate_timers(apps, schema_editor):
+    """Keep the oldest open timer per (task, user); close the others with a zero duration."""
+    TimeLog = apps.get_model('task', 'TimeLog')
+    seen = set()
+    duplicates = []
+    open_logs = TimeLog.objects.filter(end_time__isnull=True).order_by('start_time')
+    for log_id, task_id, user_id, start_time in open_logs.values_list('id', 'task_id', 'user_id', 'start_time'):
+        if (task_id, user_id) in seen:
+            duplicates.append((log_id, start_time))
+        seen.add((task_id, user_id))
+    for log_id, start_time in duplicates:
+        TimeLog.objects.filter(id=log_id).update(end_time=start_time, duration=timedelta(0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0016_timelogdailysummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_timers, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='timelog',
+            name='timelog_open_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='timelog',
+            constraint=models.UniqueConstraint(condition=models.Q(('end_time__isnull', True)), fields=('task', 'user'), name='uniq_open_timelog'),
+        ),
+    ]
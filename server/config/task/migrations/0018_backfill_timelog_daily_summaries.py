@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def backfill_daily_summaries(apps, schema_editor):
+    TimeLog = apps.get_model('task', 'TimeLog')
+    TimeLogDailySummary = apps.get_model('task', 'TimeLogDailySummary')
+
+    # Past days only; time_report aggregates today live from TimeLog
+    totals = (
+        TimeLog.objects.filter(duration__isnull=False, start_time__date__lt=timezone.localdate())
+        .annotate(day=TruncDate('start_time'))
+        .order_by()
+        .values('day', 'user_id', 'task_id', 'task__project_id')
+        .annotate(total=Sum('duration'), logs=Count('id'))
+    )
+    TimeLogDailySummary.objects.all().delete()
+    TimeLogDailySummary.objects.bulk_create(
+        [
+            TimeLogDailySummary(
+                day=row['day'],
+                user_id=row['user_id'],
+                task_id=row['task_id'],
+                project_id=row['task__project_id'],
+                total_seconds=row['total'].total_seconds(),
+                log_count=row['logs'],
+            )
+            for row in totals.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0017_timelog_uniq_open_timelog'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_summaries, migrations.RunPython.noop),
+    ]
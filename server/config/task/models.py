@@ -26,6 +26,15 @@ class Task(models.Model):
     due_date = models.DateField(null=True, blank=True)
     due_time = models.TimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Cached from `dependencies`; maintained by task.blocking
+    open_blocker_count = models.PositiveIntegerField(default=0, editable=False)
+    is_blocked = models.BooleanField(default=False, editable=False)
+    # Cached child totals; maintained by task.counters, repaired by `repair_task_counters`
+    asset_count = models.PositiveIntegerField(default=0, editable=False)
+    subtask_total = models.PositiveIntegerField(default=0, editable=False)
+    subtask_done = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    total_seconds_logged = models.FloatField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -34,6 +43,12 @@ class Task(models.Model):
 
     class Meta:
         db_table = 'api_task'
+        indexes = [
+            models.Index(fields=['status'], name='task_status_idx'),
+            models.Index(fields=['due_date'], name='task_due_date_idx'),
+            models.Index(fields=['project', 'status'], name='task_project_status_idx'),
+            models.Index(fields=['is_blocked', 'status'], name='task_ready_idx'),
+        ]
 
 class TimeLog(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -47,6 +62,19 @@ class TimeLog(models.Model):
     class Meta:
         db_table = 'api_timelog'
         ordering = ['-start_time']
+        indexes = [
+            models.Index(fields=['task', 'user', 'end_time'], name='timelog_task_user_end_idx'),
+        ]
+        constraints = [
+            # At most one running timer per user and task. Its partial unique
+            # index also serves the open-timer lookups, which never touch
+            # finished logs.
+            models.UniqueConstraint(
+                fields=['task', 'user'],
+                name='uniq_open_timelog',
+                condition=models.Q(end_time__isnull=True),
+            ),
+        ]
 
 class Subtask(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -104,3 +132,51 @@ class TaskActivity(models.Model):
     class Meta:
         db_table = 'api_taskactivity'
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['task', 'timestamp'], name='taskactivity_feed_idx'),
+        ]
+
+class TaskVisibility(models.Model):
+    """
+    Denormalized (user, task, reason) rows answering "which tasks can this
+    user see". Maintained by the signals in task/signals.py; rebuild with
+    `manage.py rebuild_task_visibility`.
+    """
+    class Reason(models.TextChoices):
+        CREATOR = 'creator'
+        ASSIGNEE = 'assignee'
+        PROJECT_MEMBER = 'project_member'
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_visibility')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='visibility')
+    reason = models.CharField(max_length=20, choices=Reason.choices)
+
+    class Meta:
+        db_table = 'api_taskvisibility'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'task', 'reason'], name='uniq_task_visibility'),
+        ]
+
+class TimeLogDailySummary(models.Model):
+    """
+    Finished TimeLog durations pre-aggregated per day, user and task (by the
+    day the log started). Written by `summarize_time_logs`; past days are
+    kept current by the TimeLog signals, today is always computed live.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    day = models.DateField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='time_summaries')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='time_summaries')
+    project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, blank=True, related_name='time_summaries')
+    total_seconds = models.FloatField(default=0)
+    log_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'api_timelogdailysummary'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'user', 'task'], name='uniq_timelog_daily_summary'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'day'], name='timesummary_user_day_idx'),
+            models.Index(fields=['project', 'day'], name='timesummary_project_day_idx'),
+        ]
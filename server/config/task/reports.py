@@ -0,0 +1,154 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Sum, Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Task, TimeLog, TimeLogDailySummary
+from user.models import User
+from project.models import Project
+
+
+DIMENSIONS = ('user', 'project', 'task', 'day', 'week')
+
+# Column holding each non-time dimension in the summary table and in TimeLog
+_SUMMARY_FIELDS = {'user': 'user_id', 'project': 'project_id', 'task': 'task_id'}
+_LOG_FIELDS = {'user': 'user_id', 'project': 'task__project_id', 'task': 'task_id'}
+
+
+def _seconds(duration):
+    return duration.total_seconds() if duration else 0.0
+
+
+def summarize_day(day, user_id=None, task_id=None):
+    """
+    Rebuild the summary rows for `day` from TimeLog. Pass `user_id` and
+    `task_id` to refresh a single (user, task) cell after one log changed.
+    Returns the number of rows written.
+    """
+    logs = TimeLog.objects.filter(start_time__date=day, duration__isnull=False)
+    summaries = TimeLogDailySummary.objects.filter(day=day)
+    if user_id is not None and task_id is not None:
+        logs = logs.filter(user_id=user_id, task_id=task_id)
+        summaries = summaries.filter(user_id=user_id, task_id=task_id)
+
+    totals = (
+        logs.order_by()
+        .values('user_id', 'task_id', 'task__project_id')
+        .annotate(total=Sum('duration'), logs=Count('id'))
+    )
+    rows = [
+        TimeLogDailySummary(
+            day=day,
+            user_id=row['user_id'],
+            task_id=row['task_id'],
+            project_id=row['task__project_id'],
+            total_seconds=_seconds(row['total']),
+            log_count=row['logs'],
+        )
+        for row in totals
+    ]
+    with transaction.atomic():
+        summaries.delete()
+        TimeLogDailySummary.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def _rollup(rows, group_by):
+    """Fold (dims..., day, seconds) rows into the requested grouping; weeks start on Monday."""
+    totals = defaultdict(float)
+    for row in rows:
+        key = []
+        for dim in group_by:
+            if dim == 'day':
+                key.append(row['day'])
+            elif dim == 'week':
+                key.append(row['day'] - timedelta(days=row['day'].weekday()))
+            else:
+                key.append(row[dim])
+        totals[tuple(key)] += row['seconds']
+    return totals
+
+
+def _labels(group_by, totals):
+    """Display names for user/project/task ids, one query per dimension."""
+    labels = {}
+    lookups = {
+        'user': lambda ids: User.objects.filter(id__in=ids).values_list('id', 'email'),
+        'project': lambda ids: Project.objects.filter(id__in=ids).values_list('id', 'name'),
+        'task': lambda ids: Task.objects.filter(id__in=ids).values_list('id', 'title'),
+    }
+    for position, dim in enumerate(group_by):
+        if dim in lookups:
+            ids = {key[position] for key in totals if key[position] is not None}
+            labels[dim] = dict(lookups[dim](ids))
+    return labels
+
+
+def time_report(visible_tasks, start, end, group_by, user_id=None, project_id=None):
+    """
+    Logged time between `start` and `end` (inclusive) grouped by `group_by`.
+
+    Days before today come from TimeLogDailySummary; today is aggregated
+    live from TimeLog with Sum/TruncDate. `visible_tasks` is a task id
+    subquery limiting what the caller may see.
+    """
+    today = timezone.localdate()
+    needs_day = bool({'day', 'week'} & set(group_by))
+    rows = []
+
+    if start < today:
+        summaries = TimeLogDailySummary.objects.filter(
+            task_id__in=visible_tasks, day__gte=start, day__lte=min(end, today - timedelta(days=1))
+        )
+        if user_id:
+            summaries = summaries.filter(user_id=user_id)
+        if project_id:
+            summaries = summaries.filter(project_id=project_id)
+        fields = [_SUMMARY_FIELDS[d] for d in group_by if d in _SUMMARY_FIELDS] + (['day'] if needs_day else [])
+        for row in summaries.order_by().values(*fields).annotate(seconds=Sum('total_seconds')):
+            rows.append({
+                **{d: row[_SUMMARY_FIELDS[d]] for d in group_by if d in _SUMMARY_FIELDS},
+                'day': row.get('day'),
+                'seconds': row['seconds'] or 0.0,
+            })
+
+    if start <= today <= end:
+        logs = TimeLog.objects.filter(
+            task_id__in=visible_tasks, start_time__date=today, duration__isnull=False
+        )
+        if user_id:
+            logs = logs.filter(user_id=user_id)
+        if project_id:
+            logs = logs.filter(task__project_id=project_id)
+        fields = [_LOG_FIELDS[d] for d in group_by if d in _LOG_FIELDS]
+        live = logs.order_by().annotate(day=TruncDate('start_time')).values(*fields, 'day').annotate(total=Sum('duration'))
+        for row in live:
+            rows.append({
+                **{d: row[_LOG_FIELDS[d]] for d in group_by if d in _LOG_FIELDS},
+                'day': row['day'],
+                'seconds': _seconds(row['total']),
+            })
+
+    totals = _rollup(rows, group_by)
+    labels = _labels(group_by, totals)
+
+    results = []
+    for key in sorted(totals, key=lambda k: tuple(str(v) for v in k)):
+        entry = {}
+        for dim, value in zip(group_by, key):
+            entry[dim] = value
+            if dim in labels:
+                entry[f'{dim}_label'] = labels[dim].get(value)
+        entry['total_seconds'] = round(totals[key], 3)
+        results.append(entry)
+
+    return {
+        "start": start,
+        "end": end,
+        "group_by": list(group_by),
+        "total_seconds": round(sum(totals.values()), 3),
+        "results": results,
+    }
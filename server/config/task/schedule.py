@@ -0,0 +1,147 @@
+import math
+from datetime import timedelta
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Task, TimeLog
+from .graph import load_graph, DependencyCycleError
+
+
+HOURS_PER_DAY = 8
+DEFAULT_TASK_HOURS = 8
+
+
+def critical_path(durations, blockers):
+    """
+    Critical-path method over index arrays, linear in tasks + edges.
+
+    `durations[i]` is the remaining work of task i; `blockers[i]` lists the
+    indices task i depends on. Returns (earliest_start, earliest_finish,
+    slack, path, length) where `path` is one critical chain in order.
+    """
+    n = len(durations)
+    dependents = [[] for _ in range(n)]
+    indegree = [0] * n
+    for i, deps in enumerate(blockers):
+        indegree[i] = len(deps)
+        for d in deps:
+            dependents[d].append(i)
+
+    order = [i for i in range(n) if indegree[i] == 0]
+    for i in order:  # the list grows while we iterate: Kahn's algorithm
+        for j in dependents[i]:
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                order.append(j)
+    if len(order) != n:
+        stuck = next(i for i in range(n) if indegree[i] > 0)
+        raise DependencyCycleError([stuck])
+
+    earliest_start = [0.0] * n
+    earliest_finish = [0.0] * n
+    for i in order:
+        start = max((earliest_finish[d] for d in blockers[i]), default=0.0)
+        earliest_start[i] = start
+        earliest_finish[i] = start + durations[i]
+
+    length = max(earliest_finish, default=0.0)
+    latest_finish = [length] * n
+    for i in reversed(order):
+        if dependents[i]:
+            latest_finish[i] = min(latest_finish[j] - durations[j] for j in dependents[i])
+    slack = [latest_finish[i] - earliest_finish[i] for i in range(n)]
+
+    path = []
+    if n:
+        node = max(range(n), key=lambda i: (earliest_finish[i], -slack[i]))
+        while node is not None:
+            path.append(node)
+            node = next(
+                (d for d in blockers[node]
+                 if math.isclose(earliest_finish[d], earliest_start[node]) and math.isclose(slack[d], 0, abs_tol=1e-9)),
+                None
+            )
+        path.reverse()
+
+    return earliest_start, earliest_finish, slack, path, length
+
+
+def project_schedule(project):
+    """
+    Critical path, per-task slack and projected completion for a project.
+
+    Remaining work comes from TimeLog history: open tasks are expected to take
+    as long as the project's completed tasks did on average, minus what has
+    already been logged against them. Hours are turned into calendar days at
+    HOURS_PER_DAY.
+    """
+    tasks = list(
+        Task.objects.filter(project=project)
+        .order_by('created_at', 'id')
+        .values_list('id', 'title', 'status', 'due_date')
+    )
+    index = {row[0]: i for i, row in enumerate(tasks)}
+
+    logged = {
+        task_id: total.total_seconds() / 3600
+        for task_id, total in (
+            TimeLog.objects.filter(task__project=project, duration__isnull=False)
+            .order_by()
+            .values('task')
+            .annotate(total=Sum('duration'))
+            .values_list('task', 'total')
+        )
+    }
+    done_hours = [logged[t[0]] for t in tasks if t[2] == Task.Status.DONE and t[0] in logged]
+    typical_hours = sum(done_hours) / len(done_hours) if done_hours else DEFAULT_TASK_HOURS
+
+    durations = [
+        0.0 if status == Task.Status.DONE else max(typical_hours - logged.get(task_id, 0.0), 0.0)
+        for task_id, _, status, _ in tasks
+    ]
+
+    graph = load_graph(project.id)
+    blockers = [
+        [index[d] for d in graph.blockers.get(task_id, ()) if d in index]
+        for task_id, *_ in tasks
+    ]
+
+    try:
+        earliest_start, earliest_finish, slack, path, length = critical_path(durations, blockers)
+    except DependencyCycleError:
+        # Legacy data can predate cycle validation; let the graph name the cycle
+        graph.topological_order()
+        raise
+
+    today = timezone.localdate()
+
+    def to_date(hours):
+        return today + timedelta(days=math.ceil(hours / HOURS_PER_DAY))
+
+    critical = set(path)
+    return {
+        "project_id": project.id,
+        "typical_task_hours": round(typical_hours, 2),
+        "remaining_hours": round(length, 2),
+        "projected_completion": to_date(length),
+        "critical_path": [
+            {"id": tasks[i][0], "title": tasks[i][1], "status": tasks[i][2]} for i in path
+        ],
+        "tasks": [
+            {
+                "id": task_id,
+                "title": title,
+                "status": status,
+                "due_date": due_date,
+                "remaining_hours": round(durations[i], 2),
+                "earliest_start_hours": round(earliest_start[i], 2),
+                "earliest_finish_hours": round(earliest_finish[i], 2),
+                "slack_hours": round(slack[i], 2),
+                "projected_finish": to_date(earliest_finish[i]),
+                "is_critical": i in critical,
+                "is_late": bool(due_date and due_date < to_date(earliest_finish[i])),
+            }
+            for i, (task_id, title, status, due_date) in enumerate(tasks)
+        ],
+    }
@@ -1,11 +1,16 @@
+from datetime import timedelta
+
 from rest_framework import serializers
 from django.shortcuts import get_object_or_404
 from django.db.models import Count
+from django.utils import timezone
 
 from .models import Task, Subtask, ImportantTask, TaskComment, TaskActivity, TimeLog
+from .graph import find_dependency_cycle
 from project.models import Project
-from project.serializers import ProjectSerializer
-from user.serializers import UserSerializer
+from project.serializers import ProjectSerializer, ProjectSummarySerializer
+from user.serializers import UserSerializer, UserSummarySerializer
+from common.serializers import SparseFieldsetMixin
 from user.models import User
 
 
@@ -82,7 +87,41 @@ class DependencyTaskSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'status', 'priority']
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskStatsMixin:
+    """Counter and timer fields shared by the full and compact task serializers."""
+
+    def get_total_assets(self, obj):
+        return obj.asset_count
+        
+    def get_total_time_taken(self, obj):
+        return obj.total_seconds_logged or 0
+
+    def _open_time_logs(self, obj):
+        # Prefetched as `open_time_logs` by the list querysets; fall back to a query otherwise
+        open_logs = getattr(obj, 'open_time_logs', None)
+        if open_logs is None:
+            open_logs = list(obj.time_logs.filter(end_time__isnull=True).select_related('user'))
+        return open_logs
+
+    def get_active_timer_start(self, obj):
+        request = self.context.get('request')
+        if not request or not request.user.is_authenticated:
+            return None
+        active_log = next((log for log in self._open_time_logs(obj) if log.user_id == request.user.id), None)
+        return active_log.start_time if active_log else None
+
+    def get_active_timers(self, obj):
+        request = self.context.get('request')
+        if not request:
+            return []
+        
+        # Get users with active time logs for this task
+        users = [log.user for log in self._open_time_logs(obj)]
+        
+        return UserSerializer(users, many=True, context=self.context).data
+
+
+class TaskSerializer(TaskStatsMixin, serializers.ModelSerializer):
     creator = UserSerializer(read_only=True)
     project = ProjectSerializer(read_only=True)
 
@@ -133,7 +172,9 @@ class TaskSerializer(serializers.ModelSerializer):
             'subtasks', 'subtasks_data', 'total_assets',
             'dependencies', 'dependencies_ids', 'blocking',
             'due_date', 'due_time', 'completed_at', 'created_at', 'updated_at',
-            'total_time_taken', 'active_timer_start', 'active_timers'
+            'total_time_taken', 'active_timer_start', 'active_timers',
+            'is_blocked', 'open_blocker_count',
+            'subtask_total', 'subtask_done', 'comment_count'
         ]
 
     def create(self, validated_data):
@@ -170,9 +211,22 @@ class TaskSerializer(serializers.ModelSerializer):
 
             Subtask.objects.create(task=task, assignee=assignee, **subtask_data)
 
+        if subtasks_data:
+            # The Subtask signals bumped the counter columns in the database
+            task.refresh_from_db(fields=['subtask_total', 'subtask_done'])
         return task
 
     def validate(self, attrs):
+        dependencies = attrs.get('dependencies')
+        if dependencies is not None and self.instance is not None:
+            cycle = find_dependency_cycle(self.instance, dependencies)
+            if cycle:
+                titles = dict(Task.objects.filter(id__in=cycle).values_list('id', 'title'))
+                chain = ' -> '.join(f'"{titles.get(task_id, task_id)}"' for task_id in cycle)
+                raise serializers.ValidationError({
+                    'dependencies_ids': f'These dependencies would create a cycle: {chain}.'
+                })
+
         new_status = attrs.get('status')
         blocked_statuses = {'In Progress', 'Done', 'Completed'}
 
@@ -195,33 +249,39 @@ class TaskSerializer(serializers.ModelSerializer):
 
         return attrs
 
-    def get_total_assets(self, obj):
-        annotated = getattr(obj, 'total_assets_annotated', None)
-        if annotated is not None:
-            return annotated
-        return obj.assets.count()
-        
-    def get_total_time_taken(self, obj):
-        total_seconds = sum((log.duration.total_seconds() for log in obj.time_logs.all() if log.duration), 0)
-        return total_seconds
-        
-    def get_active_timer_start(self, obj):
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
-            return None
-        active_log = obj.time_logs.filter(user=request.user, end_time__isnull=True).first()
-        return active_log.start_time if active_log else None
 
-    def get_active_timers(self, obj):
-        request = self.context.get('request')
-        if not request:
-            return []
-        
-        # Get users with active time logs for this task
-        active_logs = obj.time_logs.filter(end_time__isnull=True).select_related('user')
-        users = [log.user for log in active_logs]
-        
-        return UserSerializer(users, many=True, context=self.context).data
+class TaskListSerializer(SparseFieldsetMixin, TaskStatsMixin, serializers.ModelSerializer):
+    """
+    Compact read-only task rows for list endpoints: summaries instead of
+    nested projects and users, counters instead of child lists. The heavy
+    parts of TaskSerializer can be requested per call with `?expand=`.
+    """
+    creator = UserSummarySerializer(read_only=True)
+    project = ProjectSummarySerializer(read_only=True)
+    assignees = UserSummarySerializer(many=True, read_only=True)
+    total_assets = serializers.SerializerMethodField()
+    total_time_taken = serializers.SerializerMethodField()
+    active_timer_start = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'title', 'status', 'priority', 'creator', 'project', 'assignees',
+            'due_date', 'due_time', 'completed_at', 'created_at', 'updated_at',
+            'is_blocked', 'open_blocker_count', 'subtask_total', 'subtask_done',
+            'comment_count', 'total_assets', 'total_time_taken', 'active_timer_start',
+        ]
+        expandable_fields = {
+            'description': lambda: serializers.CharField(read_only=True),
+            'creator': lambda: UserSerializer(read_only=True),
+            'project': lambda: ProjectSerializer(read_only=True),
+            'assignees': lambda: UserSerializer(many=True, read_only=True),
+            'subtasks': lambda: SubtaskSerializer(many=True, read_only=True),
+            'dependencies': lambda: DependencyTaskSerializer(many=True, read_only=True),
+            'blocking': lambda: DependencyTaskSerializer(many=True, read_only=True),
+            'active_timers': lambda: serializers.SerializerMethodField(),
+        }
+
 
 class TimeLogSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
@@ -252,6 +312,16 @@ class ImportantTaskSerializer(serializers.ModelSerializer):
         )
         return important_task
 
+class ImportantTaskListSerializer(serializers.ModelSerializer):
+    """ImportantTaskSerializer with the task as a compact, sparse TaskListSerializer row."""
+    user = UserSummarySerializer(read_only=True)
+    task = TaskListSerializer(read_only=True)
+
+    class Meta:
+        model = ImportantTask
+        fields = ['id', 'user', 'task', 'marked_at']
+
+
 class TaskCommentSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
@@ -274,18 +344,30 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         ]
 
     def get_likes_count(self, obj):
+        annotated = getattr(obj, 'likes_count_annotated', None)
+        if annotated is not None:
+            return annotated
         return obj.likes.count()
 
     def get_dislikes_count(self, obj):
+        annotated = getattr(obj, 'dislikes_count_annotated', None)
+        if annotated is not None:
+            return annotated
         return obj.dislikes.count()
 
     def get_user_has_liked(self, obj):
+        annotated = getattr(obj, 'user_has_liked_annotated', None)
+        if annotated is not None:
+            return annotated
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.likes.filter(id=request.user.id).exists()
         return False
 
     def get_user_has_disliked(self, obj):
+        annotated = getattr(obj, 'user_has_disliked_annotated', None)
+        if annotated is not None:
+            return annotated
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.dislikes.filter(id=request.user.id).exists()
@@ -307,6 +389,10 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         return attrs
 
     def get_replies(self, obj):
+        # Thread views pass the pre-loaded tree in context to avoid a query per comment
+        replies_by_parent = self.context.get('replies_by_parent')
+        if replies_by_parent is not None:
+            return TaskCommentSerializer(replies_by_parent.get(obj.id, []), many=True, context=self.context).data
         if obj.replies.exists():
             return TaskCommentSerializer(obj.replies.all(), many=True, context=self.context).data
         return []
@@ -318,3 +404,59 @@ class TaskActivitySerializer(serializers.ModelSerializer):
         model = TaskActivity
         fields = ['id', 'task', 'user', 'type', 'action', 'details', 'timestamp']
         read_only_fields = ['id', 'task', 'user', 'timestamp']
+
+
+class BulkTaskOperationSerializer(serializers.Serializer):
+    """Input for /api/tasks/bulk/: a set of task ids and one operation to apply to all of them."""
+    MAX_TASKS = 1000
+    OPERATIONS = ['status', 'priority', 'assignees', 'project', 'delete']
+
+    task_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=MAX_TASKS)
+    operation = serializers.ChoiceField(choices=OPERATIONS)
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    priority = serializers.ChoiceField(choices=Task.Priority.choices, required=False)
+    add_assignee_ids = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+    remove_assignee_ids = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+    project_id = serializers.UUIDField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        operation = attrs['operation']
+        if operation in ('status', 'priority') and operation not in attrs:
+            raise serializers.ValidationError({operation: f"This field is required for the '{operation}' operation."})
+        if operation == 'project' and 'project_id' not in attrs:
+            raise serializers.ValidationError({"project_id": "This field is required for the 'project' operation."})
+        if operation == 'assignees' and not (attrs['add_assignee_ids'] or attrs['remove_assignee_ids']):
+            raise serializers.ValidationError({
+                "add_assignee_ids": "Provide add_assignee_ids and/or remove_assignee_ids."
+            })
+        attrs['task_ids'] = list(dict.fromkeys(attrs['task_ids']))
+        return attrs
+
+
+class TimeReportQuerySerializer(serializers.Serializer):
+    """Query parameters of /api/time-reports/."""
+    MAX_DAYS = 366
+    DIMENSIONS = ['user', 'project', 'task', 'day', 'week']
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    group_by = serializers.CharField(required=False, default='user')
+    user_id = serializers.UUIDField(required=False)
+    project_id = serializers.UUIDField(required=False)
+
+    def validate_group_by(self, value):
+        dims = list(dict.fromkeys(d.strip() for d in value.split(',') if d.strip()))
+        unknown = [d for d in dims if d not in self.DIMENSIONS]
+        if unknown or not dims:
+            raise serializers.ValidationError(f"Choose from: {', '.join(self.DIMENSIONS)}.")
+        return dims
+
+    def validate(self, attrs):
+        today = timezone.localdate()
+        attrs.setdefault('end', today)
+        attrs.setdefault('start', attrs['end'] - timedelta(days=6))
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({"start": "start must not be after end."})
+        if (attrs['end'] - attrs['start']).days >= self.MAX_DAYS:
+            raise serializers.ValidationError({"start": f"The range may span at most {self.MAX_DAYS} days."})
+        return attrs
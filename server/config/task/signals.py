@@ -0,0 +1,343 @@
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete, m2m_changed
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Task, Subtask, TimeLog, TaskComment, TaskVisibility, TimeLogDailySummary
+from .visibility import visible_task_ids, sync_task_visibility, grant_project_visibility, revoke_project_visibility
+from .cache import invalidate_task_lists, invalidate_project_task_lists
+from .graph import invalidate_graphs
+from .blocking import dependents_of, refresh_blocked_state
+from . import counters
+from .reports import summarize_day
+from common.versions import bump_versions
+from common.fastpath import USER_COLUMNS
+from user.models import User
+from project.models import Project, ProjectMember
+from asset.models import Asset
+
+
+Reason = TaskVisibility.Reason
+
+
+@receiver(post_save, sender=Task)
+def task_saved_update_visibility(sender, instance, created, update_fields=None, **kwargs):
+    # Only creator and project feed the index from the Task row itself
+    if update_fields is not None and not {'creator', 'project'} & set(update_fields):
+        return
+    sync_task_visibility([instance.pk], reasons=[Reason.CREATOR, Reason.PROJECT_MEMBER])
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def task_assignees_changed_update_visibility(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_clear':
+        lookup = {'user': instance} if reverse else {'task': instance}
+        TaskVisibility.objects.filter(reason=Reason.ASSIGNEE, **lookup).delete()
+        return
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+
+    if reverse:
+        pairs = [(instance.pk, task_id) for task_id in pk_set]
+    else:
+        pairs = [(user_id, instance.pk) for user_id in pk_set]
+
+    if action == 'post_add':
+        TaskVisibility.objects.bulk_create(
+            [TaskVisibility(user_id=u, task_id=t, reason=Reason.ASSIGNEE) for u, t in pairs],
+            ignore_conflicts=True,
+        )
+    else:
+        lookup = {'user': instance, 'task_id__in': pk_set} if reverse else {'task': instance, 'user_id__in': pk_set}
+        TaskVisibility.objects.filter(reason=Reason.ASSIGNEE, **lookup).delete()
+
+
+@receiver(post_save, sender=ProjectMember)
+def project_member_saved_update_visibility(sender, instance, created, **kwargs):
+    if created:
+        grant_project_visibility(instance.project_id, [instance.user_id])
+
+
+@receiver(post_delete, sender=ProjectMember)
+def project_member_deleted_update_visibility(sender, instance, **kwargs):
+    revoke_project_visibility(instance.project_id, [instance.user_id])
+
+
+@receiver(m2m_changed, sender=ProjectMember)
+def project_members_changed_update_visibility(sender, instance, action, reverse, pk_set, **kwargs):
+    """Covers `project.members.add()/remove()/clear()`, which bypass ProjectMember save/delete."""
+    if action == 'post_clear':
+        if reverse:
+            TaskVisibility.objects.filter(user=instance, reason=Reason.PROJECT_MEMBER).delete()
+        else:
+            revoke_project_visibility(instance.pk)
+        return
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+
+    pairs = [(project_id, instance.pk) for project_id in pk_set] if reverse else [(instance.pk, user_id) for user_id in pk_set]
+    for project_id, user_id in pairs:
+        if action == 'post_add':
+            grant_project_visibility(project_id, [user_id])
+        else:
+            revoke_project_visibility(project_id, [user_id])
+
+
+# --- Task list cache invalidation ---
+
+def _with_linked_tasks(task_id):
+    # Dependencies and blockers embed this task's title/status in their own payloads
+    links = Task.dependencies.through.objects.filter(Q(from_task_id=task_id) | Q(to_task_id=task_id))
+    linked = set()
+    for from_id, to_id in links.values_list('from_task_id', 'to_task_id'):
+        linked.update((from_id, to_id))
+    linked.add(task_id)
+    return linked
+
+
+@receiver(post_save, sender=Task)
+def task_saved_invalidate_lists(sender, instance, created, **kwargs):
+    invalidate_task_lists([instance.pk] if created else _with_linked_tasks(instance.pk))
+
+
+@receiver(pre_delete, sender=Task)
+def task_deleted_invalidate_lists(sender, instance, **kwargs):
+    # Collected before the delete cascades through the visibility rows
+    invalidate_task_lists(_with_linked_tasks(instance.pk))
+
+
+@receiver(post_save, sender=Subtask)
+@receiver(post_delete, sender=Subtask)
+@receiver(post_save, sender=TimeLog)
+@receiver(post_delete, sender=TimeLog)
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+def task_child_changed_invalidate_lists(sender, instance, **kwargs):
+    invalidate_task_lists([instance.task_id])
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def task_assignees_changed_invalidate_lists(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # post_clear carries no pk_set; capture everyone who is about to lose the task
+        users = [instance.pk] if reverse else instance.assignees.values_list('id', flat=True)
+        tasks = instance.assigned_tasks.values_list('id', flat=True) if reverse else [instance.pk]
+        invalidate_task_lists(list(tasks), list(users))
+    if action not in ('post_add', 'post_remove'):
+        return
+    if reverse:
+        invalidate_task_lists(list(pk_set or ()), [instance.pk])
+    else:
+        invalidate_task_lists([instance.pk], pk_set or ())
+
+
+@receiver(m2m_changed, sender=Task.dependencies.through)
+def task_dependencies_changed_invalidate_lists(sender, instance, action, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove', 'pre_clear'):
+        related = pk_set or set()
+        if action == 'pre_clear':
+            related = set(instance.dependencies.values_list('id', flat=True)) | set(instance.blocking.values_list('id', flat=True))
+        invalidate_task_lists([instance.pk, *related])
+
+
+@receiver(post_save, sender=Project)
+def project_saved_invalidate_lists(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_project_task_lists(instance.pk)
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def project_member_changed_invalidate_lists(sender, instance, **kwargs):
+    # Member lists are nested in every task of the project
+    invalidate_project_task_lists(instance.project_id, [instance.user_id])
+    bump_versions('project', [instance.project_id])
+
+
+@receiver(m2m_changed, sender=ProjectMember)
+def project_members_changed_invalidate_lists(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+    if reverse:
+        for project_id in pk_set:
+            invalidate_project_task_lists(project_id, [instance.pk])
+        bump_versions('project', pk_set)
+    else:
+        invalidate_project_task_lists(instance.pk, pk_set)
+        bump_versions('project', [instance.pk])
+
+
+# Columns UserSerializer renders; saves that leave them alone (login
+# bookkeeping, passwords, OTPs) change no payload.
+PROFILE_FIELDS = [column for column in USER_COLUMNS if column != 'id']
+
+
+def _profile_values(user):
+    fields = [User._meta.get_field(name) for name in PROFILE_FIELDS]
+    return tuple(field.get_prep_value(field.value_from_object(user)) for field in fields)
+
+
+@receiver(pre_save, sender=User)
+def user_saving_diff_profile(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding or (update_fields is not None and not set(PROFILE_FIELDS) & set(update_fields)):
+        instance._profile_changed = False
+        return
+    stored = User.objects.filter(pk=instance.pk).values_list(*PROFILE_FIELDS).first()
+    instance._profile_changed = stored != _profile_values(instance)
+
+
+@receiver(post_save, sender=User)
+def user_saved_invalidate_lists(sender, instance, created, **kwargs):
+    if not getattr(instance, '_profile_changed', False):
+        return
+    # Everyone sharing a task with the user has them embedded in their lists
+    # and task details: one bump per viewer, however many tasks they share.
+    viewers = set(
+        TaskVisibility.objects.filter(task_id__in=visible_task_ids(instance))
+        .values_list('user_id', flat=True).distinct()
+    )
+    viewers.add(instance.pk)
+    bump_versions('task_list', viewers)
+    bump_versions('task_people', viewers)
+    bump_versions('project', ProjectMember.objects.filter(user=instance).values_list('project_id', flat=True))
+    # Comment and activity ETags carry the versions of the users they embed
+    bump_versions('profile', [instance.pk])
+
+
+# --- Comment thread versions (ETags for /api/tasks/<id>/comments/) ---
+
+@receiver(post_save, sender=TaskComment)
+@receiver(post_delete, sender=TaskComment)
+def comment_changed_bump_version(sender, instance, created=False, **kwargs):
+    bump_versions('comments', [instance.task_id])
+    if created or kwargs.get('signal') is post_delete:
+        # comment_count is part of the task payload
+        invalidate_task_lists([instance.task_id])
+
+
+@receiver(m2m_changed, sender=TaskComment.likes.through)
+@receiver(m2m_changed, sender=TaskComment.dislikes.through)
+def comment_reactions_changed_bump_version(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        task_ids = TaskComment.objects.filter(id__in=pk_set or ()).values_list('task_id', flat=True)
+    else:
+        task_ids = [instance.task_id]
+    bump_versions('comments', task_ids)
+
+
+# --- Time report summaries ---
+
+@receiver(post_save, sender=TimeLog)
+@receiver(post_delete, sender=TimeLog)
+def time_log_changed_refresh_summary(sender, instance, raw=False, **kwargs):
+    # Today is aggregated live; only past days live in the summary table
+    if raw or instance.start_time is None:
+        return
+    day = timezone.localdate(instance.start_time)
+    if day < timezone.localdate():
+        summarize_day(day, instance.user_id, instance.task_id)
+
+
+@receiver(post_save, sender=Task)
+def task_moved_update_summaries(sender, instance, created, **kwargs):
+    # Runs before the graph handler below resets _original_project_id
+    if not created and getattr(instance, '_original_project_id', instance.project_id) != instance.project_id:
+        TimeLogDailySummary.objects.filter(task=instance).update(project_id=instance.project_id)
+
+
+# --- Dependency graph invalidation ---
+
+@receiver(m2m_changed, sender=Task.dependencies.through)
+def task_dependencies_changed_invalidate_graph(sender, instance, action, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    related = set(pk_set or ())
+    if action == 'pre_clear':
+        related = set(instance.dependencies.values_list('id', flat=True)) | set(instance.blocking.values_list('id', flat=True))
+    project_ids = set(Task.objects.filter(id__in=related).values_list('project_id', flat=True))
+    invalidate_graphs(project_ids | {instance.project_id})
+
+
+@receiver(pre_save, sender=Task)
+def task_saving_read_project(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Read the stored project only when this save may move the task
+    if raw or instance._state.adding or (update_fields is not None and not {'project', 'project_id'} & set(update_fields)):
+        instance._original_project_id = instance.project_id
+        return
+    stored = Task.objects.filter(pk=instance.pk).values_list('project_id', flat=True)
+    instance._original_project_id = next(iter(stored), instance.project_id)
+
+
+@receiver(post_save, sender=Task)
+@receiver(pre_delete, sender=Task)
+def task_changed_invalidate_graph(sender, instance, created=False, **kwargs):
+    # Deleting a task drops its edges without an m2m signal, and moving it to
+    # another project changes which graph its edges belong to.
+    if created:
+        return
+    original_project_id = getattr(instance, '_original_project_id', instance.project_id)
+    if kwargs.get('signal') is post_save and original_project_id == instance.project_id:
+        return
+    linked = _with_linked_tasks(instance.pk) - {instance.pk}
+    if linked:
+        project_ids = set(Task.objects.filter(id__in=linked).values_list('project_id', flat=True))
+        invalidate_graphs(project_ids | {instance.project_id, original_project_id})
+    instance._original_project_id = instance.project_id
+
+
+# --- Cached blocker state ---
+
+@receiver(m2m_changed, sender=Task.dependencies.through)
+def task_dependencies_changed_refresh_blocked(sender, instance, action, reverse, pk_set, **kwargs):
+    # Forward: `instance` gained/lost dependencies. Reverse (`task.blocking`):
+    # the tasks in pk_set gained/lost `instance` as a dependency.
+    if action == 'pre_clear' and reverse:
+        instance._cleared_dependents = dependents_of([instance.pk])
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            refresh_blocked_state([instance.pk])
+        elif action == 'post_clear':
+            refresh_blocked_state(getattr(instance, '_cleared_dependents', ()))
+        else:
+            refresh_blocked_state(pk_set or ())
+
+
+@receiver(pre_delete, sender=Task)
+def task_deleting_remember_dependents(sender, instance, **kwargs):
+    instance._dependents = dependents_of([instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted_refresh_blocked(sender, instance, **kwargs):
+    refresh_blocked_state(getattr(instance, '_dependents', ()))
+
+
+# --- Denormalized counters on Task ---
+
+def _read_contribution(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Only saves of an existing row that touch a tracked field read it back
+    if raw or instance._state.adding:
+        instance._counted = None
+    else:
+        instance._counted = counters.stored_snapshot(instance, update_fields)
+
+
+def _update_counters(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.apply_change((None, {}), counters.snapshot(instance))
+    elif instance._counted is not None:
+        counters.apply_change(instance._counted, counters.snapshot(instance))
+
+
+def _release_counters(sender, instance, **kwargs):
+    counters.apply_change(counters.snapshot(instance), (None, {}))
+
+
+for _model in counters.CONTRIBUTIONS:
+    pre_save.connect(_read_contribution, sender=_model, dispatch_uid=f'counters_pre_save_{_model.__name__}')
+    post_save.connect(_update_counters, sender=_model, dispatch_uid=f'counters_save_{_model.__name__}')
+    post_delete.connect(_release_counters, sender=_model, dispatch_uid=f'counters_delete_{_model.__name__}')
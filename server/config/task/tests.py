@@ -1,3 +1,1087 @@
-from django.test import TestCase
+import base64
+import csv
+import json
+import sqlite3
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Q
+from django.db.models.signals import post_init
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.test import TransactionTestCase
+from asgiref.sync import sync_to_async
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user.models import User
+from project.models import Project, ProjectMember
+from notification.models import Notification, OutboxMessage
+from asset.models import Asset
+from .models import Task, Subtask, TimeLog, TaskComment, TaskActivity, TaskVisibility
+from .graph import load_graph
+from .counters import counter_drift
+from .visibility import visible_task_ids, sync_task_visibility
+from common.versions import get_version
+
+
+class TaskVisibilityTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.assignee = User.objects.create_user(email='assignee@example.com', password='password123')
+        self.member = User.objects.create_user(email='member@example.com', password='password123')
+        self.outsider = User.objects.create_user(email='outsider@example.com', password='password123')
+        self.project = Project.objects.create(name='Apollo', creator=self.owner)
+        self.task = Task.objects.create(title='Launch', creator=self.owner, project=self.project)
+
+    def _visible(self, user):
+        return set(Task.objects.filter(id__in=visible_task_ids(user)).values_list('id', flat=True))
+
+    def _reasons(self, user):
+        return set(TaskVisibility.objects.filter(user=user, task=self.task).values_list('reason', flat=True))
+
+    @staticmethod
+    def _or_join(user):
+        # The query the index replaced
+        return set(
+            Task.objects.filter(Q(creator=user) | Q(assignees=user) | Q(project__members=user))
+            .distinct().values_list('id', flat=True)
+        )
+
+    def test_each_reason_grants_visibility(self):
+        self.assertEqual(self._reasons(self.owner), {TaskVisibility.Reason.CREATOR})
+
+        self.task.assignees.add(self.assignee)
+        self.assertEqual(self._reasons(self.assignee), {TaskVisibility.Reason.ASSIGNEE})
+
+        ProjectMember.objects.create(project=self.project, user=self.member)
+        self.assertEqual(self._reasons(self.member), {TaskVisibility.Reason.PROJECT_MEMBER})
+
+        self.assertEqual(self._visible(self.outsider), set())
+        for user in (self.owner, self.assignee, self.member):
+            self.assertEqual(self._visible(user), {self.task.id})
+
+    def test_unassigning_revokes_visibility(self):
+        self.task.assignees.add(self.assignee, self.member)
+        self.task.assignees.remove(self.member)
+        self.assertEqual(self._visible(self.member), set())
+
+        self.client.force_authenticate(self.assignee)
+        response = self.client.patch(reverse('leave-task', args=[self.task.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._visible(self.assignee), set())
+
+    def test_leaving_a_project_revokes_only_the_membership(self):
+        self.project.members.add(self.member, self.assignee)
+        self.task.assignees.add(self.assignee)
+        membership = ProjectMember.objects.get(project=self.project, user=self.member)
+
+        self.client.force_authenticate(self.member)
+        response = self.client.delete(reverse('project-member-action', args=[self.project.id, membership.id]))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self._visible(self.member), set())
+
+        # Still assigned, so leaving the project keeps the task in view
+        self.project.members.remove(self.assignee)
+        self.assertEqual(self._reasons(self.assignee), {TaskVisibility.Reason.ASSIGNEE})
+
+    def test_sync_removes_stale_rows_in_one_delete(self):
+        for user in (self.assignee, self.member, self.outsider):
+            TaskVisibility.objects.create(user=user, task=self.task, reason=TaskVisibility.Reason.ASSIGNEE)
+
+        with CaptureQueriesContext(connection) as queries:
+            sync_task_visibility([self.task.id])
+
+        deletes = [q['sql'] for q in queries if q['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), 1)
+        self.assertEqual(set(TaskVisibility.objects.values_list('user_id', flat=True)), {self.owner.id})
+
+    def test_rebuild_and_verify_agree_with_the_or_join(self):
+        self.project.members.add(self.member)
+        other = Project.objects.create(name='Gemini', creator=self.member)
+        other.members.add(self.assignee)
+        Task.objects.create(title='Orphan', creator=None, project=other).assignees.add(self.outsider)
+        Task.objects.create(title='Solo', creator=self.outsider)
+        self.task.assignees.add(self.assignee, self.outsider)
+
+        # Drift: a lost row and a stale one
+        TaskVisibility.objects.filter(user=self.member).delete()
+        TaskVisibility.objects.create(user=self.outsider, task=self.task, reason=TaskVisibility.Reason.CREATOR)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_task_visibility', verify=True, stdout=StringIO())
+
+        call_command('rebuild_task_visibility', batch_size=2, stdout=StringIO())
+        call_command('rebuild_task_visibility', verify=True, stdout=StringIO())
+        for user in (self.owner, self.assignee, self.member, self.outsider):
+            with self.subTest(user=user.email):
+                self.assertEqual(self._visible(user), self._or_join(user))
+
+
+class TaskListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+
+    def _create_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(title=f'Task {i}', creator=self.user)
+            task.assignees.add(self.other)
+            TimeLog.objects.create(
+                task=task, user=self.other,
+                end_time=timezone.now(), duration=timedelta(minutes=30),
+            )
+            TimeLog.objects.create(task=task, user=self.user)
+
+    def _list_query_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('task-list-create'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self._create_tasks(2)
+        small_count, _ = self._list_query_count()
+
+        self._create_tasks(20)
+        large_count, data = self._list_query_count()
+
+        self.assertEqual(len(data['results']), 22)
+        self.assertEqual(small_count, large_count)
+
+    def test_timer_fields_use_batched_data(self):
+        self._create_tasks(1)
+        _, data = self._list_query_count()
+        task = data['results'][0]
+
+        self.assertEqual(task['total_time_taken'], 1800.0)
+        self.assertIsNotNone(task['active_timer_start'])
+        self.assertEqual([u['email'] for u in task['active_timers']], [self.user.email])
+
+
+class TaskCommentThreadTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.other = User.objects.create_user(email='other@example.com', password='password123')
+        self.task = Task.objects.create(title='Discussed', creator=self.user)
+        self.client.force_authenticate(self.user)
+
+    def _build_threads(self, count):
+        for i in range(count):
+            root = TaskComment.objects.create(task=self.task, author=self.user, content=f'root {i}')
+            reply = TaskComment.objects.create(task=self.task, author=self.other, content='reply', parent=root)
+            TaskComment.objects.create(task=self.task, author=self.user, content='nested', parent=reply)
+            root.likes.add(self.user, self.other)
+            reply.dislikes.add(self.user)
+
+    def _get_thread(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('task-comments', args=[self.task.id]))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_thread_query_count_is_constant(self):
+        self._build_threads(1)
+        small_count, _ = self._get_thread()
+
+        self._build_threads(10)
+        large_count, data = self._get_thread()
+
+        self.assertEqual(data['count'], 11)
+        self.assertEqual(small_count, large_count)
+
+    def test_only_roots_at_top_level_with_nested_replies(self):
+        self._build_threads(1)
+        _, data = self._get_thread()
+
+        [root] = data['results']
+        self.assertEqual(root['likes_count'], 2)
+        self.assertTrue(root['user_has_liked'])
+        [reply] = root['replies']
+        self.assertEqual(reply['dislikes_count'], 1)
+        self.assertTrue(reply['user_has_disliked'])
+        self.assertFalse(reply['user_has_liked'])
+        [nested] = reply['replies']
+        self.assertEqual(nested['content'], 'nested')
+        self.assertEqual(nested['replies'], [])
+
+
+class TaskCursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        for i in range(30):
+            Task.objects.create(title=f'Task {i}', creator=self.user)
+
+    def test_cursor_walk_returns_every_task_once_without_count(self):
+        seen = []
+        url = reverse('task-list-create') + '?cursor='
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(*)' in q['sql'] for q in ctx.captured_queries))
+            seen.extend(t['id'] for t in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(len(seen), 30)
+        self.assertEqual(len(set(seen)), 30)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('task-list-create') + '?cursor=garbage')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_malformed_id_is_rejected(self):
+        for position in ({"v": "2020-01-01T00:00:00+00:00", "id": "zzz"}, {"v": "2020-01-01T00:00:00+00:00", "id": 5}, ["v"]):
+            token = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+            response = self.client.get(reverse('task-list-create'), {'cursor': token})
+            self.assertEqual(response.status_code, 404)
+
+
+class TaskListCacheTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(title='Cached', creator=self.user)
+
+    def _get(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('task-list-create'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_unchanged_read_is_served_from_cache(self):
+        self._get()
+        queries, data = self._get()
+        self.assertEqual(queries, 0)
+        self.assertEqual(data['results'][0]['title'], 'Cached')
+
+    def test_task_and_child_changes_invalidate(self):
+        self._get()
+        self.task.title = 'Renamed'
+        self.task.save()
+        _, data = self._get()
+        self.assertEqual(data['results'][0]['title'], 'Renamed')
+
+        Subtask.objects.create(task=self.task, text='step')
+        _, data = self._get()
+        self.assertEqual(len(data['results'][0]['subtasks']), 1)
+
+    def test_profile_edit_invalidates_viewers_not_tasks(self):
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        self.task.assignees.add(other)
+        self._get()
+        detail = reverse('task-detail', args=[self.task.id])
+        etag = self.client.get(detail)['ETag']
+        task_version = get_version('task', self.task.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.first_name = 'Grace'
+            other.save()
+
+        _, data = self._get()
+        self.assertEqual(data['results'][0]['assignees'][0]['first_name'], 'Grace')
+        self.assertEqual(self.client.get(detail, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(get_version('task', self.task.id), task_version)
+
+    def test_saves_without_profile_changes_keep_the_cache(self):
+        self._get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('another-password')
+            self.user.save()
+            self.user.save()
+        queries, _ = self._get()
+        self.assertEqual(queries, 0)
+
+    def test_new_assignee_sees_task(self):
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(other)
+        _, data = self._get()
+        self.assertEqual(data['count'], 0)
+
+        self.task.assignees.add(other)
+        _, data = self._get()
+        self.assertEqual(data['count'], 1)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(title='Tagged', creator=self.user)
+
+    def test_task_detail_returns_304_until_changed(self):
+        url = reverse('task-detail', args=[self.task.id])
+        etag = self.client.get(url)['ETag']
+        self.assertTrue(etag)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Subtask.objects.create(task=self.task, text='step')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_comments_etag_tracks_reactions(self):
+        comment = TaskComment.objects.create(task=self.task, author=self.user, content='hi')
+        url = reverse('task-comments', args=[self.task.id])
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        comment.likes.add(self.user)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_comments_and_activity_etags_track_author_profiles(self):
+        author = User.objects.create_user(email='author@example.com', password='password123', first_name='Ada')
+        self.task.assignees.add(author)
+        TaskComment.objects.create(task=self.task, author=author, content='hi')
+        TaskActivity.objects.create(task=self.task, user=author, type='comment', action='commented')
+        urls = [reverse('task-comments', args=[self.task.id]), reverse('task-activities', args=[self.task.id])]
+        etags = [self.client.get(url)['ETag'] for url in urls]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            author.first_name = 'Grace'
+            author.save()
+
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('Grace', response.content.decode())
+
+    def test_comment_delete_changes_etag(self):
+        TaskComment.objects.create(task=self.task, author=self.user, content='keep')
+        comment = TaskComment.objects.create(task=self.task, author=self.user, content='drop')
+        url = reverse('task-comments', args=[self.task.id])
+        etag = self.client.get(url)['ETag']
+
+        comment.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_last_modified_moves_on_comment_delete(self):
+        TaskComment.objects.create(task=self.task, author=self.user, content='keep')
+        comment = TaskComment.objects.create(task=self.task, author=self.user, content='drop')
+        url = reverse('task-comments', args=[self.task.id])
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        # MAX(updated_at) is unchanged by the delete, the row count is not
+        comment.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['Last-Modified'], last_modified)
+
+    def test_invisible_task_is_not_revealed(self):
+        stranger = User.objects.create_user(email='stranger@example.com', password='password123')
+        self.client.force_authenticate(stranger)
+        response = self.client.get(reverse('task-activities', args=[self.task.id]), HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, 404)
+
+
+class DependencyGraphTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.a, self.b, self.c = (Task.objects.create(title=t, creator=self.user) for t in 'ABC')
+        # C depends on B, B depends on A
+        self.c.dependencies.add(self.b)
+        self.b.dependencies.add(self.a)
+
+    def test_transitive_queries_and_order(self):
+        graph = load_graph()
+        self.assertEqual(graph.transitive_blockers(self.c.id), {self.a.id, self.b.id})
+        self.assertEqual(graph.transitive_blocked(self.a.id), {self.b.id, self.c.id})
+        self.assertEqual(graph.topological_order(), [self.a.id, self.b.id, self.c.id])
+
+    def test_cycle_is_rejected(self):
+        url = reverse('task-detail', args=[self.a.id])
+        response = self.client.patch(url, {'dependencies_ids': [str(self.c.id)]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cycle', str(response.data['dependencies_ids']))
+
+    def test_graph_is_refreshed_after_edge_changes(self):
+        load_graph()
+        self.c.dependencies.remove(self.b)
+        self.assertEqual(load_graph().transitive_blockers(self.c.id), set())
+
+    def test_dependency_graph_endpoint(self):
+        response = self.client.get(reverse('task-dependency-graph', args=[self.a.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({t['title'] for t in response.data['blocked']}, {'B', 'C'})
+
+
+class CriticalPathTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name='Launch', creator=self.user)
+        make = lambda title, **kw: Task.objects.create(title=title, creator=self.user, project=self.project, **kw)
+        done = make('Done', status=Task.Status.DONE)
+        TimeLog.objects.create(task=done, user=self.user, end_time=timezone.now(), duration=timedelta(hours=4))
+        self.a, self.b, self.side = make('A'), make('B'), make('Side')
+        self.c = make('C', due_date=timezone.localdate())
+        self.b.dependencies.add(self.a)
+        self.c.dependencies.add(self.b)
+        TimeLog.objects.create(task=self.side, user=self.user, end_time=timezone.now(), duration=timedelta(hours=1))
+
+    def test_critical_path_and_slack(self):
+        response = self.client.get(reverse('project-critical-path', args=[self.project.id]))
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual([t['title'] for t in data['critical_path']], ['A', 'B', 'C'])
+        self.assertEqual(data['remaining_hours'], 12)
+        self.assertEqual(data['projected_completion'], timezone.localdate() + timedelta(days=2))
+
+        tasks = {t['title']: t for t in data['tasks']}
+        self.assertEqual(tasks['Side']['remaining_hours'], 3)
+        self.assertEqual(tasks['Side']['slack_hours'], 9)
+        self.assertEqual(tasks['B']['slack_hours'], 0)
+        self.assertTrue(tasks['C']['is_late'])
+
+    def test_non_member_cannot_see_schedule(self):
+        stranger = User.objects.create_user(email='stranger@example.com', password='password123')
+        self.client.force_authenticate(stranger)
+        response = self.client.get(reverse('project-critical-path', args=[self.project.id]))
+        self.assertEqual(response.status_code, 404)
+
+
+class UnblockPropagationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.blocker = Task.objects.create(title='Blocker', creator=self.user)
+        self.waiting = Task.objects.create(title='Waiting', creator=self.user)
+        self.waiting.assignees.add(self.other)
+        self.waiting.dependencies.add(self.blocker)
+
+    def test_edges_maintain_cached_state(self):
+        self.waiting.refresh_from_db()
+        self.assertTrue(self.waiting.is_blocked)
+        self.assertEqual(self.waiting.open_blocker_count, 1)
+
+        self.blocker.blocking.clear()
+        self.waiting.refresh_from_db()
+        self.assertFalse(self.waiting.is_blocked)
+
+    def test_completion_unblocks_dependents_and_notifies_once(self):
+        url = reverse('task-detail', args=[self.blocker.id])
+        response = self.client.patch(url, {'status': 'Done'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.waiting.refresh_from_db()
+        self.assertFalse(self.waiting.is_blocked)
+        unblocked = OutboxMessage.objects.get(payload__type='task_unblocked')
+        self.assertEqual(unblocked.recipient_id, self.other.id)
+        self.assertEqual(unblocked.payload, {
+            "type": "task_unblocked",
+            "message": "'Waiting' is ready to start: 'Blocker' is done.",
+            "task_id": str(self.waiting.id),
+            "link": f"/tasks/{self.waiting.id}",
+        })
+
+        ready = self.client.get(reverse('task-list-create') + '?ready=true').data
+        self.assertEqual({t['title'] for t in ready['results']}, {'Waiting'})
+
+        self.client.patch(url, {'status': 'To Do'}, format='json')
+        self.waiting.refresh_from_db()
+        self.assertTrue(self.waiting.is_blocked)
+
+    def test_deleting_blocker_unblocks(self):
+        self.blocker.delete()
+        self.waiting.refresh_from_db()
+        self.assertEqual(self.waiting.open_blocker_count, 0)
+
+
+class TaskCounterTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.task = Task.objects.create(title='Counted', creator=self.user)
+
+    def _counters(self):
+        self.task.refresh_from_db()
+        return (self.task.subtask_total, self.task.subtask_done, self.task.comment_count, self.task.total_seconds_logged)
+
+    def test_child_changes_update_counters(self):
+        step = Subtask.objects.create(task=self.task, text='step')
+        Subtask.objects.create(task=self.task, text='other', is_completed=True)
+        TaskComment.objects.create(task=self.task, author=self.user, content='hi')
+        log = TimeLog.objects.create(task=self.task, user=self.user)
+        self.assertEqual(self._counters(), (2, 1, 1, 0))
+
+        step.is_completed = True
+        step.save()
+        log.duration = timedelta(minutes=5)
+        log.save()
+        self.assertEqual(self._counters(), (2, 2, 1, 300))
+
+        step.delete()
+        log.delete()
+        self.assertEqual(self._counters(), (1, 1, 1, 0))
+        self.assertEqual(counter_drift(), {})
+
+    def test_counters_follow_moves_and_saves_without_loading_hooks(self):
+        other_task = Task.objects.create(title='Other', creator=self.user)
+        Subtask.objects.create(task=self.task, text='step', is_completed=True)
+        for model in (Task, Subtask, TaskComment, TimeLog, Asset):
+            self.assertFalse(post_init.has_listeners(model))
+
+        step = Subtask.objects.get(task=self.task)
+        step.task = other_task
+        step.save()
+        self.assertEqual(self._counters(), (0, 0, 0, 0))
+        other_task.refresh_from_db()
+        self.assertEqual((other_task.subtask_total, other_task.subtask_done), (1, 1))
+
+        # A save that touches no tracked field does not read the row back
+        with CaptureQueriesContext(connection) as ctx:
+            step.text = 'renamed'
+            step.save(update_fields=['text'])
+        self.assertFalse(any(q['sql'].startswith('SELECT "api_subtask"') for q in ctx.captured_queries))
+
+    def test_timer_stop_adds_logged_time(self):
+        self.client.force_authenticate(self.user)
+        self.client.post(reverse('timer-start', args=[self.task.id]))
+        TimeLog.objects.filter(task=self.task).update(start_time=timezone.now() - timedelta(minutes=2))
+
+        self.assertEqual(self.client.post(reverse('timer-stop', args=[self.task.id])).status_code, 200)
+
+        self.assertGreaterEqual(self._counters()[3], 120)
+        self.assertEqual(counter_drift(), {})
+
+    def test_repair_recomputes_drifted_counters(self):
+        Subtask.objects.create(task=self.task, text='step')
+        Task.objects.filter(pk=self.task.pk).update(subtask_total=7, comment_count=3)
+        self.assertIn(self.task.pk, counter_drift())
+
+        with self.assertRaises(CommandError):
+            call_command('repair_task_counters', '--verify', stdout=StringIO(), stderr=StringIO())
+        call_command('repair_task_counters', stdout=StringIO())
+        self.assertEqual(self._counters(), (1, 0, 0, 0))
+
+
+class BulkTaskOperationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.tasks = [Task.objects.create(title=f'Task {i}', creator=self.user) for i in range(3)]
+        for task in self.tasks:
+            task.assignees.add(self.other)
+        self.ids = [str(t.id) for t in self.tasks]
+
+    def _bulk(self, **payload):
+        return self.client.post(reverse('task-bulk'), {'task_ids': self.ids, **payload}, format='json')
+
+    def test_status_update_writes_activities_and_one_notification_per_user(self):
+        waiting = Task.objects.create(title='Waiting', creator=self.user)
+        waiting.assignees.add(self.other)
+        waiting.dependencies.add(*self.tasks)
+
+        response = self._bulk(operation='status', status='Done')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 3)
+
+        self.assertEqual(Task.objects.filter(status='Done', completed_at__isnull=False).count(), 3)
+        self.assertEqual(TaskActivity.objects.filter(type='status_change').count(), 3)
+        waiting.refresh_from_db()
+        self.assertFalse(waiting.is_blocked)
+        kinds = sorted(OutboxMessage.objects.values_list('payload__type', flat=True))
+        self.assertEqual(kinds, ['task_unblocked', 'tasks_bulk_updated'])
+        # Same payload shape as a single-task update
+        unblocked = OutboxMessage.objects.get(payload__type='task_unblocked').payload
+        self.assertEqual(unblocked['task_id'], str(waiting.id))
+        self.assertEqual(unblocked['message'], "'Waiting' is ready to start: 'Task 0', 'Task 1', 'Task 2' is done.")
+
+    def test_blocked_tasks_are_rejected_atomically(self):
+        blocker = Task.objects.create(title='Blocker', creator=self.user)
+        self.tasks[0].dependencies.add(blocker)
+        response = self._bulk(operation='status', status='In Progress')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.filter(status='In Progress').exists())
+
+    def test_assignee_changes_update_visibility(self):
+        response = self._bulk(operation='assignees', remove_assignee_ids=[str(self.other.id)])
+        self.assertEqual(response.status_code, 200)
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(reverse('task-list-create')).data['count'], 0)
+
+    def test_assignee_notifications_only_cover_their_own_tasks(self):
+        newcomer = User.objects.create_user(email='newcomer@example.com', password='password123')
+        leaver = User.objects.create_user(email='leaver@example.com', password='password123')
+        self.tasks[0].assignees.add(leaver)
+        OutboxMessage.objects.all().delete()
+
+        response = self._bulk(
+            operation='assignees', add_assignee_ids=[str(newcomer.id)], remove_assignee_ids=[str(leaver.id)],
+        )
+        self.assertEqual(response.data['updated'], 3)
+        payloads = {m.recipient_id: m.payload for m in OutboxMessage.objects.all()}
+        self.assertEqual(payloads[leaver.id]['task_ids'], [str(self.tasks[0].id)])
+        self.assertEqual(len(payloads[newcomer.id]['task_ids']), 3)
+
+    def test_bulk_submit_notifies_the_creator_like_a_single_update(self):
+        self.client.force_authenticate(self.other)
+        response = self._bulk(operation='status', status='Submitted')
+        self.assertEqual(response.status_code, 200)
+
+        submitted = OutboxMessage.objects.filter(payload__type='task_submitted')
+        self.assertEqual(submitted.count(), 3)
+        self.assertEqual({m.recipient_id for m in submitted}, {self.user.id})
+        self.assertEqual({m.payload['task_id'] for m in submitted}, set(self.ids))
+
+    def test_single_update_queues_workflow_notifications_in_the_outbox(self):
+        self.client.force_authenticate(self.other)
+        response = self.client.patch(reverse('task-detail', args=[self.tasks[0].id]), {'status': 'Submitted'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        # Queued for drain_outbox, nothing is written to the feed synchronously
+        message = OutboxMessage.objects.get(payload__type='task_submitted')
+        self.assertEqual((message.recipient_id, message.payload['task_id']), (self.user.id, self.ids[0]))
+        self.assertFalse(Notification.objects.filter(type='task_submitted').exists())
+
+    def test_invisible_or_foreign_tasks(self):
+        stranger = User.objects.create_user(email='stranger@example.com', password='password123')
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self._bulk(operation='priority', priority='High').status_code, 400)
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self._bulk(operation='delete').status_code, 403)
+        self.assertEqual(Task.objects.count(), 3)
+
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self._bulk(operation='delete').data['deleted'], 3)
+        self.assertFalse(Task.objects.exists())
+
+
+class TaskImportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.other = User.objects.create_user(email='other@example.com', password='password123')
+        self.project = Project.objects.create(name='Migration', creator=self.user)
+        self.client.force_authenticate(self.user)
+
+    def _upload(self, name, content, **extra):
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(reverse('task-import'), {'file': upload, **extra}, format='multipart')
+
+    def test_csv_import_with_bad_rows_and_forward_dependencies(self):
+        content = (
+            "external_id,title,status,assignees,project,subtasks,dependencies\n"
+            "a,First,in progress,Other@example.com,Migration,write; review,b\n"
+            "b,Second,,,,,\n"
+            ",,Done,,,,\n"
+            "c,Third,Nope,ghost@example.com,,,\n"
+        )
+        response = self._upload('tasks.csv', content, chunk_size=1)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([e['row'] for e in response.data['errors']], [4, 5])
+        self.assertEqual(set(response.data['errors'][1]['errors']), {'status', 'assignees'})
+
+        first = Task.objects.get(title='First')
+        self.assertEqual(first.status, 'In Progress')
+        self.assertEqual(first.project, self.project)
+        self.assertEqual(first.subtask_total, 2)
+        self.assertTrue(first.is_blocked)
+        self.assertEqual(list(first.dependencies.values_list('title', flat=True)), ['Second'])
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(reverse('task-list-create')).data['count'], 1)
+
+    def test_jsonl_import_with_command(self):
+        lines = [
+            {"title": "Json task", "priority": "urgent", "subtasks": [{"text": "step", "assignee": "owner@example.com"}]},
+            "not json",
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as handle:
+            handle.write(json.dumps(lines[0]) + "\n" + lines[1] + "\n")
+        out, err = StringIO(), StringIO()
+        call_command('import_tasks', handle.name, user='owner@example.com', stdout=out, stderr=err)
+        os.unlink(handle.name)
+
+        self.assertIn('Imported 1 of 2 rows', out.getvalue())
+        self.assertIn('row 2', err.getvalue())
+        task = Task.objects.get(title='Json task')
+        self.assertEqual(task.priority, 'Urgent')
+        self.assertEqual(task.subtasks.get().assignee, self.user)
+
+
+    def test_non_string_assignees_are_row_errors(self):
+        content = json.dumps({"title": "Numbers", "assignees": [5]}) + "\n" + json.dumps({"title": "Fine"}) + "\n"
+        response = self._upload('tasks.jsonl', content)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'], [{"row": 1, "errors": {"assignees": "Unknown users: 5."}}])
+
+    def test_undecodable_file_is_a_400(self):
+        content = b"title\nFirst\nSecond\n" + b"Caf\xe9\n"
+        upload = SimpleUploadedFile('tasks.csv', content)
+        response = self.client.post(reverse('task-import'), {'file': upload, 'chunk_size': 1}, format='multipart')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('UTF-8', response.data['error']['detail'])
+        self.assertEqual(response.data['created'], 0)
+        self.assertEqual(response.data['chunks'], [])
+        self.assertFalse(Task.objects.exists())
+
+    def test_broken_csv_keeps_earlier_chunks(self):
+        # An unterminated quote runs past the field size limit
+        content = "title,description\nFirst,ok\nSecond,\"never closed\nThird,x\n" + "y" * 10
+        limit = csv.field_size_limit(20)
+        try:
+            response = self._upload('tasks.csv', content, chunk_size=1)
+        finally:
+            csv.field_size_limit(limit)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['chunks'], [{"rows": [2, 2], "created": 1}])
+        self.assertEqual(response.data['error']['row'], 3)
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ['First'])
+
+
+class ProjectExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name='Quarterly Report', creator=self.user)
+        self.done = Task.objects.create(title='Shipped', creator=self.user, project=self.project, status='Done')
+        self.open = Task.objects.create(title='Pending, "quoted"', creator=self.user, project=self.project)
+        self.open.assignees.add(self.user)
+        TimeLog.objects.create(task=self.open, user=self.user, end_time=timezone.now(), duration=timedelta(minutes=90))
+
+    def _export(self, kind, fmt, query=''):
+        url = reverse('project-export', args=[self.project.id, kind, fmt]) + query
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_task_csv_respects_task_filters(self):
+        rows = list(csv.DictReader(StringIO(self._export('tasks', 'csv', '?status=to%20do'))))
+        self.assertEqual([r['title'] for r in rows], ['Pending, "quoted"'])
+        self.assertEqual(rows[0]['assignees'], 'owner@example.com')
+        self.assertEqual(float(rows[0]['total_seconds_logged']), 5400)
+
+    def test_time_logs_jsonl_and_activity_json(self):
+        [line] = self._export('time-logs', 'jsonl').splitlines()
+        self.assertEqual(json.loads(line)['duration_seconds'], 5400)
+        self.assertEqual(json.loads(self._export('activity', 'json')), [])
+
+    async def test_asgi_export_streams_from_an_async_iterator(self):
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+        url = reverse('project-export', args=[self.project.id, 'tasks', 'csv'])
+
+        response = await self.async_client.get(url, headers={'Authorization': f'Bearer {token}'})
+
+        self.assertEqual(response.status_code, 200)
+        # An async iterator is what keeps Django's ASGI handler from buffering it all
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(sorted(r['title'] for r in rows), ['Pending, "quoted"', 'Shipped'])
+
+    def test_export_requires_membership(self):
+        stranger = User.objects.create_user(email='stranger@example.com', password='password123')
+        self.client.force_authenticate(stranger)
+        response = self.client.get(reverse('project-export', args=[self.project.id, 'tasks', 'csv']))
+        self.assertEqual(response.status_code, 404)
+
+
+class TimeReportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name='Billing', creator=self.user)
+        self.task = Task.objects.create(title='Invoice', creator=self.user, project=self.project)
+        self.yesterday = timezone.localdate() - timedelta(days=1)
+
+        past = TimeLog.objects.create(task=self.task, user=self.user, end_time=timezone.now(), duration=timedelta(hours=2))
+        TimeLog.objects.filter(pk=past.pk).update(start_time=timezone.now() - timedelta(days=1))
+        TimeLog.objects.create(task=self.task, user=self.user, end_time=timezone.now(), duration=timedelta(minutes=30))
+        call_command('summarize_time_logs', stdout=StringIO())
+
+    def _report(self, query):
+        response = self.client.get(reverse('time-reports') + query)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_history_from_summary_and_today_live(self):
+        data = self._report('?group_by=project,day')
+        self.assertEqual(data['total_seconds'], 9000)
+        self.assertEqual(
+            [(r['project_label'], r['day'], r['total_seconds']) for r in data['results']],
+            [('Billing', self.yesterday, 7200), ('Billing', timezone.localdate(), 1800)]
+        )
+
+    def test_editing_a_past_log_refreshes_its_summary(self):
+        log = TimeLog.objects.get(duration=timedelta(hours=2))
+        log.duration = timedelta(hours=3)
+        log.save()
+        data = self._report(f'?group_by=user&start={self.yesterday}&end={self.yesterday}')
+        self.assertEqual(data['results'][0]['total_seconds'], 10800)
+
+    def test_invalid_group_by(self):
+        self.assertEqual(self.client.get(reverse('time-reports') + '?group_by=month').status_code, 400)
+
+
+class RunningTimersTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123', first_name='Ada')
+        self.other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+
+    def test_compact_payload_in_one_query(self):
+        for i in range(5):
+            task = Task.objects.create(title=f'Timed {i}', creator=self.user)
+            task.assignees.add(self.other)
+            TimeLog.objects.create(task=task, user=self.user)
+            TimeLog.objects.create(task=task, user=self.other)
+        hidden = Task.objects.create(title='Hidden', creator=self.other)
+        TimeLog.objects.create(task=hidden, user=self.other)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('running-timers'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response.data[0]['users'][0]['display_name'], 'Ada')
+        self.assertEqual(len(response.data[0]['users']), 2)
+
+        self.assertEqual(len(self.client.get(reverse('running-tasks')).data['results']), 5)
+
+
+class TimerConcurrencyTests(TransactionTestCase):
+    """
+    Threads racing on the timer endpoints. Shared-cache in-memory SQLite
+    raises "table is locked" instead of waiting, so on the default test
+    database this case copies the schema into a temporary file and runs
+    against that, with the same WAL/IMMEDIATE/timeout options as production.
+    """
+    THREADS = 8
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._memory = None
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            handle, cls._path = tempfile.mkstemp(suffix='.sqlite3')
+            os.close(handle)
+            connection.ensure_connection()
+            target = sqlite3.connect(cls._path)
+            connection.connection.backup(target)
+            target.close()
+            # Keep the in-memory connection open (closing it drops that database)
+            # and let Django connect to the file from every thread
+            cls._memory = (connection.settings_dict['NAME'], connection.connection)
+            connection.connection = None
+            connection.settings_dict['NAME'] = cls._path
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls._memory is not None:
+            connection.close()
+            connection.settings_dict['NAME'], connection.connection = cls._memory
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(cls._path + suffix):
+                    os.remove(cls._path + suffix)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.task = Task.objects.create(title='Timed', creator=self.user)
+        self.other_task = Task.objects.create(title='Next', creator=self.user)
+
+    def _hammer(self, url, data=None):
+        barrier = threading.Barrier(self.THREADS)
+        codes = []
+
+        def worker():
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+            try:
+                codes.append(client.post(url, data or {}, format='json').status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sorted(codes)
+
+    def test_concurrent_starts_open_one_timer_and_stops_close_it_once(self):
+        codes = self._hammer(reverse('timer-start', args=[self.task.id]))
+        self.assertEqual(codes.count(200), 1)
+        self.assertEqual(TimeLog.objects.filter(task=self.task, end_time__isnull=True).count(), 1)
+
+        codes = self._hammer(reverse('timer-stop', args=[self.task.id]))
+        self.assertEqual(codes.count(200), 1)
+        log = TimeLog.objects.get(task=self.task)
+        self.assertIsNotNone(log.duration)
+        self.task.refresh_from_db()
+        self.assertAlmostEqual(self.task.total_seconds_logged, log.duration.total_seconds(), places=3)
+
+    def test_switch_stops_current_timer_and_starts_the_next(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.post(reverse('timer-start', args=[self.task.id]))
+
+        response = client.post(reverse('timer-switch'), {'task_id': str(self.other_task.id)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['stopped'], [str(self.task.id)])
+        open_tasks = TimeLog.objects.filter(user=self.user, end_time__isnull=True).values_list('task_id', flat=True)
+        self.assertEqual(list(open_tasks), [self.other_task.id])
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name='Apollo', creator=self.user)
+        self.project.members.add(self.user, self.other)
+        for i in range(5):
+            task = Task.objects.create(title=f'Task {i}', description='x' * 200, creator=self.user, project=self.project)
+            task.assignees.add(self.other)
+            Subtask.objects.create(task=task, text='step', assignee=self.other)
+
+    def _list(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('task-list-create'), params)
+        return response, len(ctx.captured_queries)
+
+    def test_default_is_the_full_serializer(self):
+        response, _ = self._list()
+        row = response.data['results'][0]
+        self.assertIn('subtasks', row)
+        self.assertIn('members', row['project'])
+
+    def test_compact_rows_are_smaller_and_cheaper(self):
+        full, full_queries = self._list()
+        compact, compact_queries = self._list(expand='')
+
+        row = compact.data['results'][0]
+        self.assertEqual(row['project'], {'id': str(self.project.id), 'name': 'Apollo'})
+        self.assertEqual(set(row['assignees'][0]), {'id', 'email', 'display_name', 'avatar'})
+        self.assertNotIn('subtasks', row)
+        self.assertEqual(row['subtask_total'], 1)
+        self.assertLess(len(compact.content), len(full.content) / 2)
+        self.assertLess(compact_queries, full_queries)
+
+    def test_fields_and_expand(self):
+        response, _ = self._list(fields='id,title,subtasks')
+        row = response.data['results'][0]
+        self.assertEqual(list(row), ['id', 'title', 'subtasks'])
+        self.assertEqual(row['subtasks'][0]['assignee']['email'], 'other@example.com')
+
+        response, _ = self._list(fields='id', expand='project')
+        self.assertEqual(list(response.data['results'][0]), ['id'])
+
+        row = self._list(expand='project,description')[0].data['results'][0]
+        self.assertIn('members', row['project'])
+        self.assertEqual(len(row['description']), 200)
+
+        response, _ = self._list(fields='id,secret')
+        self.assertEqual(response.status_code, 400)
+
+    def test_important_tasks_honour_sparse_fields(self):
+        task = Task.objects.first()
+        self.client.post(reverse('important-task-list-create'), {'task_id': str(task.id)})
+
+        response = self.client.get(reverse('important-task-list-create'), {'fields': 'id,title'})
+
+        self.assertEqual(response.data['results'][0]['task'], {'id': str(task.id), 'title': task.title})
+
+
+class FastListSerializationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123', first_name='Ada')
+        self.other = User.objects.create_user(email='other@example.com', password='password123', username='other')
+        self.third = User.objects.create_user(email='third@example.com', password='password123')
+        User.objects.filter(id=self.other.id).update(avatar='avatars/other.png')
+        self.client.force_authenticate(self.user)
+
+        project = Project.objects.create(name='Apollo', creator=self.user)
+        project.members.add(self.user, self.other, self.third)
+        previous = None
+        for i in range(6):
+            task = Task.objects.create(
+                title=f'Task {i}', creator=self.user, project=project if i % 2 else None,
+                due_date=timezone.localdate(), due_time='09:30',
+            )
+            task.assignees.add(self.other, self.third)
+            Subtask.objects.create(task=task, text='step', assignee=self.other)
+            Subtask.objects.create(task=task, text='unassigned')
+            if previous:
+                task.dependencies.add(previous)
+            TaskActivity.objects.create(task=task, user=self.user, type='created', action='created', details={'i': i})
+            Asset.objects.create(file=f'assets/file{i}.txt', task=task, uploaded_by=self.other)
+            Notification.objects.create(recipient=self.user, type='info', message=f'Note {i}', data={'i': i})
+            previous = task
+        TimeLog.objects.create(task=previous, user=self.user)
+        TimeLog.objects.create(task=previous, user=self.other)
+        self.task = previous
+
+    def _both(self, url, params=None):
+        responses = []
+        for fast in (False, True):
+            cache.clear()
+            with self.settings(FAST_LIST_SERIALIZATION=fast):
+                response = self.client.get(url, params or {})
+            self.assertEqual(response.status_code, 200)
+            responses.append(response.content)
+        return responses
+
+    def test_output_matches_the_serializers(self):
+        urls = [
+            (reverse('task-list-create'), None),
+            (reverse('task-list-create'), {'cursor': ''}),
+            (reverse('notification-list'), None),
+            (reverse('notification-list'), {'cursor': ''}),
+            (reverse('task-activities', args=[self.task.id]), None),
+            (reverse('asset-list'), None),
+        ]
+        for url, params in urls:
+            with self.subTest(url=url, params=params):
+                slow, fast = self._both(url, params)
+                self.assertEqual(fast, slow)
+
+        data = json.loads(fast)
+        self.assertEqual(data['results'][0]['uploaded_by']['avatar'], 'http://testserver/media/avatars/other.png')
+
+    def _task_list_queries(self, fast=True):
+        cache.clear()
+        with self.settings(FAST_LIST_SERIALIZATION=fast), CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('task-list-create'))
+        return len(ctx.captured_queries)
+
+    def test_task_page_uses_a_fixed_number_of_queries(self):
+        before = self._task_list_queries()
+        # The serializer loads each project's members per task
+        self.assertLess(before, self._task_list_queries(fast=False))
+        project = Project.objects.create(name='Gemini', creator=self.third)
+        project.members.add(self.user, self.third)
+        for i in range(6):
+            task = Task.objects.create(title=f'More {i}', creator=self.third, project=project)
+            task.assignees.add(self.user)
+            Subtask.objects.create(task=task, text='step', assignee=self.third)
+        self.assertEqual(self._task_list_queries(), before)
+
+    def test_sparse_requests_keep_the_serializer(self):
+        with self.settings(FAST_LIST_SERIALIZATION=True):
+            response = self.client.get(reverse('task-list-create'), {'fields': 'id,title'})
+        self.assertEqual(list(response.data['results'][0]), ['id', 'title'])
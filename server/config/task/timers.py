@@ -0,0 +1,69 @@
+from django.db import IntegrityError, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .models import TimeLog
+from . import counters
+
+
+def start_timer(task, user):
+    """
+    Open a timer, relying on the `uniq_open_timelog` constraint instead of a
+    check-then-insert. Returns the new TimeLog, or None if one is already running.
+    """
+    try:
+        with transaction.atomic():
+            return TimeLog.objects.create(task=task, user=user)
+    except IntegrityError:
+        return None
+
+
+def stop_timer(log):
+    """
+    Close `log` with a conditional UPDATE ... WHERE end_time IS NULL, so of
+    two concurrent stops exactly one wins. Returns the stopped log, or None
+    if someone else stopped it first.
+
+    The ORM has no UPDATE ... RETURNING, and the duration is computed here
+    because SQLite and PostgreSQL store intervals differently; the row count
+    of the conditional UPDATE gives the same exactly-once answer.
+    """
+    now = timezone.now()
+    duration = now - log.start_time
+    stopped = TimeLog.objects.filter(pk=log.pk, end_time__isnull=True).update(end_time=now, duration=duration)
+    if not stopped:
+        return None
+
+    # update() sends no signals; replay post_save so counters, caches and
+    # summaries see the stop exactly as they would see log.save(). The row
+    # was still open, so its counted contribution is the one just loaded.
+    log._counted = counters.snapshot(log)
+    log.end_time, log.duration = now, duration
+    post_save.send(sender=TimeLog, instance=log, created=False, update_fields={'end_time', 'duration'}, raw=False, using=TimeLog.objects.db)
+    return log
+
+
+def open_timers(user, task_id=None):
+    logs = TimeLog.objects.filter(user=user, end_time__isnull=True)
+    if task_id is not None:
+        logs = logs.filter(task_id=task_id)
+    return logs
+
+
+def stop_timers(user, task_id=None, exclude_task_id=None):
+    """Stop the user's running timers (optionally on one task); returns the stopped logs."""
+    logs = open_timers(user, task_id)
+    if exclude_task_id is not None:
+        logs = logs.exclude(task_id=exclude_task_id)
+    return [log for log in (stop_timer(log) for log in logs) if log is not None]
+
+
+def switch_timer(user, task):
+    """
+    Stop every other running timer of `user` and start one on `task`, in one
+    transaction. Returns (stopped_logs, started_log_or_None_if_already_running).
+    """
+    with transaction.atomic():
+        stopped = stop_timers(user, exclude_task_id=task.pk)
+        started = start_timer(task, user)
+    return stopped, started
@@ -5,12 +5,18 @@ from .views import (
     LeaveTaskAPIView, UserTasksAPIView, ImportantTaskAPIView,
     UnmarkImportantAPIView, RunningTasksAPIView,
     TaskCommentAPIView, TaskCommentDetailAPIView, TaskActivityAPIView,
-    TaskCommentLikeDislikeAPIView, TaskTimerStartAPIView, TaskTimerStopAPIView
+    TaskCommentLikeDislikeAPIView, TaskTimerStartAPIView, TaskTimerStopAPIView,
+    TaskDependencyGraphAPIView, BulkTaskAPIView, TaskImportAPIView,
+    TimeReportAPIView, RunningTimersAPIView, TimerSwitchAPIView
 )
 
 urlpatterns = [
     path('tasks/', TaskAPIView.as_view(), name='task-list-create'),
+    path('tasks/bulk/', BulkTaskAPIView.as_view(), name='task-bulk'),
+    path('tasks/import/', TaskImportAPIView.as_view(), name='task-import'),
     path('tasks/running/', RunningTasksAPIView.as_view(), name='running-tasks'),
+    path('timers/running/', RunningTimersAPIView.as_view(), name='running-timers'),
+    path('timers/switch/', TimerSwitchAPIView.as_view(), name='timer-switch'),
     path('tasks/<uuid:task_id>/timer/start/', TaskTimerStartAPIView.as_view(), name='timer-start'),
     path('tasks/<uuid:task_id>/timer/stop/', TaskTimerStopAPIView.as_view(), name='timer-stop'),
     path('tasks/<uuid:pk>/', TaskDetailAPIView.as_view(), name='task-detail'),
@@ -27,4 +33,6 @@ urlpatterns = [
     path('comments/<uuid:pk>/', TaskCommentDetailAPIView.as_view(), name='task-comment-detail'),
     path('comments/<uuid:pk>/like-dislike/', TaskCommentLikeDislikeAPIView.as_view(), name='task-comment-like-dislike'),
     path('tasks/<uuid:task_id>/activities/', TaskActivityAPIView.as_view(), name='task-activities'),
+    path('time-reports/', TimeReportAPIView.as_view(), name='time-reports'),
+    path('tasks/<uuid:task_id>/dependency-graph/', TaskDependencyGraphAPIView.as_view(), name='task-dependency-graph'),
 ]
@@ -1,58 +1,230 @@
+import uuid
+from collections import defaultdict
+
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Max, Exists, OuterRef, Subquery, Prefetch, IntegerField
+from django.db.models.functions import Coalesce
 from django.db import transaction
-from django.core.mail import send_mail
-from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
 from rest_framework import generics, serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 
-from .models import Task, Subtask, ImportantTask, TaskComment, TaskActivity, TimeLog
-from .serializers import TaskSerializer, SubtaskSerializer, SearchForAssigneeSerializer, ImportantTaskSerializer, TaskCommentSerializer, TaskActivitySerializer
+from .models import Task, Subtask, ImportantTask, TaskComment, TaskActivity, TimeLog, TaskVisibility, TimeLogDailySummary
+from .serializers import TaskSerializer, TaskListSerializer, ImportantTaskListSerializer, SubtaskSerializer, SearchForAssigneeSerializer, ImportantTaskSerializer, TaskCommentSerializer, TaskActivitySerializer, DependencyTaskSerializer, BulkTaskOperationSerializer, TimeReportQuerySerializer
 from .filters import TaskFilter
+from .visibility import visible_task_ids, sync_task_visibility
+from .cache import CachedTaskListMixin, invalidate_task_lists, users_for_tasks
+from .graph import graph_for, invalidate_graphs
+from .blocking import propagate_status_change
+from .counters import recompute_counters
+from .reports import time_report
+from .timers import start_timer, stop_timers, switch_timer
+from .fastpath import TASK_COLUMNS, ACTIVITY_COLUMNS, task_rows, activity_rows
+from .importer import TaskImporter, parse_rows, FORMATS as IMPORT_FORMATS, DEFAULT_CHUNK_SIZE as DEFAULT_IMPORT_CHUNK_SIZE
 
 from user.models import User
 from user.serializers import UserSerializer
+from user.directory import people_index, TYPEAHEAD_LIMIT
 from project.models import Project, ProjectMember
 from project.serializers import ProjectSerializer
 from asset.models import Asset
 from notification.views import send_notification_to_user
+from notification.models import OutboxMessage
+from common.pagination import KeysetOrPageNumberPagination
+from common.serializers import wants_sparse
+from common.fastpath import FastListMixin
+from common.versions import get_version, get_versions, make_etag, changed_at
+
+
+def _open_time_logs_prefetch():
+    return Prefetch(
+        'time_logs',
+        queryset=TimeLog.objects.filter(end_time__isnull=True).select_related('user'),
+        to_attr='open_time_logs',
+    )
 
 
-def _task_queryset_for_user(user):
-    return (
-        Task.objects.filter(
-            Q(creator=user) |
-            Q(assignees=user) |
-            Q(project__members=user)
+# Output field -> the related data it reads
+_TASK_RELATED = {
+    'project': ['project'],
+    'creator': ['creator'],
+}
+_TASK_PREFETCHES = {
+    'assignees': ['assignees'],
+    'subtasks': ['subtasks', 'subtasks__assignee'],
+    'dependencies': ['dependencies'],
+    'blocking': ['blocking'],
+    'active_timer_start': [_open_time_logs_prefetch],
+    'active_timers': [_open_time_logs_prefetch],
+}
+
+
+def _with_task_list_data(queryset, fields=None):
+    """
+    Attach everything TaskSerializer reads so a page of tasks costs a fixed
+    number of queries: related rows and the still-open TimeLogs (with their
+    users). Totals come from the counter columns, so there is no GROUP BY.
+
+    Pass the `fields` a sparse serializer will render to load only those.
+    """
+    names = _TASK_RELATED.keys() | _TASK_PREFETCHES.keys() if fields is None else set(fields)
+    related = [lookup for name in _TASK_RELATED if name in names for lookup in _TASK_RELATED[name]]
+    prefetches = {}
+    for name, lookups in _TASK_PREFETCHES.items():
+        if name in names:
+            for lookup in lookups:
+                prefetch = lookup() if callable(lookup) else lookup
+                prefetches[getattr(prefetch, 'prefetch_to', prefetch)] = prefetch
+    if related:
+        # select_related() with no arguments would follow every foreign key
+        queryset = queryset.select_related(*related)
+    return queryset.prefetch_related(*prefetches.values())
+
+
+def _task_queryset_for_user(user, fields=None):
+    # Visibility comes from the TaskVisibility index: one indexed IN lookup, no DISTINCT
+    return _with_task_list_data(Task.objects.filter(id__in=visible_task_ids(user)), fields)
+
+
+def _task_list_fields(request):
+    """Fields a sparse task list renders for `request`, or None for the full TaskSerializer."""
+    return TaskListSerializer.output_fields(request) if wants_sparse(request) else None
+
+
+def _task_read_serializer(request):
+    return TaskListSerializer if wants_sparse(request) else TaskSerializer
+
+
+def _with_comment_feedback(queryset, user):
+    """Annotate like/dislike counts and the requesting user's own reaction on each comment."""
+    Likes = TaskComment.likes.through
+    Dislikes = TaskComment.dislikes.through
+
+    def _count(through):
+        return Subquery(
+            through.objects.filter(taskcomment_id=OuterRef('pk'))
+            .order_by()
+            .values('taskcomment_id')
+            .annotate(total=Count('id'))
+            .values('total'),
+            output_field=IntegerField(),
         )
-        .distinct()
-        .select_related('project', 'creator')
-        .prefetch_related(
-            'assignees',
-            'subtasks',
-            'subtasks__assignee',
-            'dependencies',
-            'blocking'
-        )
-        .annotate(total_assets_annotated=Count('assets', distinct=True))
+
+    return queryset.annotate(
+        likes_count_annotated=Coalesce(_count(Likes), 0),
+        dislikes_count_annotated=Coalesce(_count(Dislikes), 0),
+        user_has_liked_annotated=Exists(Likes.objects.filter(taskcomment_id=OuterRef('pk'), user_id=user.id)),
+        user_has_disliked_annotated=Exists(Dislikes.objects.filter(taskcomment_id=OuterRef('pk'), user_id=user.id)),
+    )
+
+
+def _can_see_task(request, task_id):
+    return TaskVisibility.objects.filter(user=request.user, task_id=task_id).exists()
+
+
+def _task_detail_etag(request, pk):
+    updated_at = (
+        Task.objects.filter(id__in=visible_task_ids(request.user), id=pk)
+        .values_list('updated_at', flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    # The payload carries per-user timer fields, so the user is part of the tag;
+    # `task_people` moves when anyone embedded in the user's tasks edits their profile
+    return make_etag(
+        pk, updated_at.isoformat(), get_version('task', pk),
+        request.user.pk, get_version('task_people', request.user.pk),
+    )
+
+
+def _profile_versions(user_ids):
+    # Nested authors are serialized from the user row, so their edits change the payload
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None}, key=str)
+    return list(zip(user_ids, get_versions('profile', user_ids)))
+
+
+def _comments_etag(request, task_id):
+    if not _can_see_task(request, task_id):
+        return None
+    authors = TaskComment.objects.filter(task_id=task_id).order_by().values_list('author_id', flat=True).distinct()
+    return make_etag(
+        task_id, get_version('comments', task_id), _profile_versions(authors),
+        request.user.pk, request.META.get('QUERY_STRING', ''),
+    )
+
+
+def _comments_last_modified(request, task_id):
+    if not _can_see_task(request, task_id):
+        return None
+    comments = TaskComment.objects.filter(task_id=task_id)
+    stats = comments.aggregate(last=Max('updated_at'), total=Count('id'))
+    authors = comments.order_by().values_list('author_id', flat=True).distinct()
+    # MAX(updated_at) misses deletes, reactions and author edits; the count
+    # and versions fold those in
+    changed = changed_at(
+        'comments', task_id, stats['total'], get_version('comments', task_id), _profile_versions(authors),
     )
+    return max(filter(None, [stats['last'], changed]))
 
 
-class TaskAPIView(generics.ListCreateAPIView):
+def _activity_stats(task_id):
+    activities = TaskActivity.objects.filter(task_id=task_id)
+    stats = activities.aggregate(last=Max('timestamp'), total=Count('id'))
+    users = activities.order_by().values_list('user_id', flat=True).distinct()
+    return stats, _profile_versions(users)
+
+
+def _activities_etag(request, task_id):
+    if not _can_see_task(request, task_id):
+        return None
+    stats, profiles = _activity_stats(task_id)
+    # The count catches deletions (credit rows are removed when a task is reopened)
+    return make_etag(task_id, stats['last'], stats['total'], profiles, request.META.get('QUERY_STRING', ''))
+
+
+def _activities_last_modified(request, task_id):
+    if not _can_see_task(request, task_id):
+        return None
+    stats, profiles = _activity_stats(task_id)
+    changed = changed_at('activities', task_id, stats['last'], stats['total'], profiles)
+    return max(filter(None, [stats['last'], changed]))
+
+
+class TaskAPIView(CachedTaskListMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetOrPageNumberPagination
     filterset_class = TaskFilter
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     ordering_fields = ['created_at', 'due_date']
+    fast_columns = TASK_COLUMNS
+
+    def use_fast_list(self, request):
+        # Sparse fieldsets keep using TaskListSerializer
+        return super().use_fast_list(request) and not wants_sparse(request)
+
+    def fast_rows(self, rows):
+        return task_rows(rows, self.request)
 
     def get_queryset(self):
-        return _task_queryset_for_user(self.request.user)
+        return _task_queryset_for_user(self.request.user, _task_list_fields(self.request))
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return _task_read_serializer(self.request)
+        return TaskSerializer
 
     def get_filterset_kwargs(self, *args, **kwargs):
         kwargs = super().get_filterset_kwargs(*args, **kwargs)
@@ -71,37 +243,109 @@ class TaskAPIView(generics.ListCreateAPIView):
                     "project": "You must be a project member to create tasks in this project"
                 })
 
-        task = serializer.save(creator=self.request.user)
+        with transaction.atomic():
+            task = serializer.save(creator=self.request.user)
 
-        TaskActivity.objects.create(
-            task=task,
-            user=self.request.user,
-            type="created",
-            action="created this task"
-        )
-
-        for assignee in task.assignees.all():
-            send_notification_to_user(assignee.id, {
-                "type": "task_assigned",
-                "message": f"You have been assigned to task: {task.title}",
-                "task_id": str(task.id),
-                "task_title": task.title,
-                "user_email": self.request.user.email,
-            }, recipient=assignee)
-
-            subject = f"New Task Assignment: {task.title}"
-            message = (
-                f"Hello {assignee.first_name},\n\n"
-                f"You have been assigned to a new task: {task.title}.\n\n"
-                f"Description: {task.description or 'No description provided'}\n\n"
-                f"Please check the application for more details."
+            TaskActivity.objects.create(
+                task=task,
+                user=self.request.user,
+                type="created",
+                action="created this task"
             )
-            try:
-                send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [assignee.email], fail_silently=True)
-            except Exception as e:
-                print(f"Failed to send email to {assignee.email}: {e}")
-
 
+            # Delivered by `manage.py drain_outbox` once this transaction commits
+            outbox = []
+            for assignee in task.assignees.all():
+                outbox.append(OutboxMessage.notification(assignee, {
+                    "type": "task_assigned",
+                    "message": f"You have been assigned to task: {task.title}",
+                    "task_id": str(task.id),
+                    "task_title": task.title,
+                    "user_email": self.request.user.email,
+                }))
+                outbox.append(OutboxMessage.email(
+                    assignee,
+                    f"New Task Assignment: {task.title}",
+                    f"Hello {assignee.first_name},\n\n"
+                    f"You have been assigned to a new task: {task.title}.\n\n"
+                    f"Description: {task.description or 'No description provided'}\n\n"
+                    f"Please check the application for more details."
+                ))
+            OutboxMessage.objects.bulk_create(outbox)
+
+
+def _status_workflow_notifications(task, old_status, actor, assignee_ids):
+    """
+    (recipient id, payload) pairs the approval workflow sends when `task` (a
+    dict with id, title, status and creator_id) moves from `old_status`.
+    """
+    link_data = {"task_id": str(task['id']), "link": f"/tasks/{task['id']}"}
+    other_assignees = [user_id for user_id in assignee_ids if user_id != actor.id]
+
+    # Workflow: Submitted -> Notify Creator
+    if task['status'] == 'Submitted' and task['creator_id'] and task['creator_id'] != actor.id:
+        return [(task['creator_id'], {
+            "type": "task_submitted",
+            "message": f"{actor.first_name} submitted task '{task['title']}' for review.",
+            **link_data
+        })]
+
+    # Workflow: Approved (Submitted -> Done) -> Notify Assignees
+    if old_status == 'Submitted' and task['status'] == 'Done':
+        data = {
+            "type": "task_approved",
+            "message": f"{actor.first_name} approved task '{task['title']}'.",
+            **link_data
+        }
+        return [(user_id, data) for user_id in other_assignees]
+
+    # Workflow: Changes Requested (Submitted -> In Progress) -> Notify Assignees
+    if old_status == 'Submitted' and task['status'] == 'In Progress':
+        data = {
+            "type": "task_changes_requested",
+            "message": f"{actor.first_name} requested changes on '{task['title']}'.",
+            **link_data
+        }
+        return [(user_id, data) for user_id in other_assignees]
+    return []
+
+
+def _notify_unblocked(task_ids, completed_ids, actor):
+    """
+    Queue one outbox notification per (assignee, task) that just became
+    ready to start, naming the blockers among `completed_ids` that were
+    finished. Single and bulk updates both send unblocks this way.
+    """
+    if not task_ids:
+        return
+    completed = defaultdict(list)
+    links = (
+        Task.dependencies.through.objects
+        .filter(from_task_id__in=task_ids, to_task_id__in=completed_ids)
+        .order_by('to_task__title')
+        .values_list('from_task_id', 'to_task__title')
+    )
+    for task_id, title in links:
+        completed[task_id].append(f"'{title}'")
+
+    rows = (
+        Task.assignees.through.objects
+        .filter(task_id__in=task_ids)
+        .exclude(user=actor)
+        .values_list('user_id', 'task_id', 'task__title')
+    )
+    OutboxMessage.objects.bulk_create([
+        OutboxMessage.notification(user_id, {
+            "type": "task_unblocked",
+            "message": f"'{title}' is ready to start: {', '.join(completed[task_id])} is done.",
+            "task_id": str(task_id),
+            "link": f"/tasks/{task_id}",
+        })
+        for user_id, task_id, title in rows
+    ])
+
+
+@method_decorator(condition(etag_func=_task_detail_etag), name='get')
 class TaskDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
@@ -124,8 +368,7 @@ class TaskDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
                 action=f"changed status from {old_status} to {updated_task.status}",
                 details={"from": old_status, "to": updated_task.status}
             )
-            from django.utils import timezone
-            
+
             if updated_task.status == 'Done' and old_status != 'Done':
                 updated_task.completed_at = timezone.now()
                 updated_task.save(update_fields=['completed_at'])
@@ -154,40 +397,24 @@ class TaskDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
                 updated_task.save(update_fields=['completed_at'])
                 TaskActivity.objects.filter(task=updated_task, type="credit").delete()
 
+            # Only the direct dependents can change blocked state
+            if 'Done' in (old_status, updated_task.status):
+                unblocked = propagate_status_change([updated_task.id])
+                _notify_unblocked(unblocked, [updated_task.id], self.request.user)
+
             # --- Approval Workflow Notifications ---
-            from notification.models import Notification
-            
-            # Workflow: Submitted -> Notify Creator
-            if updated_task.status == 'Submitted' and updated_task.creator and updated_task.creator != self.request.user:
-                Notification.objects.create(
-                    recipient=updated_task.creator,
-                    type="task_submitted",
-                    message=f"{self.request.user.first_name} submitted task '{updated_task.title}' for review.",
-                    data={"task_id": str(updated_task.id), "link": f"/tasks/{updated_task.id}"}
+            # Delivered by `manage.py drain_outbox`, like the bulk status change
+            OutboxMessage.objects.bulk_create([
+                OutboxMessage.notification(user_id, payload)
+                for user_id, payload in _status_workflow_notifications(
+                    {
+                        'id': updated_task.id, 'title': updated_task.title,
+                        'status': updated_task.status, 'creator_id': updated_task.creator_id,
+                    },
+                    old_status, self.request.user, [a.id for a in updated_task.assignees.all()],
                 )
+            ])
 
-            # Workflow: Approved (Submitted -> Done) -> Notify Assignees
-            elif old_status == 'Submitted' and updated_task.status == 'Done':
-                for assignee in updated_task.assignees.all():
-                    if assignee != self.request.user:
-                        Notification.objects.create(
-                            recipient=assignee,
-                            type="task_approved",
-                            message=f"{self.request.user.first_name} approved task '{updated_task.title}'.",
-                            data={"task_id": str(updated_task.id), "link": f"/tasks/{updated_task.id}"}
-                        )
-
-            # Workflow: Changes Requested (Submitted -> In Progress) -> Notify Assignees
-            elif old_status == 'Submitted' and updated_task.status == 'In Progress':
-                for assignee in updated_task.assignees.all():
-                    if assignee != self.request.user:
-                        Notification.objects.create(
-                            recipient=assignee,
-                            type="task_changes_requested",
-                            message=f"{self.request.user.first_name} requested changes on '{updated_task.title}'.",
-                            data={"task_id": str(updated_task.id), "link": f"/tasks/{updated_task.id}"}
-                        )
-                        
         if old_priority != updated_task.priority:
             TaskActivity.objects.create(
                 task=updated_task,
@@ -213,6 +440,306 @@ class TaskDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         return super().destroy(request, *args, **kwargs)
 
 
+def _linked_task_ids(task_ids):
+    """`task_ids` plus every task linked to one of them by a dependency edge."""
+    links = Task.dependencies.through.objects.filter(Q(from_task_id__in=task_ids) | Q(to_task_id__in=task_ids))
+    linked = set(task_ids)
+    for from_id, to_id in links.values_list('from_task_id', 'to_task_id'):
+        linked.update((from_id, to_id))
+    return linked
+
+
+def _count_tasks(count):
+    return f"{count} task" if count == 1 else f"{count} tasks"
+
+
+class BulkTaskAPIView(generics.GenericAPIView):
+    """
+    Apply one operation (status, priority, assignees, project or delete) to
+    many tasks in a single transaction.
+
+    Permission and blocker checks are set-based, writes use update() and
+    bulk_create, and every affected user gets one aggregated notification.
+    update() bypasses model signals, so each operation refreshes the
+    visibility index, list caches and blocker state it touches itself.
+    """
+    serializer_class = BulkTaskOperationSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        task_ids = data['task_ids']
+
+        operation = data['operation']
+        with transaction.atomic():
+            # Lock the rows so concurrent edits cannot interleave with the batch
+            tasks = list(
+                Task.objects.filter(id__in=task_ids)
+                .filter(id__in=visible_task_ids(request.user))
+                .select_for_update()
+                .values('id', 'title', 'status', 'priority', 'creator_id', 'project_id')
+            )
+            if len(tasks) != len(task_ids):
+                found = {t['id'] for t in tasks}
+                missing = ', '.join(str(t) for t in task_ids if t not in found)
+                raise ValidationError({"task_ids": f"Tasks not found: {missing}."})
+
+            self.assignees = defaultdict(set)
+            assignments = Task.assignees.through.objects.filter(task_id__in=task_ids)
+            for task_id, user_id in assignments.values_list('task_id', 'user_id'):
+                self.assignees[task_id].add(user_id)
+
+            changed, summary, affected_users = getattr(self, f'_bulk_{operation}')(tasks, data)
+            self._notify(changed, summary, affected_users, operation)
+
+        key = 'deleted' if operation == 'delete' else 'updated'
+        return Response({
+            "operation": operation,
+            key: len(changed),
+            "task_ids": [t['id'] for t in changed],
+        })
+
+    def _bulk_status(self, tasks, data):
+        new_status = data['status']
+        changed = [t for t in tasks if t['status'] != new_status]
+        ids = [t['id'] for t in changed]
+        if new_status in (Task.Status.IN_PROGRESS, Task.Status.DONE):
+            self._check_blockers(ids, new_status)
+
+        now = timezone.now()
+        entering = [t['id'] for t in changed if new_status == Task.Status.DONE]
+        leaving = [t['id'] for t in changed if t['status'] == Task.Status.DONE]
+        Task.objects.filter(id__in=ids).update(status=new_status, updated_at=now)
+        if entering:
+            Task.objects.filter(id__in=entering).update(completed_at=now)
+        if leaving:
+            Task.objects.filter(id__in=leaving).update(completed_at=None)
+            TaskActivity.objects.filter(task_id__in=leaving, type="credit").delete()
+
+        activities = [
+            TaskActivity(
+                task_id=t['id'],
+                user=self.request.user,
+                type="status_change",
+                action=f"changed status from {t['status']} to {new_status}",
+                details={"from": t['status'], "to": new_status}
+            )
+            for t in changed
+        ]
+        creators = {t['id']: t['creator_id'] for t in changed}
+        for task_id in entering:
+            credited = {creators[task_id]} | self.assignees[task_id]
+            activities.extend(
+                TaskActivity(task_id=task_id, user_id=user_id, type="credit", action="completed this task", details={})
+                for user_id in credited if user_id
+            )
+        TaskActivity.objects.bulk_create(activities)
+
+        invalidate_task_lists(_linked_task_ids(ids))
+        unblocked = propagate_status_change(entering + leaving) - set(ids)
+        _notify_unblocked(unblocked, entering, self.request.user)
+
+        # The same approval workflow notifications as a single-task update
+        OutboxMessage.objects.bulk_create([
+            OutboxMessage.notification(user_id, payload)
+            for t in changed
+            for user_id, payload in _status_workflow_notifications(
+                {**t, 'status': new_status}, t['status'], self.request.user, sorted(self.assignees[t['id']], key=str),
+            )
+        ])
+        return changed, f"set status to {new_status} on {{tasks}}", {}
+
+    def _check_blockers(self, task_ids, new_status):
+        open_blockers = (
+            Task.dependencies.through.objects
+            .filter(from_task_id__in=task_ids)
+            .exclude(to_task__status=Task.Status.DONE)
+        )
+        if new_status == Task.Status.DONE:
+            # Blockers completed in the same request do not count
+            open_blockers = open_blockers.exclude(to_task_id__in=task_ids)
+        pairs = list(open_blockers.values_list('from_task__title', 'to_task__title')[:5])
+        if pairs:
+            details = ', '.join(f'"{task}" is blocked by "{blocker}"' for task, blocker in pairs)
+            raise ValidationError({
+                'status': f'Cannot set status to "{new_status}". {details}.'
+            })
+
+    def _bulk_priority(self, tasks, data):
+        new_priority = data['priority']
+        changed = [t for t in tasks if t['priority'] != new_priority]
+        ids = [t['id'] for t in changed]
+        Task.objects.filter(id__in=ids).update(priority=new_priority, updated_at=timezone.now())
+        TaskActivity.objects.bulk_create([
+            TaskActivity(
+                task_id=t['id'],
+                user=self.request.user,
+                type="priority_change",
+                action=f"changed priority from {t['priority']} to {new_priority}",
+                details={"from": t['priority'], "to": new_priority}
+            )
+            for t in changed
+        ])
+        invalidate_task_lists(_linked_task_ids(ids))
+        return changed, f"set priority to {new_priority} on {{tasks}}", {}
+
+    def _bulk_assignees(self, tasks, data):
+        add_ids = set(data['add_assignee_ids'])
+        remove_ids = set(data['remove_assignee_ids']) - add_ids
+        users = User.objects.in_bulk(add_ids | remove_ids)
+        missing = add_ids - set(users)
+        if missing:
+            raise ValidationError({"add_assignee_ids": f"Invalid user IDs: {', '.join(map(str, missing))}"})
+
+        Through = Task.assignees.through
+        added, removed = [], []
+        for t in tasks:
+            current = self.assignees[t['id']]
+            added.extend((t['id'], user_id) for user_id in add_ids - current)
+            removed.extend((t['id'], user_id) for user_id in remove_ids & current)
+        ids = [t['id'] for t in tasks]
+
+        Through.objects.bulk_create([Through(task_id=t, user_id=u) for t, u in added])
+        if removed:
+            Through.objects.filter(task_id__in=ids, user_id__in=remove_ids).delete()
+            unassigned = Subtask.objects.filter(task_id__in=ids, assignee_id__in=remove_ids)
+            affected = set(unassigned.values_list('task_id', flat=True))
+            unassigned.update(assignee=None, is_completed=False)
+            recompute_counters(affected)
+
+        def describe(user):
+            return {"display_name": user.display_name, "email": user.email}
+
+        TaskActivity.objects.bulk_create([
+            TaskActivity(
+                task_id=task_id, user=self.request.user, type="assignee_added",
+                action=f"assigned {users[user_id].display_name or users[user_id].email}",
+                details={"assignee": describe(users[user_id])}
+            )
+            for task_id, user_id in added
+        ] + [
+            TaskActivity(
+                task_id=task_id, user=self.request.user, type="assignee_removed",
+                action=f"removed assignee {users[user_id].display_name or users[user_id].email}",
+                details={"assignee": describe(users[user_id])}
+            )
+            for task_id, user_id in removed if user_id in users
+        ])
+
+        touched = {t for t, _ in added + removed}
+        sync_task_visibility(touched, reasons=[TaskVisibility.Reason.ASSIGNEE])
+        invalidate_task_lists(touched, {u for _, u in removed})
+        affected_users = defaultdict(set)
+        for task_id, user_id in added:
+            self.assignees[task_id].add(user_id)
+            affected_users[task_id].add(user_id)
+        for task_id, user_id in removed:
+            self.assignees[task_id].discard(user_id)
+            affected_users[task_id].add(user_id)
+        changed = [t for t in tasks if t['id'] in touched]
+        return changed, "changed the assignees of {tasks}", affected_users
+
+    def _bulk_project(self, tasks, data):
+        project_id = data['project_id']
+        project = None
+        if project_id is not None:
+            project = Project.objects.filter(
+                Q(creator=self.request.user) | Q(members=self.request.user), id=project_id
+            ).first()
+            if project is None:
+                raise ValidationError({
+                    "project_id": "You must be a project member to move tasks into this project"
+                })
+
+        changed = [t for t in tasks if t['project_id'] != project_id]
+        ids = [t['id'] for t in changed]
+        previous_viewers = users_for_tasks(ids)
+        Task.objects.filter(id__in=ids).update(project_id=project_id, updated_at=timezone.now())
+
+        action = f"moved this task to {project.name}" if project else "removed this task from its project"
+        TaskActivity.objects.bulk_create([
+            TaskActivity(
+                task_id=t['id'], user=self.request.user, type="project_change", action=action,
+                details={"from": str(t['project_id']) if t['project_id'] else None, "to": str(project_id) if project_id else None}
+            )
+            for t in changed
+        ])
+
+        TimeLogDailySummary.objects.filter(task_id__in=ids).update(project_id=project_id)
+        sync_task_visibility(ids, reasons=[TaskVisibility.Reason.PROJECT_MEMBER])
+        invalidate_task_lists(_linked_task_ids(ids), previous_viewers)
+        invalidate_graphs({t['project_id'] for t in changed} | {project_id})
+        summary = f"moved {{tasks}} to {project.name}" if project else "removed {tasks} from their project"
+        return changed, summary, {}
+
+    def _bulk_delete(self, tasks, data):
+        if any(t['creator_id'] != self.request.user.id for t in tasks):
+            raise PermissionDenied("Only the task creator can delete this task.")
+        # QuerySet.delete() still sends the per-row delete signals, which keep
+        # the caches, counters, graphs and blocker state in step
+        Task.objects.filter(id__in=[t['id'] for t in tasks]).delete()
+        return tasks, "deleted {tasks}", {}
+
+    def _notify(self, changed, summary, affected_users, operation):
+        """
+        One aggregated outbox notification per creator/assignee of the changed
+        tasks, plus the users `affected_users` (task id -> user ids) lists for
+        that task, such as assignees who were just removed. `summary` is a
+        phrase with a `{tasks}` placeholder.
+        """
+        actor = self.request.user
+        per_user = defaultdict(list)
+        for t in changed:
+            for user_id in {t['creator_id']} | self.assignees[t['id']] | affected_users.get(t['id'], set()):
+                if user_id and user_id != actor.id:
+                    per_user[user_id].append(t['id'])
+
+        recipients = User.objects.in_bulk(per_user)
+        name = actor.first_name or actor.email
+        OutboxMessage.objects.bulk_create([
+            OutboxMessage.notification(recipients[user_id], {
+                "type": "tasks_bulk_updated",
+                "operation": operation,
+                "message": f"{name} {summary.format(tasks=_count_tasks(len(task_ids)))}.",
+                "task_ids": [str(t) for t in task_ids],
+            })
+            for user_id, task_ids in per_user.items() if user_id in recipients
+        ])
+
+
+class TaskImportAPIView(generics.GenericAPIView):
+    """
+    Import tasks from an uploaded CSV or JSON Lines file (`file` field).
+
+    The file is parsed as a stream and written in chunks of `chunk_size`
+    rows; rows that fail validation are listed in the report and skipped.
+    If the file turns out unreadable part way (invalid UTF-8, broken CSV)
+    the response is a 400 whose `chunks` lists the row ranges committed.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"detail": "Upload the file in the 'file' field."}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = request.data.get('format') or ('jsonl' if upload.name.lower().endswith(('.jsonl', '.json', '.ndjson')) else 'csv')
+        if fmt not in IMPORT_FORMATS:
+            return Response({"detail": f"format must be one of: {', '.join(IMPORT_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            chunk_size = int(request.data.get('chunk_size') or DEFAULT_IMPORT_CHUNK_SIZE)
+        except ValueError:
+            return Response({"detail": "chunk_size must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = TaskImporter(request.user, chunk_size=chunk_size).run(parse_rows(upload.file, fmt))
+        # An unreadable file is a 400 even when earlier chunks went in; `chunks` says which
+        ok = report['created'] and 'error' not in report
+        return Response(report, status=status.HTTP_201_CREATED if ok else status.HTTP_400_BAD_REQUEST)
+
+
 class SubtasksApiView(generics.ListCreateAPIView):
     serializer_class = SubtaskSerializer
     permission_classes = [IsAuthenticated]
@@ -247,12 +774,7 @@ class SubtaskActionAPIView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self):
         return (
-            Subtask.objects.filter(
-                Q(task__creator=self.request.user) |
-                Q(task__assignees=self.request.user) |
-                Q(task__project__members=self.request.user)
-            )
-            .distinct()
+            Subtask.objects.filter(task_id__in=visible_task_ids(self.request.user))
             .select_related('task', 'assignee')
         )
 
@@ -319,36 +841,35 @@ class AddAssigneeAPIView(generics.UpdateAPIView):
         new_users = [u for u in users if u.id not in existing_ids]
 
         if new_users:
-            task.assignees.add(*new_users)
-
-            for user in new_users:
-                TaskActivity.objects.create(
-                    task=task,
-                    user=request.user,
-                    type="assignee_added",
-                    action=f"assigned {user.display_name or user.email}",
-                    details={"assignee": {"display_name": user.display_name, "email": user.email}}
-                )
+            with transaction.atomic():
+                task.assignees.add(*new_users)
 
-                send_notification_to_user(user.id, {
-                    "type": "task_assigned",
-                    "message": f"You have been assigned to task: {task.title}",
-                    "task_id": str(task.id),
-                    "task_title": task.title,
-                    "assigned_by": request.user.email,
-                }, recipient=user)
+                outbox = []
+                for user in new_users:
+                    TaskActivity.objects.create(
+                        task=task,
+                        user=request.user,
+                        type="assignee_added",
+                        action=f"assigned {user.display_name or user.email}",
+                        details={"assignee": {"display_name": user.display_name, "email": user.email}}
+                    )
 
-                subject = f"New Task Assignment: {task.title}"
-                message = (
-                    f"Hello {user.first_name},\n\n"
-                    f"You have been assigned to a task: {task.title}.\n\n"
-                    f"Description: {task.description or 'No description provided'}\n\n"
-                    f"Please check the application for more details."
-                )
-                try:
-                    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=True)
-                except Exception as e:
-                    print(f"Failed to send email to {user.email}: {e}")
+                    outbox.append(OutboxMessage.notification(user, {
+                        "type": "task_assigned",
+                        "message": f"You have been assigned to task: {task.title}",
+                        "task_id": str(task.id),
+                        "task_title": task.title,
+                        "assigned_by": request.user.email,
+                    }))
+                    outbox.append(OutboxMessage.email(
+                        user,
+                        f"New Task Assignment: {task.title}",
+                        f"Hello {user.first_name},\n\n"
+                        f"You have been assigned to a task: {task.title}.\n\n"
+                        f"Description: {task.description or 'No description provided'}\n\n"
+                        f"Please check the application for more details."
+                    ))
+                OutboxMessage.objects.bulk_create(outbox)
 
         return Response({"detail": "Assignees added successfully."})
 
@@ -383,28 +904,44 @@ class RemoveAssigneeAPIView(generics.DestroyAPIView):
             pass
 
         Subtask.objects.filter(task=task, assignee_id=assignee_id).update(assignee=None, is_completed=False)
+        recompute_counters([task.id])
 
         return Response({"detail": "Assignee removed successfully and related subtasks unassigned."})
 
 
 class SearchForAssigneeAPIView(generics.ListAPIView):
+    """
+    Assignee picker typeahead. Searches are answered from the in-process
+    people index, ranked, without a query per keystroke; `project` limits
+    them to that project's members. An empty search lists everyone as before.
+    """
     serializer_class = SearchForAssigneeSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        search = self.request.query_params.get('user', '').strip()
         project = self.request.query_params.get('project')
+        if project:
+            return ProjectMember.objects.filter(project_id=project).select_related("user")
+        return User.objects.all()
 
+    def list(self, request, *args, **kwargs):
+        search = request.query_params.get('user', '').strip()
+        if not search:
+            return super().list(request, *args, **kwargs)
+
+        member_ids = None
+        project = request.query_params.get('project')
         if project:
-            queryset = ProjectMember.objects.filter(project_id=project).select_related("user")
-            if search:
-                queryset = queryset.filter(user__email__icontains=search)
-            return queryset
+            try:
+                member_ids = people_index.project_member_ids(uuid.UUID(project))
+            except ValueError:
+                raise ValidationError({"project": "Must be a valid UUID."})
 
-        queryset = User.objects.all()
-        if search:
-            queryset = queryset.filter(email__icontains=search)
-        return queryset
+        users = people_index.search(search, limit=TYPEAHEAD_LIMIT, user_ids=member_ids)
+        page = self.paginate_queryset(users)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(users, many=True).data)
 
 
 class LeaveTaskAPIView(generics.UpdateAPIView):
@@ -425,6 +962,7 @@ class LeaveTaskAPIView(generics.UpdateAPIView):
         task.assignees.remove(user)
 
         Subtask.objects.filter(task=task, assignee=user).update(assignee=None, is_completed=False)
+        recompute_counters([task.id])
 
         # Iterate so each Asset.delete() fires and removes the physical file
         for asset in Asset.objects.filter(task=task, uploaded_by=user):
@@ -442,33 +980,39 @@ class LeaveTaskAPIView(generics.UpdateAPIView):
         return Response({"detail": "You have left the task successfully."})
 
 
-class UserTasksAPIView(generics.ListAPIView):
+class UserTasksAPIView(CachedTaskListMixin, generics.ListAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
-        return (
-            Task.objects.filter(Q(creator=user) | Q(assignees=user))
-            .distinct()
-            .select_related('project', 'creator')
-            .prefetch_related(
-                'assignees',
-                'subtasks',
-                'subtasks__assignee',
-                'dependencies',
-                'blocking'
-            )
-            .annotate(total_assets_annotated=Count('assets', distinct=True))
+        return _with_task_list_data(
+            Task.objects.filter(id__in=visible_task_ids(
+                user, reasons=[TaskVisibility.Reason.CREATOR, TaskVisibility.Reason.ASSIGNEE]
+            )),
+            _task_list_fields(self.request),
         )
 
+    def get_serializer_class(self):
+        return _task_read_serializer(self.request)
+
 
 class ImportantTaskAPIView(generics.ListCreateAPIView):
     serializer_class = ImportantTaskSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return ImportantTask.objects.filter(user=self.request.user)
+        tasks = _with_task_list_data(Task.objects.all(), _task_list_fields(self.request))
+        return (
+            ImportantTask.objects.filter(user=self.request.user)
+            .select_related('user')
+            .prefetch_related(Prefetch('task', queryset=tasks))
+        )
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and wants_sparse(self.request):
+            return ImportantTaskListSerializer
+        return ImportantTaskSerializer
 
 
 class UnmarkImportantAPIView(generics.DestroyAPIView):
@@ -487,32 +1031,59 @@ class RunningTasksAPIView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        # EXISTS over the open-timer partial index instead of a join + DISTINCT
+        open_logs = TimeLog.objects.filter(task=OuterRef('pk'), end_time__isnull=True)
         return (
-            _task_queryset_for_user(self.request.user)
-            .filter(
-                time_logs__end_time__isnull=True
-            )
-            .distinct()
+            _task_queryset_for_user(self.request.user, _task_list_fields(self.request))
+            .filter(Exists(open_logs))
             .order_by('-updated_at')
         )
 
-from django.utils import timezone
+    def get_serializer_class(self):
+        return _task_read_serializer(self.request)
+
+
+class RunningTimersAPIView(generics.GenericAPIView):
+    """
+    Compact list of every running timer on tasks the user can see, grouped by
+    task, from a single query over the open-timer partial index.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        rows = (
+            TimeLog.objects
+            .filter(end_time__isnull=True, task_id__in=visible_task_ids(request.user))
+            .order_by('start_time')
+            .values_list(
+                'task_id', 'task__title', 'start_time',
+                'user_id', 'user__first_name', 'user__last_name', 'user__username', 'user__avatar',
+            )
+        )
+        timers = {}
+        for task_id, title, start_time, user_id, first_name, last_name, username, avatar in rows:
+            entry = timers.setdefault(task_id, {"task_id": task_id, "title": title, "start_time": start_time, "users": []})
+            entry["users"].append({
+                "id": user_id,
+                "display_name": f"{first_name} {last_name}".strip() or username,
+                "avatar": request.build_absolute_uri(default_storage.url(avatar)) if avatar else None,
+                "start_time": start_time,
+            })
+        return Response(list(timers.values()))
+
 
 class TaskTimerStartAPIView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
         task_id = kwargs.get('task_id')
-        queryset = _task_queryset_for_user(request.user)
+        queryset = Task.objects.filter(id__in=visible_task_ids(request.user))
         task = get_object_or_404(queryset, id=task_id)
 
-        # Check if already running
-        if TimeLog.objects.filter(task=task, user=request.user, end_time__isnull=True).exists():
+        # The partial unique constraint decides; no exists()/create() race
+        if start_timer(task, request.user) is None:
             return Response({"detail": "Timer is already running for this task."}, status=400)
 
-        # Start timer
-        TimeLog.objects.create(task=task, user=request.user)
-
         return Response({"detail": "Timer started successfully."})
 
 class TaskTimerStopAPIView(generics.CreateAPIView):
@@ -520,33 +1091,75 @@ class TaskTimerStopAPIView(generics.CreateAPIView):
 
     def post(self, request, *args, **kwargs):
         task_id = kwargs.get('task_id')
-        queryset = _task_queryset_for_user(request.user)
+        queryset = Task.objects.filter(id__in=visible_task_ids(request.user))
         task = get_object_or_404(queryset, id=task_id)
 
-        # Find running timer
-        time_log = TimeLog.objects.filter(task=task, user=request.user, end_time__isnull=True).first()
-        if not time_log:
+        if not stop_timers(request.user, task_id=task.id):
             return Response({"detail": "No active timer found for this task."}, status=400)
 
-        # Stop timer
-        time_log.end_time = timezone.now()
-        time_log.duration = time_log.end_time - time_log.start_time
-        time_log.save()
-
         return Response({"detail": "Timer stopped successfully."})
 
+class TimerSwitchAPIView(generics.GenericAPIView):
+    """Stop whatever the user is timing and start the timer on `task_id`, in one round trip."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        task_id = request.data.get('task_id')
+        if not task_id:
+            return Response({"detail": "task_id is required"}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = Task.objects.filter(id__in=visible_task_ids(request.user))
+        try:
+            task = queryset.get(id=task_id)
+        except (Task.DoesNotExist, DjangoValidationError):
+            return Response({"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        stopped, started = switch_timer(request.user, task)
+        return Response({
+            "stopped": [str(log.task_id) for log in stopped],
+            "started": str(task.id),
+            "detail": "Timer switched." if started else "Timer was already running for this task.",
+        })
+
+@method_decorator(condition(etag_func=_comments_etag, last_modified_func=_comments_last_modified), name='get')
 class TaskCommentAPIView(generics.ListCreateAPIView):
     serializer_class = TaskCommentSerializer
     permission_classes = [IsAuthenticated]
 
+    def _get_task(self):
+        # Plain visibility check — the comment thread needs none of the task list prefetches
+        if not hasattr(self, '_task_cache'):
+            tasks = Task.objects.filter(id__in=visible_task_ids(self.request.user))
+            self._task_cache = get_object_or_404(tasks, id=self.kwargs['task_id'])
+        return self._task_cache
+
     def get_queryset(self):
-        queryset = _task_queryset_for_user(self.request.user)
-        task = get_object_or_404(queryset, id=self.kwargs['task_id'])
-        return TaskComment.objects.filter(task=task).select_related('author')
+        task = self._get_task()
+        return _with_comment_feedback(
+            TaskComment.objects.filter(task=task).select_related('author'),
+            self.request.user
+        )
+
+    def list(self, request, *args, **kwargs):
+        # Paginate root comments only; the whole reply tree is loaded in one query
+        # and handed to the serializer as a parent -> children map.
+        roots = self.get_queryset().filter(parent__isnull=True)
+        page = self.paginate_queryset(roots)
+
+        replies_by_parent = defaultdict(list)
+        for reply in self.get_queryset().filter(parent__isnull=False):
+            replies_by_parent[reply.parent_id].append(reply)
+
+        context = self.get_serializer_context()
+        context['replies_by_parent'] = replies_by_parent
+        serializer = self.get_serializer_class()(
+            page if page is not None else roots, many=True, context=context
+        )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
     def perform_create(self, serializer):
-        queryset = _task_queryset_for_user(self.request.user)
-        task = get_object_or_404(queryset, id=self.kwargs['task_id'])
+        task = self._get_task()
         if task.creator != self.request.user and not task.assignees.filter(id=self.request.user.id).exists():
             raise PermissionDenied("Only the task creator and assignees can add comments to this task.")
         comment = serializer.save(author=self.request.user, task=task)
@@ -563,11 +1176,7 @@ class TaskCommentDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return TaskComment.objects.filter(
-            Q(task__creator=self.request.user) |
-            Q(task__assignees=self.request.user) |
-            Q(task__project__members=self.request.user)
-        ).distinct()
+        return TaskComment.objects.filter(task_id__in=visible_task_ids(self.request.user))
 
     def perform_update(self, serializer):
         if serializer.instance.author != self.request.user:
@@ -586,11 +1195,7 @@ class TaskCommentLikeDislikeAPIView(generics.UpdateAPIView):
     lookup_url_kwarg = "pk"
 
     def get_queryset(self):
-        return TaskComment.objects.filter(
-            Q(task__creator=self.request.user) |
-            Q(task__assignees=self.request.user) |
-            Q(task__project__members=self.request.user)
-        ).distinct()
+        return TaskComment.objects.filter(task_id__in=visible_task_ids(self.request.user))
 
     def patch(self, request, *args, **kwargs):
         comment = self.get_object()
@@ -615,11 +1220,55 @@ class TaskCommentLikeDislikeAPIView(generics.UpdateAPIView):
         serializer = self.get_serializer(comment)
         return Response(serializer.data)
 
-class TaskActivityAPIView(generics.ListAPIView):
+@method_decorator(condition(etag_func=_activities_etag, last_modified_func=_activities_last_modified), name='get')
+class TaskActivityAPIView(FastListMixin, generics.ListAPIView):
     serializer_class = TaskActivitySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetOrPageNumberPagination
+    cursor_field = 'timestamp'
+    fast_columns = ACTIVITY_COLUMNS
+
+    def fast_rows(self, rows):
+        return activity_rows(rows, self.request)
 
     def get_queryset(self):
         queryset = _task_queryset_for_user(self.request.user)
         task = get_object_or_404(queryset, id=self.kwargs['task_id'])
         return TaskActivity.objects.filter(task=task).select_related('user')
+
+
+class TimeReportAPIView(generics.GenericAPIView):
+    """
+    Logged time over a date range grouped by any of user, project, task, day
+    and week (`?group_by=user,week`), limited to tasks the caller can see.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        params = TimeReportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+        return Response(time_report(
+            visible_task_ids(request.user),
+            query['start'], query['end'], query['group_by'],
+            user_id=query.get('user_id'), project_id=query.get('project_id'),
+        ))
+
+
+class TaskDependencyGraphAPIView(generics.GenericAPIView):
+    """Transitive blockers of a task and everything transitively waiting on it."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        visible = Task.objects.filter(id__in=visible_task_ids(request.user))
+        task = get_object_or_404(visible, id=kwargs['task_id'])
+
+        graph = graph_for(task)
+        blockers = graph.transitive_blockers(task.id)
+        blocked = graph.transitive_blocked(task.id)
+        related = {t.id: t for t in visible.filter(id__in=blockers | blocked)}
+
+        return Response({
+            "blockers": DependencyTaskSerializer([related[i] for i in blockers if i in related], many=True).data,
+            "blocked": DependencyTaskSerializer([related[i] for i in blocked if i in related], many=True).data,
+        })
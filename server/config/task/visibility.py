@@ -0,0 +1,106 @@
+from django.db import transaction
+
+from .models import Task, TaskVisibility
+
+
+Reason = TaskVisibility.Reason
+
+
+def visible_task_ids(user, reasons=None):
+    """Subquery of the task ids `user` may see (creator, assignee or project member)."""
+    rows = TaskVisibility.objects.filter(user=user)
+    if reasons is not None:
+        rows = rows.filter(reason__in=reasons)
+    return rows.values('task_id')
+
+
+def expected_visibility_rows(task_ids=None, reasons=None):
+    """
+    Compute the (user_id, task_id, reason) set from the source tables.
+
+    Pass `task_ids` to restrict the computation to a handful of tasks and
+    `reasons` to skip sources the caller knows are unchanged.
+    """
+    reasons = set(reasons or Reason.values)
+    tasks = Task.objects.all()
+    if task_ids is not None:
+        tasks = tasks.filter(id__in=task_ids)
+
+    rows = set()
+    if Reason.CREATOR in reasons:
+        for task_id, creator_id in tasks.filter(creator__isnull=False).values_list('id', 'creator_id'):
+            rows.add((creator_id, task_id, Reason.CREATOR))
+
+    if Reason.ASSIGNEE in reasons:
+        assignments = Task.assignees.through.objects.all()
+        if task_ids is not None:
+            assignments = assignments.filter(task_id__in=task_ids)
+        for task_id, user_id in assignments.values_list('task_id', 'user_id'):
+            rows.add((user_id, task_id, Reason.ASSIGNEE))
+
+    if Reason.PROJECT_MEMBER in reasons:
+        members = tasks.filter(project__members__isnull=False).values_list('id', 'project__members')
+        for task_id, user_id in members:
+            rows.add((user_id, task_id, Reason.PROJECT_MEMBER))
+
+    return rows
+
+
+def _bulk_insert(rows, batch_size=1000):
+    TaskVisibility.objects.bulk_create(
+        [TaskVisibility(user_id=u, task_id=t, reason=r) for u, t, r in rows],
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+
+
+def sync_task_visibility(task_ids, reasons=None):
+    """Bring the rows of the given tasks in line with the source tables, touching only differences."""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    reasons = list(reasons or Reason.values)
+    expected = expected_visibility_rows(task_ids, reasons)
+    current = {
+        (user_id, task_id, reason): pk
+        for pk, user_id, task_id, reason in (
+            TaskVisibility.objects
+            .filter(task_id__in=task_ids, reason__in=reasons)
+            .values_list('pk', 'user_id', 'task_id', 'reason')
+        )
+    }
+    stale = [pk for row, pk in current.items() if row not in expected]
+
+    with transaction.atomic():
+        if stale:
+            TaskVisibility.objects.filter(pk__in=stale).delete()
+        _bulk_insert(expected - current.keys())
+
+
+def grant_project_visibility(project_id, user_ids):
+    """Add project-member rows for every task in the project."""
+    task_ids = list(Task.objects.filter(project_id=project_id).values_list('id', flat=True))
+    _bulk_insert((user_id, task_id, Reason.PROJECT_MEMBER) for user_id in user_ids for task_id in task_ids)
+
+
+def revoke_project_visibility(project_id, user_ids=None):
+    rows = TaskVisibility.objects.filter(reason=Reason.PROJECT_MEMBER, task__project_id=project_id)
+    if user_ids is not None:
+        rows = rows.filter(user_id__in=user_ids)
+    rows.delete()
+
+
+def rebuild_task_visibility(batch_size=1000):
+    """Drop and recompute the whole table. Returns the number of rows written."""
+    rows = expected_visibility_rows()
+    with transaction.atomic():
+        TaskVisibility.objects.all().delete()
+        _bulk_insert(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def verify_task_visibility():
+    """Return `(missing, extra)` row sets comparing the table with the source tables."""
+    expected = expected_visibility_rows()
+    current = set(TaskVisibility.objects.values_list('user_id', 'task_id', 'reason'))
+    return expected - current, current - expected
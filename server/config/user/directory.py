@@ -0,0 +1,210 @@
+import re
+import threading
+from array import array
+from collections import Counter
+
+from django.db import transaction
+
+from .models import User
+from common.versions import get_version, bump_version
+
+
+# Columns kept in memory: enough to build the typeahead payloads without a query
+FIELDS = ('id', 'email', 'username', 'first_name', 'last_name', 'avatar', 'is_active', 'is_superuser', 'is_staff')
+# A save touching only other columns leaves the index as it is
+INDEXED_FIELDS = set(FIELDS) - {'id'}
+
+_WORD = re.compile(r'[^\W_]+')
+MIN_SCORE = 0.6
+TYPEAHEAD_LIMIT = 25
+# Only the rarest grams of a query are used to collect candidates, which
+# keeps very common grams (`com`, `gma`) from dominating the lookup
+MAX_QUERY_GRAMS = 8
+CANDIDATES_PER_RESULT = 20
+# Patched users leave their old slot behind; repack once this share is dead
+MAX_DEAD_SHARE = 0.25
+
+
+def _grams(word, pad_end=True):
+    """Trigrams of `word`, padded so word starts (and ends) get their own grams."""
+    padded = f"  {word}{' ' if pad_end else ''}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _comparable(row):
+    # An empty avatar is stored as either '' or NULL
+    return tuple(value or None if field == 'avatar' else value for field, value in zip(FIELDS, row))
+
+
+def _row_of(user):
+    """The FIELDS values of an instance, shaped like a values_list() row."""
+    return tuple(user.avatar.name if field == 'avatar' else getattr(user, field) for field in FIELDS)
+
+
+def _text(row):
+    return ' '.join(str(value or '') for value in row[1:5]).casefold()
+
+
+def _text_grams(text):
+    grams = set()
+    for word in _WORD.findall(text):
+        grams |= _grams(word)
+    return grams
+
+
+class PeopleIndex:
+    """
+    Trigram index over email, username and full name, held in process
+    memory so the assignee picker can rank matches on every keystroke
+    without a query.
+
+    The index is built on first use and rebuilt whenever the shared
+    `people_index` version moves, which every committed change to an indexed
+    column bumps. The process that made the change patches its own copy
+    instead, provided the bump it made was the only one since its copy was
+    current; otherwise it leaves the rebuild to `_ensure_current`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None
+        self.rows = []        # slot -> row tuple, None once the user changed or left
+        self.texts = []       # slot -> casefolded searchable text
+        self.slots = {}       # user id -> current slot
+        self.dead = 0         # slots left behind by patched or removed users
+        self.postings = {}    # gram -> array of slots
+        self.projects = {}    # project id -> (project version, member ids)
+
+    def _add(self, row, rows, texts, slots, postings):
+        slot = len(rows)
+        text = _text(row)
+        rows.append(row)
+        texts.append(text)
+        slots[row[0]] = slot
+        for gram in _text_grams(text):
+            postings.setdefault(gram, array('I')).append(slot)
+
+    def _build(self, version):
+        rows, texts, slots, postings = [], [], {}, {}
+        for row in User.objects.order_by().values_list(*FIELDS).iterator(chunk_size=5000):
+            self._add(row, rows, texts, slots, postings)
+        self._swap(rows, texts, slots, postings)
+        self.version = version
+
+    def _swap(self, rows, texts, slots, postings):
+        # Swap everything at once so concurrent readers see one generation or the other
+        self.rows, self.texts, self.slots, self.postings = rows, texts, slots, postings
+        self.dead = 0
+
+    def _compact(self):
+        """Re-pack the live rows into fresh slots; no query needed."""
+        rows, texts, slots, postings = [], [], {}, {}
+        for row in self.rows:
+            if row is not None:
+                self._add(row, rows, texts, slots, postings)
+        self._swap(rows, texts, slots, postings)
+
+    def _ensure_current(self):
+        version = get_version('people_index', 'all')
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    self._build(version)
+
+    def refresh(self, user_ids):
+        """
+        Publish a committed change to `user_ids` and patch this copy with it;
+        removed users drop out. Other processes rebuild on the new version.
+        """
+        with self._lock:
+            before = get_version('people_index', 'all')
+            after = bump_version('people_index', 'all')
+            # Any other bump in between means changes this copy has not seen
+            if self.version is None or self.version != before or after != before + 1:
+                return
+            fresh = list(User.objects.filter(id__in=user_ids).values_list(*FIELDS))
+            for user_id in user_ids:
+                slot = self.slots.pop(user_id, None)
+                if slot is not None:
+                    self.rows[slot] = None
+                    self.dead += 1
+            for row in fresh:
+                self._add(row, self.rows, self.texts, self.slots, self.postings)
+            if self.dead > len(self.rows) * MAX_DEAD_SHARE:
+                self._compact()
+            self.version = after
+
+    def project_member_ids(self, project_id):
+        """Member ids of a project, re-read only when the project's version moves."""
+        from project.models import ProjectMember
+
+        version = get_version('project', project_id)
+        cached = self.projects.get(project_id)
+        if cached is None or cached[0] != version:
+            members = frozenset(ProjectMember.objects.filter(project_id=project_id).values_list('user_id', flat=True))
+            cached = self.projects[project_id] = (version, members)
+        return cached[1]
+
+    def search(self, query, limit=10, user_ids=None):
+        """
+        Up to `limit` users ranked by trigram overlap with `query`, with
+        substring matches first. Returns unsaved User instances built from
+        the index. `user_ids` restricts the search to those users.
+        """
+        self._ensure_current()
+        words = _WORD.findall(query.casefold())
+        if not words:
+            return []
+        query_grams = set()
+        for position, word in enumerate(words):
+            # The last word may still be being typed, so it only has to be a prefix
+            query_grams |= _grams(word, pad_end=position < len(words) - 1)
+
+        if user_ids is not None:
+            # A project's members are few; score each of them directly
+            shared = {
+                self.slots[user_id]: len(query_grams & _text_grams(self.texts[self.slots[user_id]]))
+                for user_id in user_ids if user_id in self.slots
+            }
+            used = len(query_grams)
+        else:
+            grams = sorted((g for g in query_grams if g in self.postings), key=lambda g: len(self.postings[g]))
+            grams = grams[:MAX_QUERY_GRAMS]
+            counts = Counter()
+            for gram in grams:
+                counts.update(self.postings[gram])
+            shared = dict(counts.most_common(limit * CANDIDATES_PER_RESULT))
+            used = min(len(query_grams), MAX_QUERY_GRAMS)
+
+        matches = []
+        for slot, overlap in shared.items():
+            row = self.rows[slot]
+            if row is None:
+                continue
+            score = overlap / used
+            if all(word in self.texts[slot] for word in words):
+                score += 1
+            if score >= MIN_SCORE:
+                matches.append((-score, row[1], row))
+        matches.sort(key=lambda match: match[:2])
+        return [self._user(row) for _, _, row in matches[:limit]]
+
+    @staticmethod
+    def _user(row):
+        user = User(**dict(zip(FIELDS, row)))
+        user._state.adding = False
+        return user
+
+
+people_index = PeopleIndex()
+
+
+def indexed_fields_changed(user):
+    """Whether saving `user` would change a column the index holds; one query by primary key."""
+    stored = User.objects.filter(pk=user.pk).values_list(*FIELDS).first()
+    return stored is None or _comparable(stored) != _comparable(_row_of(user))
+
+
+def user_changed(user_id):
+    """Invalidate every process's copy and patch this one once the change commits."""
+    transaction.on_commit(lambda: people_index.refresh([user_id]))
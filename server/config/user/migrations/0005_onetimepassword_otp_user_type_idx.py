@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_otp_hash_storage_and_default_expiry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='onetimepassword',
+            index=models.Index(fields=['user', 'type'], name='otp_user_type_idx'),
+        ),
+    ]
@@ -106,6 +106,11 @@ class OneTimePassword(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(default=_otp_default_expiry)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'type'], name='otp_user_type_idx'),
+        ]
+
     def is_valid(self):
         return timezone.now() <= self.expires_at
 
@@ -43,6 +43,18 @@ class UserSerializer(serializers.ModelSerializer):
         return User.objects.create_user(email=email, password=password, **validated_data)
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """The few user fields list rows need."""
+    display_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'display_name', 'avatar']
+
+    def get_display_name(self, obj):
+        return UserSerializer.get_display_name(self, obj)
+
+
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
@@ -0,0 +1,29 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import User
+from .directory import INDEXED_FIELDS, indexed_fields_changed, user_changed
+
+
+def _skips_index(instance, update_fields, raw):
+    return raw or (update_fields is not None and not INDEXED_FIELDS & set(update_fields))
+
+
+@receiver(pre_save, sender=User)
+def user_saving_diff_directory(sender, instance, update_fields=None, raw=False, **kwargs):
+    # Full saves (password resets, OTP checks, last_login) mostly leave the indexed columns alone
+    instance._directory_changed = (
+        not _skips_index(instance, update_fields, raw)
+        and (instance._state.adding or indexed_fields_changed(instance))
+    )
+
+
+@receiver(post_save, sender=User)
+def user_saved_refresh_directory(sender, instance, created, **kwargs):
+    if getattr(instance, '_directory_changed', False):
+        user_changed(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted_refresh_directory(sender, instance, **kwargs):
+    user_changed(instance.pk)
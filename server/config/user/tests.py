@@ -1,3 +1,101 @@
-from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from project.models import Project
+from .models import User
+from common.versions import get_version, bump_version
+from .directory import people_index
+
+
+class PeopleSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='password123')
+        self.jonathan = User.objects.create_user(
+            email='jonathan.reed@example.com', password='password123', first_name='Jonathan', last_name='Reed',
+        )
+        self.joanna = User.objects.create_user(email='joanna@sample.org', password='password123')
+        self.client.force_authenticate(self.user)
+        # These users only exist inside the test transaction, so start from a fresh copy
+        people_index.version = None
+
+    def _assignees(self, query, **params):
+        response = self.client.get(reverse('search-for-assignee'), {'user': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['email'] for row in response.data['results']]
+
+    def test_ranked_and_typo_tolerant(self):
+        self.assertEqual(self._assignees('jo')[:2], ['joanna@sample.org', 'jonathan.reed@example.com'])
+        self.assertEqual(self._assignees('jonathon'), ['jonathan.reed@example.com'])
+        self.assertEqual(self._assignees('reed jonat'), ['jonathan.reed@example.com'])
+
+    def test_warm_index_answers_without_queries(self):
+        self._assignees('jon')
+        with self.assertNumQueries(0):
+            self.assertEqual(self._assignees('jona'), ['jonathan.reed@example.com'])
+
+    def test_project_scope(self):
+        project = Project.objects.create(name='Apollo', creator=self.user)
+        project.members.add(self.user, self.joanna)
+
+        self.assertEqual(self._assignees('jo', project=str(project.id)), ['joanna@sample.org'])
+
+        project.members.add(self.jonathan)
+        self.assertEqual(len(self._assignees('jo', project=str(project.id))), 2)
+        self.assertEqual(
+            self.client.get(reverse('search-for-assignee'), {'user': 'jo', 'project': 'nope'}).status_code, 400,
+        )
+
+    def test_refreshed_on_user_save(self):
+        self._assignees('jo')
+        self.joanna.first_name = 'Zelda'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.joanna.save()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._assignees('zelda'), ['joanna@sample.org'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.joanna.delete()
+        self.assertEqual(self._assignees('zelda'), [])
+        self.assertIsNone(people_index.slots.get(self.joanna.pk))
+
+    def test_saves_without_indexed_changes_leave_the_index_alone(self):
+        self._assignees('jo')
+        version, size = people_index.version, len(people_index.rows)
+        self.joanna.set_password('another-password')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.joanna.save()
+
+        self.assertEqual((people_index.version, len(people_index.rows)), (version, size))
+
+    def test_changes_from_other_processes_force_a_rebuild(self):
+        self._assignees('jo')
+        # Another process renames Jonathan and bumps the shared version
+        User.objects.filter(id=self.jonathan.id).update(first_name='Bartholomew')
+        bump_version('people_index', 'all')
+
+        self.joanna.first_name = 'Zelda'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.joanna.save()
+
+        self.assertNotEqual(people_index.version, get_version('people_index', 'all'))
+        self.assertEqual(self._assignees('bartholomew'), ['jonathan.reed@example.com'])
+        self.assertEqual(self._assignees('zelda'), ['joanna@sample.org'])
+
+    def test_patched_slots_are_reclaimed(self):
+        self._assignees('jo')
+        for i in range(20):
+            self.joanna.first_name = f'Name{i}'
+            with self.captureOnCommitCallbacks(execute=True):
+                self.joanna.save()
+
+        self.assertLessEqual(len(people_index.rows), 5)
+        self.assertEqual(self._assignees('name19'), ['joanna@sample.org'])
+
+    def test_user_search_requires_at_sign(self):
+        url = reverse('user-search')
+        self.assertEqual(self.client.get(url, {'q': 'jonathan'}).data['results'], [])
+
+        results = self.client.get(url, {'q': 'jonathan.reed@'}).data['results']
+        self.assertEqual([row['email'] for row in results], ['jonathan.reed@example.com'])
+        self.assertEqual(results[0]['display_name'], 'Jonathan Reed')
@@ -8,6 +8,7 @@ from .serializers import (
     VerifyEmailOTPSerializer
 )
 from .utils import send_otp, hash_otp
+from .directory import people_index, TYPEAHEAD_LIMIT
 
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -97,19 +98,26 @@ class LoginAPIView(generics.GenericAPIView):
 
 
 class SearchUsersAPIView(generics.ListAPIView):
-    """Search for users by email — requires authentication to prevent enumeration."""
+    """
+    Search for users by email — requires authentication to prevent enumeration.
+    Answered from the in-process people index, best matches first.
+    """
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        search_query = self.request.query_params.get('q', None)
+    def list(self, request, *args, **kwargs):
+        search_query = request.query_params.get('q', None)
 
         if not search_query or '@' not in search_query:
-            return User.objects.none()
+            users = []
+        else:
+            users = people_index.search(search_query, limit=TYPEAHEAD_LIMIT)
 
-        return queryset.filter(email__icontains=search_query)
+        page = self.paginate_queryset(users)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(users, many=True).data)
 
 
 class CurrentUserAPIView(generics.RetrieveUpdateAPIView):